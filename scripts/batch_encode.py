@@ -0,0 +1,204 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from scripts.controllers.manifest_controller import ManifestController
+from scripts.controllers.utils.system_io_controller import SystemIOController
+from scripts.enums import AssetType
+from scripts.merge_video_audio import merge_video_audio
+from scripts.record_video import OUTPUT_DIR, convert_webm_to_mp4, get_recording_info_path
+from scripts.record_video_cdp import is_ffmpeg_available, print_ffmpeg_install_instructions
+
+
+def parse_job(spec: str) -> Dict[str, Any]:
+    topic, separator, version = spec.rpartition(':')
+    if not separator or not topic or not version.isdigit():
+        raise argparse.ArgumentTypeError(f"Expected TOPIC:VERSION, got: {spec}")
+    return {'topic': topic, 'version': int(version)}
+
+
+def load_jobs_file(jobs_file: str) -> List[Dict[str, Any]]:
+    with open(jobs_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def resolve_job(job: Dict[str, Any], recordings_dir: str, default_skip_ms: Optional[int]) -> Dict[str, Any]:
+    version = job['version']
+    webm_path = Path(recordings_dir) / f"v{version}" / f"recording_v{version}.webm"
+    if not webm_path.exists():
+        raise FileNotFoundError(f"Recording not found: {webm_path}")
+
+    # Recordings share one directory across topics; record_video.py notes which topic each one is
+    info_path = get_recording_info_path(webm_path)
+    recording_info = SystemIOController().read_json(str(info_path), check_exists=False)
+    if not recording_info:
+        raise FileNotFoundError(f"Recording info not found: {info_path} (re-record with record_video.py)")
+    if recording_info.get('topic') != job['topic']:
+        raise ValueError(f"{webm_path} was recorded for topic {recording_info.get('topic')!r}, not {job['topic']!r}")
+
+    # The WebM starts before playback does, so the measured lead-in is skipped unless overridden
+    skip_ms = job.get('skip_ms', default_skip_ms)
+    if skip_ms is None:
+        skip_ms = recording_info.get('lead_in_ms', 0)
+
+    # Manifest reads stay in the parent so workers only receive plain paths
+    manifest = ManifestController()
+    manifest.set_topic(job['topic'])
+    audio_info = manifest.get_field(AssetType.AUDIO)
+    audio_path = None
+    if audio_info and audio_info.get('path'):
+        audio_path = SystemIOController().normalize_path(audio_info['path'])
+
+    return {
+        'topic': job['topic'],
+        'version': version,
+        'webm_path': str(webm_path),
+        'mp4_path': str(webm_path.with_suffix('.mp4')),
+        'audio_path': audio_path,
+        'skip_ms': skip_ms,
+    }
+
+
+def get_duration_seconds(video_path: str) -> float:
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-show_entries', 'format=duration',
+        '-of', 'default=noprint_wrappers=1:nokey=1',
+        video_path
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return 0.0
+
+
+def encode_job(job: Dict[str, Any], quality: str, threads: int) -> Dict[str, Any]:
+    """Runs in a pool process: WebM -> MP4, then merges the topic audio if there is one."""
+    start_time = time.time()
+    if not convert_webm_to_mp4(Path(job['webm_path']), Path(job['mp4_path']), quality=quality, threads=threads):
+        return {**job, 'success': False, 'error': 'MP4 conversion failed', 'elapsed': time.time() - start_time}
+
+    output_path = job['mp4_path']
+    if job['audio_path']:
+        mp4_path = Path(job['mp4_path'])
+        output_path = str(mp4_path.parent / f"{mp4_path.stem}_merged.mp4")
+        merge_video_audio(
+            video_path=job['mp4_path'],
+            audio_path=job['audio_path'],
+            output_path=output_path,
+            audio_delay_ms=job['skip_ms'],
+            threads=threads
+        )
+
+    elapsed = time.time() - start_time
+    duration = get_duration_seconds(output_path)
+    return {
+        **job,
+        'success': True,
+        'output_path': output_path,
+        'elapsed': elapsed,
+        'duration': duration,
+        'speed': duration / elapsed if elapsed > 0 else 0,
+        'size_mb': Path(output_path).stat().st_size / (1024 * 1024),
+    }
+
+
+def get_pool_layout(job_count: int, workers: Optional[int], threads: Optional[int]) -> Dict[str, int]:
+    cores = os.cpu_count() or 1
+    workers = max(1, min(workers or cores, job_count))
+    # Split the cores between concurrent jobs so the pool never oversubscribes them
+    threads = threads or max(1, cores // workers)
+    return {'cores': cores, 'workers': workers, 'threads': threads}
+
+
+def run_batch(jobs: List[Dict[str, Any]], quality: str = 'high', workers: Optional[int] = None,
+              threads: Optional[int] = None) -> List[Dict[str, Any]]:
+    layout = get_pool_layout(len(jobs), workers, threads)
+    print(f"Encoding {len(jobs)} jobs on {layout['workers']} workers "
+          f"({layout['threads']} ffmpeg threads each, {layout['cores']} cores)")
+
+    results = []
+    batch_start = time.time()
+    with ProcessPoolExecutor(max_workers=layout['workers']) as executor:
+        futures = {executor.submit(encode_job, job, quality, layout['threads']): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {**job, 'success': False, 'error': str(e)}
+            results.append(result)
+
+            label = f"{job['topic']} v{job['version']}"
+            if result['success']:
+                print(f"✓ {label}: {result['duration']:.1f}s of video in {result['elapsed']:.1f}s "
+                      f"({result['speed']:.2f}x realtime, {result['size_mb']:.1f} MB) -> {result['output_path']}")
+            else:
+                print(f"✗ {label}: {result.get('error')}")
+
+    batch_elapsed = time.time() - batch_start
+    encoded = sum(result.get('duration', 0) for result in results if result['success'])
+    succeeded = sum(1 for result in results if result['success'])
+    print(f"\nBatch complete: {succeeded}/{len(jobs)} succeeded in {batch_elapsed:.1f}s "
+          f"({encoded / batch_elapsed if batch_elapsed > 0 else 0:.2f}x realtime overall)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert and merge many recordings in parallel')
+
+    parser.add_argument('--jobs', type=parse_job, nargs='+', default=[], metavar='TOPIC:VERSION',
+                        help='Topic and recording version pairs to encode')
+    parser.add_argument('--jobs-file', type=str,
+                        help='JSON list of {"topic", "version", "skip_ms"} jobs')
+    parser.add_argument('--recordings-dir', type=str, default=OUTPUT_DIR,
+                        help=f'Directory holding v{{N}}/recording_v{{N}}.webm (default: {OUTPUT_DIR})')
+    parser.add_argument('--quality', type=str, choices=['high', 'medium', 'low'], default='high',
+                        help='MP4 quality preset (default: high)')
+    parser.add_argument('--skip', '-s', type=int, default=None,
+                        help='Audio skip in ms for jobs that do not set skip_ms '
+                             '(default: the lead-in measured when the recording was made)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Concurrent encodes (default: number of cores)')
+    parser.add_argument('--threads', type=int, default=None,
+                        help='ffmpeg threads per encode (default: cores / workers)')
+
+    args = parser.parse_args()
+
+    if not is_ffmpeg_available():
+        print_ffmpeg_install_instructions()
+        sys.exit(1)
+
+    job_specs = list(args.jobs)
+    if args.jobs_file:
+        job_specs.extend(load_jobs_file(args.jobs_file))
+    if not job_specs:
+        parser.error("Provide --jobs or --jobs-file")
+
+    jobs = []
+    for spec in job_specs:
+        try:
+            jobs.append(resolve_job(spec, args.recordings_dir, args.skip))
+        except (FileNotFoundError, ValueError) as e:
+            print(f"✗ {spec['topic']} v{spec['version']}: {e}")
+
+    if not jobs:
+        sys.exit(1)
+
+    results = run_batch(jobs, quality=args.quality, workers=args.workers, threads=args.threads)
+    sys.exit(0 if len(jobs) == len(job_specs) and all(result['success'] for result in results) else 1)
+
+
+if __name__ == '__main__':
+    main()
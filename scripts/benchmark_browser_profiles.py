@@ -0,0 +1,172 @@
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from playwright.sync_api import sync_playwright
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from scripts.record_video_cdp import (
+    BROWSER_PROFILES,
+    CaptureFailedError,
+    DEFAULT_BASE_URL,
+    OUTPUT_DIR,
+    VirtualTimeRecorder,
+    ensure_server_running,
+    get_video_version,
+    hide_ui_elements,
+    is_ffmpeg_available,
+    launch_browser,
+    new_recording_context,
+    prepare_player_page,
+    print_ffmpeg_install_instructions,
+)
+
+
+BENCHMARK_DIR = Path(OUTPUT_DIR) / "benchmarks"
+
+# name -> (width, height, player mode)
+BENCHMARK_VIEWPORTS = {
+    '1920x1080': (1920, 1080, 'l'),
+    '1080x1920': (1080, 1920, 'p'),
+}
+
+
+def run_profile(profile: str, viewport: str, base_url: str, version: int, frames: int, fps: int,
+                headless: bool) -> Optional[Dict[str, Any]]:
+    width, height, mode = BENCHMARK_VIEWPORTS[viewport]
+    url = f"{base_url}/{version}/{mode}"
+    output_path = BENCHMARK_DIR / f"browser_{profile}_{viewport}.mp4"
+    print(f"\n{'='*60}")
+    print(f"Profile: {profile} @ {viewport}")
+    print(f"{'='*60}")
+
+    with sync_playwright() as p:
+        browser = launch_browser(p, headless, profile)
+        # Viewports are the output size, so capture at 1x
+        context = new_recording_context(browser, width, height, device_scale_factor=1)
+        page = context.new_page()
+
+        recorder = VirtualTimeRecorder(
+            page=page,
+            output_dir=BENCHMARK_DIR,
+            width=width,
+            height=height,
+            quality=90,
+            fps=fps,
+            format='jpeg',
+            stream=True
+        )
+
+        output = None
+        try:
+            if not prepare_player_page(page, url):
+                return None
+
+            recorder.start(output_path.name)
+            hide_ui_elements(page)
+
+            start_time = time.time()
+            recorder.record_frames(0, frames)
+            output = recorder.stop(output_path.name)
+            wall_time = time.time() - start_time
+        except CaptureFailedError as e:
+            print(f"✗ {profile} @ {viewport}: {e}")
+        finally:
+            if not recorder.stopped:
+                recorder.stop(output_path.name)
+            page.close()
+            context.close()
+            browser.close()
+
+    if not output:
+        print(f"✗ {profile} @ {viewport} produced no output")
+        return None
+
+    timings = recorder.telemetry.get_timing_summary()
+    resources = recorder.telemetry.sampler.get_summary()
+    return {
+        'frames': recorder.frame_count,
+        'wall_time_s': wall_time,
+        'fps_rendered': frames / wall_time if wall_time > 0 else 0,
+        'capture_ms': timings.get('cdp', {}),
+        'chromium_cpu_percent': resources['chromium']['cpu_percent'],
+        'chromium_rss_mb': resources['chromium']['rss_mb'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark frame capture time across Chromium launch profiles')
+
+    parser.add_argument('--base-url', type=str, default=DEFAULT_BASE_URL,
+                        help=f'Base URL of the server (default: {DEFAULT_BASE_URL})')
+    parser.add_argument('--headless', type=lambda x: str(x).lower() == 'true',
+                        default=True, metavar='true|false',
+                        help='Run browser in headless mode: true or false (default: true)')
+    parser.add_argument('--seconds', type=float, default=10,
+                        help='Seconds of timeline to render per run (default: 10)')
+    parser.add_argument('--fps', type=int, default=30,
+                        help='Output video FPS (default: 30)')
+    parser.add_argument('--profiles', type=str, nargs='+', choices=list(BROWSER_PROFILES),
+                        default=list(BROWSER_PROFILES),
+                        help='Browser profiles to run (default: all)')
+    parser.add_argument('--viewports', type=str, nargs='+', choices=list(BENCHMARK_VIEWPORTS),
+                        default=list(BENCHMARK_VIEWPORTS),
+                        help='Viewports to run (default: all)')
+
+    args = parser.parse_args()
+
+    if not is_ffmpeg_available():
+        print("✗ ffmpeg is required for CDP recording")
+        print_ffmpeg_install_instructions()
+        sys.exit(1)
+
+    version = get_video_version()
+    frames = int(args.seconds * args.fps)
+    BENCHMARK_DIR.mkdir(parents=True, exist_ok=True)
+
+    server_process = ensure_server_running(args.base_url)
+    if server_process is False:
+        sys.exit(1)
+
+    results = {}
+    try:
+        for viewport in args.viewports:
+            for profile in args.profiles:
+                result = run_profile(profile, viewport, args.base_url, version, frames, args.fps, args.headless)
+                if result:
+                    results.setdefault(viewport, {})[profile] = result
+    finally:
+        if server_process:
+            print("Stopping development server...")
+            server_process.terminate()
+
+    print(f"\n{'='*60}")
+    print(f"Browser profile benchmark ({frames} frames at {args.fps} fps, v{version})")
+    print(f"{'='*60}")
+    for viewport, profiles in results.items():
+        print(f"  {viewport}")
+        for profile, result in profiles.items():
+            capture = result['capture_ms']
+            print(f"    {profile:<12} capture p50 {capture.get('p50', 0):.1f}ms | "
+                  f"p95 {capture.get('p95', 0):.1f}ms | p99 {capture.get('p99', 0):.1f}ms | "
+                  f"{result['fps_rendered']:.1f} fps | "
+                  f"chromium CPU {result['chromium_cpu_percent']['mean']:.0f}%")
+
+    report_path = BENCHMARK_DIR / f"browser_profiles_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.json"
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': version, 'frames': frames, 'fps': args.fps, 'results': results}, f, indent=2)
+    print(f"\n[OK] Report saved to: {report_path}")
+
+    sys.exit(0 if results else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import psutil
+from playwright.sync_api import sync_playwright
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from scripts.record_video_cdp import (
+    CaptureFailedError,
+    DEFAULT_BASE_URL,
+    OUTPUT_DIR,
+    VIEWPORT_HEIGHT,
+    VIEWPORT_WIDTH,
+    VirtualTimeRecorder,
+    ensure_server_running,
+    get_video_version,
+    hide_ui_elements,
+    is_ffmpeg_available,
+    new_recording_context,
+    prepare_player_page,
+    print_ffmpeg_install_instructions,
+)
+
+
+BENCHMARK_DIR = Path(OUTPUT_DIR) / "benchmarks"
+
+# The lossless PNG capture is the quality reference for the other profiles
+REFERENCE_PROFILE = 'png'
+CAPTURE_PROFILES = {
+    'jpeg-q100': {'format': 'jpeg', 'quality': 100, 'optimize_for_speed': False},
+    'png': {'format': 'png', 'quality': 100, 'optimize_for_speed': False},
+    'png-fast': {'format': 'png', 'quality': 100, 'optimize_for_speed': True},
+}
+
+
+def get_cpu_seconds() -> Dict[str, float]:
+    cpu_times = psutil.Process().cpu_times()
+    return {
+        'python': cpu_times.user + cpu_times.system,
+        # ffmpeg is reaped by stop(), so its CPU time shows up in the children counters
+        'ffmpeg': cpu_times.children_user + cpu_times.children_system,
+    }
+
+
+def run_profile(name: str, settings: Dict[str, Any], url: str, frames: int, fps: int,
+                headless: bool) -> Optional[Dict[str, Any]]:
+    output_path = BENCHMARK_DIR / f"capture_{name}.mp4"
+    print(f"\n{'='*60}")
+    print(f"Profile: {name} ({settings})")
+    print(f"{'='*60}")
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless, args=['--mute-audio'])
+        context = new_recording_context(browser)
+        page = context.new_page()
+
+        recorder = VirtualTimeRecorder(
+            page=page,
+            output_dir=BENCHMARK_DIR,
+            width=VIEWPORT_WIDTH,
+            height=VIEWPORT_HEIGHT,
+            quality=settings['quality'],
+            fps=fps,
+            format=settings['format'],
+            stream=True,
+            optimize_for_speed=settings['optimize_for_speed']
+        )
+
+        output = None
+        try:
+            if not prepare_player_page(page, url):
+                return None
+
+            recorder.start(output_path.name)
+            hide_ui_elements(page)
+
+            cpu_before = get_cpu_seconds()
+            start_time = time.time()
+            recorder.record_frames(0, frames)
+            output = recorder.stop(output_path.name)
+            wall_time = time.time() - start_time
+            cpu_after = get_cpu_seconds()
+        except CaptureFailedError as e:
+            print(f"✗ Profile {name}: {e}")
+        finally:
+            if not recorder.stopped:
+                recorder.stop(output_path.name)
+            page.close()
+            context.close()
+            browser.close()
+
+    if not output:
+        print(f"✗ Profile {name} produced no output")
+        return None
+
+    python_cpu = cpu_after['python'] - cpu_before['python']
+    ffmpeg_cpu = cpu_after['ffmpeg'] - cpu_before['ffmpeg']
+    return {
+        'output': str(output),
+        'frames': recorder.frame_count,
+        'wall_time_s': wall_time,
+        'python_cpu_ms_per_frame': python_cpu / frames * 1000,
+        'ffmpeg_cpu_ms_per_frame': ffmpeg_cpu / frames * 1000,
+        'fps_rendered': frames / wall_time if wall_time > 0 else 0,
+        'size_mb': output.stat().st_size / (1024 * 1024),
+    }
+
+
+def compare_quality(distorted: str, reference: str) -> Dict[str, Optional[float]]:
+    cmd = [
+        'ffmpeg', '-hide_banner', '-nostats',
+        '-i', distorted, '-i', reference,
+        '-lavfi', '[0:v][1:v]ssim;[0:v][1:v]psnr',
+        '-f', 'null', '-'
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+
+    ssim = re.search(r'SSIM .*All:([\d.]+)', result.stderr)
+    psnr = re.search(r'PSNR .*average:([\d.]+|inf)', result.stderr)
+    return {
+        'ssim': float(ssim.group(1)) if ssim else None,
+        'psnr_db': float(psnr.group(1)) if psnr else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CDP capture formats for CPU time per frame and quality')
+
+    parser.add_argument('--base-url', type=str, default=DEFAULT_BASE_URL,
+                        help=f'Base URL of the server (default: {DEFAULT_BASE_URL})')
+    parser.add_argument('--headless', type=lambda x: str(x).lower() == 'true',
+                        default=True, metavar='true|false',
+                        help='Run browser in headless mode: true or false (default: true)')
+    parser.add_argument('--seconds', type=float, default=10,
+                        help='Seconds of timeline to render per profile (default: 10)')
+    parser.add_argument('--fps', type=int, default=30,
+                        help='Output video FPS (default: 30)')
+    parser.add_argument('--profiles', type=str, nargs='+', choices=list(CAPTURE_PROFILES),
+                        default=list(CAPTURE_PROFILES),
+                        help='Capture profiles to run (default: all)')
+
+    args = parser.parse_args()
+
+    if not is_ffmpeg_available():
+        print("✗ ffmpeg is required for CDP recording")
+        print_ffmpeg_install_instructions()
+        sys.exit(1)
+
+    version = get_video_version()
+    url = f"{args.base_url}/{version}/l"
+    frames = int(args.seconds * args.fps)
+    BENCHMARK_DIR.mkdir(parents=True, exist_ok=True)
+
+    server_process = ensure_server_running(args.base_url)
+    if server_process is False:
+        sys.exit(1)
+
+    results = {}
+    try:
+        # Virtual time renders identical frames in every run, so outputs compare frame for frame
+        for name in args.profiles:
+            result = run_profile(name, CAPTURE_PROFILES[name], url, frames, args.fps, args.headless)
+            if result:
+                results[name] = result
+    finally:
+        if server_process:
+            print("Stopping development server...")
+            server_process.terminate()
+
+    reference = results.get(REFERENCE_PROFILE)
+    for name, result in results.items():
+        if reference and name != REFERENCE_PROFILE:
+            result.update(compare_quality(result['output'], reference['output']))
+
+    print(f"\n{'='*60}")
+    print(f"Capture benchmark ({frames} frames at {args.fps} fps, v{version})")
+    print(f"{'='*60}")
+    for name, result in results.items():
+        quality = ""
+        if result.get('ssim') is not None:
+            quality = f" | SSIM {result['ssim']:.4f} | PSNR {result['psnr_db']} dB"
+        print(f"  {name:<10} python {result['python_cpu_ms_per_frame']:.1f}ms/frame | "
+              f"ffmpeg {result['ffmpeg_cpu_ms_per_frame']:.1f}ms/frame | "
+              f"{result['fps_rendered']:.1f} fps | {result['size_mb']:.1f} MB{quality}")
+
+    report_path = BENCHMARK_DIR / f"capture_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.json"
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': version, 'frames': frames, 'fps': args.fps, 'results': results}, f, indent=2)
+    print(f"\n[OK] Report saved to: {report_path}")
+
+    sys.exit(0 if results else 1)
+
+
+if __name__ == '__main__':
+    main()
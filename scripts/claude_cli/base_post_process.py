@@ -74,7 +74,8 @@ class BasePostProcess(ABC):
         pass
 
     def run(self) -> Tuple[bool, Optional[str]]:
-        self.gen_metadata_controller.set_metadata({"type":"claude_cli"})
-        result = self.process()
-        self.gen_metadata_controller.save_metadata()
+        with self.manifest_controller.transaction():
+            self.gen_metadata_controller.set_metadata({"type":"claude_cli"})
+            result = self.process()
+            self.gen_metadata_controller.save_metadata()
         return result
\ No newline at end of file
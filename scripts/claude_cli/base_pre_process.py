@@ -162,13 +162,14 @@ class BasePreProcess(ABC):
         pass
 
     def run(self):
-        self.delete_existing_outputs()
-        self.delete_existing_prompts()
-        self.logger.info(f"Deleted existing outputs for {self.asset_type}")
-        if self.gen_prompt:
-            self.save_prompt()
-            self.logger.info(f"Saved prompts for {self.asset_type}")
-        else:
-            self.logger.info(f"Skipped saving prompts for {self.asset_type}")
-        self.logger.info(f"Completed pre-processing for {self.asset_type}")
-        self.gen_metadata_controller.save_metadata()
+        with self.manifest_controller.transaction():
+            self.delete_existing_outputs()
+            self.delete_existing_prompts()
+            self.logger.info(f"Deleted existing outputs for {self.asset_type}")
+            if self.gen_prompt:
+                self.save_prompt()
+                self.logger.info(f"Saved prompts for {self.asset_type}")
+            else:
+                self.logger.info(f"Skipped saving prompts for {self.asset_type}")
+            self.logger.info(f"Completed pre-processing for {self.asset_type}")
+            self.gen_metadata_controller.save_metadata()
@@ -570,7 +570,9 @@ class VideoContentPostProcessing(BasePostProcess):
 
     def run(self) -> Tuple[bool, Optional[str]]:
         self.gen_metadata_controller.set_metadata({"type":"claude_cli"})
-        result = self.process()
+        # The deploy reads the manifest from disk, so the transaction ends before it
+        with self.manifest_controller.transaction():
+            result = self.process()
         try:
             deployedData=self.deployService.run()
             if not deployedData['success']:
@@ -65,13 +65,14 @@ class VideoDesignRegenPreProcess(VideoDesignPreProcess):
             self.logger.info(f"Saved video design prompt to: {file_path}")
 
     def run(self):
-        self.delete_scene_files(self.scenes)
-        self.delete_scene_prompts(self.scenes)
-        self.logger.info(f"Deleted existing outputs for scenes: {self.scenes}")
-        self.save_prompt()
-        self.logger.info(f"Saved prompts for scenes: {self.scenes}")
-        self.logger.info(f"Completed pre-processing for scenes: {self.scenes}")
-        self.gen_metadata_controller.save_metadata()
+        with self.manifest_controller.transaction():
+            self.delete_scene_files(self.scenes)
+            self.delete_scene_prompts(self.scenes)
+            self.logger.info(f"Deleted existing outputs for scenes: {self.scenes}")
+            self.save_prompt()
+            self.logger.info(f"Saved prompts for scenes: {self.scenes}")
+            self.logger.info(f"Completed pre-processing for scenes: {self.scenes}")
+            self.gen_metadata_controller.save_metadata()
 
 
 if __name__ == "__main__":
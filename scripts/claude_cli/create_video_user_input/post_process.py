@@ -75,7 +75,8 @@ class PostProcessCreateVideoUserInput(BasePostProcess):
         return True, {"valid": True, "video_style": self.video_style}
 
     def run(self) -> Tuple[bool, Optional[dict]]:
-        return self.process()
+        with self.manifest_controller.transaction():
+            return self.process()
 
 
 def main():
@@ -1,5 +1,8 @@
 import json
 import os
+import time
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from filelock import FileLock
@@ -10,10 +13,14 @@ from scripts.logging_config import get_utility_logger, set_console_logging
 from scripts.controllers.utils.system_io_controller import SystemIOController
 from scripts.controllers.utils.singleton import SingletonMeta
 from scripts.claude_cli.claude_cli_config import ClaudeCliConfig
-from scripts.utility.config import MANIFEST_FILE
+from scripts.controllers.manifest_store import SqliteManifestStore
+from scripts.utility.config import MANIFEST_DB_FILE, MANIFEST_FILE, MANIFEST_STORE
 
 class ManifestController(metaclass=SingletonMeta):
     LOCK_TIMEOUT = 10
+    # Sized to a full scene subagent run, since an LLM subagent can only heartbeat between
+    # tool calls (scripts/tools/subagent_lease.py heartbeat, save_agent_output.py --lease_token)
+    LEASE_SECONDS = 1800
 
     def __init__(self):
         self.current_gen_version = None
@@ -21,13 +28,48 @@ class ManifestController(metaclass=SingletonMeta):
         self.io_controller = SystemIOController()
         self.TOPIC = None
         self.manifest_path = "Outputs/{topic}/manifest.json"
+        # Mutations mark the in-memory manifest dirty; it is written once per transaction
+        self.dirty = False
+        self.transaction_depth = 0
+        self.subagent_store = None
 
     def set_topic(self, topic: str) -> None:
+        self.flush()
         self.TOPIC = topic
         self.manifest_path = MANIFEST_FILE.format(topic=topic)
         self._ensure_manifest_exists()
         self.manifest_json = self.io_controller.read_json(self.manifest_path)
-        
+        if self.subagent_store:
+            self.subagent_store.close()
+            self.subagent_store = None
+        if MANIFEST_STORE == "sqlite":
+            self.subagent_store = SqliteManifestStore(MANIFEST_DB_FILE.format(topic=topic), self.LEASE_SECONDS)
+
+    def _mark_dirty(self) -> bool:
+        self.dirty = True
+        if self.transaction_depth == 0:
+            return self.flush()
+        return True
+
+    def flush(self) -> bool:
+        if not self.dirty:
+            return True
+        # Subagents read the manifest concurrently, so the rename is made durable too
+        if not self.io_controller.write_json(self.manifest_path, self.manifest_json, sync_dir=True):
+            return False
+        self.dirty = False
+        return True
+
+    @contextmanager
+    def transaction(self):
+        """Batch manifest mutations; the manifest is written once when the outermost block exits."""
+        self.transaction_depth += 1
+        try:
+            yield self
+        finally:
+            self.transaction_depth -= 1
+            if self.transaction_depth == 0:
+                self.flush()
 
     def set_dimensions(self) -> None:
         video_ratio = self.manifest_json['metadata']['video_ratio']
@@ -36,10 +78,13 @@ class ManifestController(metaclass=SingletonMeta):
         if(video_ratio == "landscape"):
             viewport_width = 1920
             viewport_height = 1080
-        
-        self.manifest_json['metadata']['viewport_width'] = viewport_width
-        self.manifest_json['metadata']['viewport_height'] = viewport_height
-        self.io_controller.write_json(self.manifest_path, self.manifest_json)
+
+        metadata = self.manifest_json['metadata']
+        if metadata.get('viewport_width') != viewport_width or metadata.get('viewport_height') != viewport_height:
+            metadata['viewport_width'] = viewport_width
+            metadata['viewport_height'] = viewport_height
+            # Derived from video_ratio, so reads only persist it with the next flush
+            self.dirty = True
 
     def _ensure_manifest_exists(self) -> None:
 
@@ -146,7 +191,8 @@ class ManifestController(metaclass=SingletonMeta):
                 self.manifest_json[asset_type.value]['current_gen_version'] = version + 1
                 self.manifest_json[asset_type.value]['subagents_completed'] = []
                 self.manifest_json[asset_type.value]['subagents_claimed'] = []
-            self.io_controller.write_json(self.manifest_path, self.manifest_json)
+                self.manifest_json[asset_type.value]['subagent_leases'] = {}
+                self._mark_dirty()
             self.current_gen_version = self.manifest_json[asset_type.value]['current_gen_version']
 
         return self.current_gen_version
@@ -158,7 +204,7 @@ class ManifestController(metaclass=SingletonMeta):
         # Use POSIX paths (forward slashes) for cross-platform compatibility
         self.manifest_json[key]['path'] = Path(file_path).as_posix()
         self.logger.info(f"Manifest updated successfully for asset type: {key}, version: {version}, file_path: {file_path}")
-        return self.io_controller.write_json(self.manifest_path, self.manifest_json)
+        return self._mark_dirty()
 
     @try_catch
     def update_metadata(self, key: str, value: Any) -> bool:
@@ -167,63 +213,157 @@ class ManifestController(metaclass=SingletonMeta):
 
         self.manifest_json['metadata'][key] = value
         self.logger.info(f"Metadata updated successfully: {key} = {value}")
-        return self.io_controller.write_json(self.manifest_path, self.manifest_json)
+        return self._mark_dirty()
 
     def get_output_dir(self, asset_type: AssetType) -> str:
         return os.path.join(self.TOPIC, asset_type.value)
 
+    def _get_store_gen_version(self, asset_type: AssetType) -> int:
+        return self.manifest_json[asset_type.value].get('current_gen_version') or 0
+
     def get_subagents_completed(self, asset_type: AssetType) -> List[int]:
-        if 'subagents_completed' not in self.manifest_json[asset_type.value]:
-            self.manifest_json[asset_type.value]['subagents_completed'] = []
-            self.io_controller.write_json(self.manifest_path, self.manifest_json)
-        return self.manifest_json[asset_type.value]['subagents_completed']
+        if self.subagent_store:
+            return self.subagent_store.get_completed(asset_type, self._get_store_gen_version(asset_type))
+        return self.manifest_json[asset_type.value].get('subagents_completed', [])
 
     def get_subagents_claimed(self, asset_type: AssetType) -> List[int]:
-        if 'subagents_claimed' not in self.manifest_json[asset_type.value]:
-            self.manifest_json[asset_type.value]['subagents_claimed'] = []
-            self.io_controller.write_json(self.manifest_path, self.manifest_json)
-        return self.manifest_json[asset_type.value]['subagents_claimed']
-
-    def clear_claimed_agents(self, asset_type: AssetType) -> None:
-        self.manifest_json[asset_type.value]['subagents_claimed'] = []
-        self.io_controller.write_json(self.manifest_path, self.manifest_json)
-
-    @try_catch
-    def claim_subagent(self, asset_type: AssetType, subagent_id: int) -> bool:
+        """Subagents holding a live lease; expired claims are free to be taken again."""
+        if self.subagent_store:
+            return self.subagent_store.get_claimed(asset_type, self._get_store_gen_version(asset_type), time.time())
+        return self._get_live_claims(self.manifest_json[asset_type.value], time.time())
+
+    def _get_live_claims(self, entry: Dict[str, Any], now: float) -> List[int]:
+        # Claims written before leases existed have no lease yet; they stay live until migrated
+        leases = entry.get('subagent_leases', {})
+        return [subagent_id for subagent_id in entry.get('subagents_claimed', [])
+                if str(subagent_id) not in leases or leases[str(subagent_id)].get('expires_at', 0) > now]
+
+    def _migrate_legacy_claims(self, entry: Dict[str, Any], now: float) -> bool:
+        """Gives claims written before leases existed a fresh lease instead of releasing them all at once."""
+        legacy = [subagent_id for subagent_id in entry['subagents_claimed']
+                  if str(subagent_id) not in entry['subagent_leases']]
+        for subagent_id in legacy:
+            entry['subagent_leases'][str(subagent_id)] = {'owner': None, 'expires_at': now + self.LEASE_SECONDS}
+        if legacy:
+            self.logger.info(f"Migrated claims without a lease: {legacy}")
+        return bool(legacy)
+
+    def _update_subagents(self, asset_type: AssetType, mutate) -> bool:
+        """
+        Applies mutate(entry, now) to a fresh read of the manifest under the file lock and
+        writes it back if it returns True, so every claim, renewal and completion is a
+        compare-and-swap against the state other subagents last wrote.
+        """
         lock_path = self.manifest_path.replace('.json', '.lock')
         lock = FileLock(lock_path, timeout=self.LOCK_TIMEOUT)
+        # Subagent state is visible to other processes at once, so pending changes go out first
+        self.flush()
 
         with lock:
             self.manifest_json = self.io_controller.read_json(self.manifest_path)
+            entry = self.manifest_json[asset_type.value]
+            entry.setdefault('subagents_claimed', [])
+            entry.setdefault('subagents_completed', [])
+            entry.setdefault('subagent_leases', {})
+
+            now = time.time()
+            migrated = self._migrate_legacy_claims(entry, now)
+            changed = mutate(entry, now)
+            if not changed and not migrated:
+                return False
+            self.dirty = True
+            return self.flush() and changed
 
-            if 'subagents_claimed' not in self.manifest_json[asset_type.value]:
-                self.manifest_json[asset_type.value]['subagents_claimed'] = []
+    def clear_claimed_agents(self, asset_type: AssetType) -> None:
+        """Releases claims whose lease expired; subagents still heartbeating keep theirs."""
+        if self.subagent_store:
+            self.subagent_store.clear_expired_claims(asset_type, self._get_store_gen_version(asset_type), time.time())
+            return
+
+        def release_expired(entry: Dict[str, Any], now: float) -> bool:
+            claimed = self._get_live_claims(entry, now)
+            if claimed == entry['subagents_claimed'] and len(claimed) == len(entry['subagent_leases']):
+                return False
+            entry['subagents_claimed'] = claimed
+            entry['subagent_leases'] = {str(subagent_id): entry['subagent_leases'][str(subagent_id)]
+                                        for subagent_id in claimed}
+            self.logger.info(f"Released expired claims for {asset_type.value}, live claims: {claimed}")
+            return True
 
-            if 'subagents_completed' not in self.manifest_json[asset_type.value]:
-                self.manifest_json[asset_type.value]['subagents_completed'] = []
+        self._update_subagents(asset_type, release_expired)
 
-            if subagent_id in self.manifest_json[asset_type.value]['subagents_claimed']:
-                return False
-            if subagent_id in self.manifest_json[asset_type.value]['subagents_completed']:
-                return False
+    @try_catch
+    def claim_subagent(self, asset_type: AssetType, subagent_id: int) -> Optional[str]:
+        """Returns the lease token the subagent passes to heartbeat and completion, or None if taken."""
+        lease_token = uuid.uuid4().hex
+        if self.subagent_store:
+            claimed = self.subagent_store.claim(asset_type, self._get_store_gen_version(asset_type), subagent_id,
+                                                lease_token, self.LEASE_SECONDS, time.time())
+        else:
+            def take_lease(entry: Dict[str, Any], now: float) -> bool:
+                if subagent_id in entry['subagents_completed']:
+                    return False
+                if subagent_id in self._get_live_claims(entry, now):
+                    return False
+
+                if subagent_id not in entry['subagents_claimed']:
+                    entry['subagents_claimed'].append(subagent_id)
+                    entry['subagents_claimed'].sort()
+                entry['subagent_leases'][str(subagent_id)] = {
+                    'owner': lease_token,
+                    'expires_at': now + self.LEASE_SECONDS
+                }
+                return True
 
-            self.manifest_json[asset_type.value]['subagents_claimed'].append(subagent_id)
-            self.manifest_json[asset_type.value]['subagents_claimed'].sort()
-            self.io_controller.write_json(self.manifest_path, self.manifest_json)
-            self.logger.info(f"Claimed subagent {subagent_id} for {asset_type.value}")
-            return True
+            claimed = self._update_subagents(asset_type, take_lease)
+
+        if not claimed:
+            return None
+        self.logger.info(f"Claimed subagent {subagent_id} for {asset_type.value}")
+        return lease_token
 
     @try_catch
-    def mark_subagent_completed(self, asset_type: AssetType, subagent_id: int) -> bool:
-        if 'subagents_completed' not in self.manifest_json[asset_type.value]:
-            self.manifest_json[asset_type.value]['subagents_completed'] = []
-
-        if subagent_id not in self.manifest_json[asset_type.value]['subagents_completed']:
-            self.manifest_json[asset_type.value]['subagents_completed'].append(subagent_id)
-            self.manifest_json[asset_type.value]['subagents_completed'].sort()
-            self.io_controller.write_json(self.manifest_path, self.manifest_json)
-            self.logger.info(f"Marked subagent {subagent_id} as completed for {asset_type.value}")
+    def heartbeat_subagent(self, asset_type: AssetType, subagent_id: int, lease_token: str) -> bool:
+        """Extends the lease held by lease_token; False means the claim was lost and the work should stop."""
+        if self.subagent_store:
+            return self.subagent_store.renew(asset_type, self._get_store_gen_version(asset_type), subagent_id,
+                                             lease_token, self.LEASE_SECONDS, time.time())
+
+        def renew_lease(entry: Dict[str, Any], now: float) -> bool:
+            lease = entry['subagent_leases'].get(str(subagent_id))
+            if subagent_id in entry['subagents_completed'] or not lease or lease['owner'] != lease_token:
+                return False
+            lease['expires_at'] = now + self.LEASE_SECONDS
             return True
-        return False
 
+        return self._update_subagents(asset_type, renew_lease)
 
+    @try_catch
+    def mark_subagent_completed(self, asset_type: AssetType, subagent_id: int,
+                                lease_token: Optional[str] = None) -> bool:
+        """
+        Completes the subagent. With a lease_token, completion is refused while another
+        subagent holds a live lease on the same scene, since that one is still writing it.
+        """
+        if self.subagent_store:
+            completed = self.subagent_store.complete(asset_type, self._get_store_gen_version(asset_type), subagent_id,
+                                                     lease_token, time.time())
+        else:
+            def complete(entry: Dict[str, Any], now: float) -> bool:
+                if subagent_id in entry['subagents_completed']:
+                    return False
+                lease = entry['subagent_leases'].get(str(subagent_id))
+                if (lease_token and lease and lease['owner'] != lease_token
+                        and subagent_id in self._get_live_claims(entry, now)):
+                    self.logger.warning(f"Subagent {subagent_id} for {asset_type.value} is leased to another claim")
+                    return False
+                entry['subagents_completed'].append(subagent_id)
+                entry['subagents_completed'].sort()
+                entry['subagent_leases'].pop(str(subagent_id), None)
+                return True
+
+            completed = self._update_subagents(asset_type, complete)
+
+        if completed:
+            self.logger.info(f"Marked subagent {subagent_id} as completed for {asset_type.value}")
+        return completed
@@ -0,0 +1,124 @@
+import os
+import sqlite3
+import time
+from typing import List, Optional
+
+from scripts.enums import AssetType
+from scripts.logging_config import get_utility_logger
+
+
+class SqliteManifestStore:
+    """
+    Subagent claims and completions for one topic in a local SQLite database in WAL mode.
+    Every claim or completion is a single-row UPDATE, so concurrent subagents only contend
+    on the rows they touch instead of locking and rewriting the whole manifest.json.
+    Rows are scoped by the asset's current_gen_version, so a new generation starts clean.
+    Claims are leases: a claim whose lease_expires_at has passed can be taken by another owner,
+    identified by the lease token handed out when the claim was made.
+    """
+
+    BUSY_TIMEOUT = 10
+
+    def __init__(self, db_path: str, lease_seconds: float):
+        self.db_path = db_path
+        self.logger = get_utility_logger('SqliteManifestStore')
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Autocommit: each statement is its own transaction
+        self.connection = sqlite3.connect(db_path, timeout=self.BUSY_TIMEOUT, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS subagents (
+                asset_type TEXT NOT NULL,
+                gen_version INTEGER NOT NULL,
+                subagent_id INTEGER NOT NULL,
+                claimed_at REAL,
+                completed_at REAL,
+                lease_owner TEXT,
+                lease_expires_at REAL,
+                PRIMARY KEY (asset_type, gen_version, subagent_id)
+            )
+        """)
+        self._add_missing_columns(lease_seconds)
+
+    def _add_missing_columns(self, lease_seconds: float) -> None:
+        # Databases created before leases existed lack the lease columns
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(subagents)")}
+        lease_columns = [('lease_owner', 'TEXT'), ('lease_expires_at', 'REAL')]
+        missing = [(column, column_type) for column, column_type in lease_columns if column not in columns]
+        for column, column_type in missing:
+            self.connection.execute(f"ALTER TABLE subagents ADD COLUMN {column} {column_type}")
+        if missing:
+            # Their open claims get a fresh lease instead of all expiring at once
+            self.connection.execute(
+                "UPDATE subagents SET lease_expires_at = ? "
+                "WHERE claimed_at IS NOT NULL AND completed_at IS NULL AND lease_expires_at IS NULL",
+                (time.time() + lease_seconds,)
+            )
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def _ensure_row(self, asset_type: AssetType, gen_version: int, subagent_id: int) -> None:
+        self.connection.execute(
+            "INSERT OR IGNORE INTO subagents (asset_type, gen_version, subagent_id) VALUES (?, ?, ?)",
+            (asset_type.value, gen_version, subagent_id)
+        )
+
+    def _select_ids(self, asset_type: AssetType, gen_version: int, condition: str, params: tuple = ()) -> List[int]:
+        rows = self.connection.execute(
+            f"SELECT subagent_id FROM subagents WHERE asset_type = ? AND gen_version = ? AND {condition} "
+            "ORDER BY subagent_id",
+            (asset_type.value, gen_version, *params)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_completed(self, asset_type: AssetType, gen_version: int) -> List[int]:
+        return self._select_ids(asset_type, gen_version, "completed_at IS NOT NULL")
+
+    def get_claimed(self, asset_type: AssetType, gen_version: int, now: float) -> List[int]:
+        return self._select_ids(asset_type, gen_version, "claimed_at IS NOT NULL AND lease_expires_at > ?", (now,))
+
+    def claim(self, asset_type: AssetType, gen_version: int, subagent_id: int, owner: str,
+              lease_seconds: float, now: float) -> bool:
+        self._ensure_row(asset_type, gen_version, subagent_id)
+        cursor = self.connection.execute(
+            "UPDATE subagents SET claimed_at = ?, lease_owner = ?, lease_expires_at = ? "
+            "WHERE asset_type = ? AND gen_version = ? AND subagent_id = ? AND completed_at IS NULL "
+            "AND (claimed_at IS NULL OR lease_expires_at IS NULL OR lease_expires_at <= ?)",
+            (now, owner, now + lease_seconds, asset_type.value, gen_version, subagent_id, now)
+        )
+        return cursor.rowcount == 1
+
+    def renew(self, asset_type: AssetType, gen_version: int, subagent_id: int, owner: str,
+              lease_seconds: float, now: float) -> bool:
+        cursor = self.connection.execute(
+            "UPDATE subagents SET lease_expires_at = ? "
+            "WHERE asset_type = ? AND gen_version = ? AND subagent_id = ? AND completed_at IS NULL "
+            "AND claimed_at IS NOT NULL AND lease_owner = ?",
+            (now + lease_seconds, asset_type.value, gen_version, subagent_id, owner)
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, asset_type: AssetType, gen_version: int, subagent_id: int, owner: Optional[str],
+                 now: float) -> bool:
+        self._ensure_row(asset_type, gen_version, subagent_id)
+        # Without an owner anyone may complete; with one, a live lease held by another owner blocks it
+        cursor = self.connection.execute(
+            "UPDATE subagents SET completed_at = ?, lease_expires_at = NULL "
+            "WHERE asset_type = ? AND gen_version = ? AND subagent_id = ? AND completed_at IS NULL "
+            "AND (? IS NULL OR lease_owner IS NULL OR lease_owner = ? "
+            "OR lease_expires_at IS NULL OR lease_expires_at <= ?)",
+            (now, asset_type.value, gen_version, subagent_id, owner, owner, now)
+        )
+        return cursor.rowcount == 1
+
+    def clear_expired_claims(self, asset_type: AssetType, gen_version: int, now: float) -> None:
+        self.connection.execute(
+            "UPDATE subagents SET claimed_at = NULL, lease_owner = NULL, lease_expires_at = NULL "
+            "WHERE asset_type = ? AND gen_version = ? AND claimed_at IS NOT NULL "
+            "AND (lease_expires_at IS NULL OR lease_expires_at <= ?)",
+            (asset_type.value, gen_version, now)
+        )
@@ -63,10 +63,11 @@ class OutputController:
         if not file_path:
             self.logger.error(f"No file path provided for asset type: {asset_type}")
             return None
+        # Outputs are reread per scene and never mutated by callers, so reads are cached
         if file_path.endswith('.json'):
-            return self.io_controller.read_json(file_path.format(scene_index=scene_index))
+            return self.io_controller.read_json(file_path.format(scene_index=scene_index), cache=True)
         elif file_path.endswith('.md'):
-            return self.io_controller.read_text(file_path.format(scene_index=scene_index))
+            return self.io_controller.read_text(file_path.format(scene_index=scene_index), cache=True)
 
 
     def save_output(self, asset_type: AssetType, source_file: str) -> Tuple[Optional[str], Optional[int]]:
@@ -0,0 +1,53 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from scripts.controllers.utils.system_io_controller import SystemIOController
+from scripts.logging_config import get_utility_logger
+
+
+class RenderCacheController:
+    """
+    Stores rendered per-scene MP4 segments keyed by a content hash of everything
+    that affects the pixels of that scene: its TSX source, its frame window and the
+    viewport/style/render settings. Segments with the same settings share codec
+    parameters, so cached and freshly rendered parts can be stream-copy concatenated.
+    """
+
+    CACHE_VERSION = 1
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.logger = get_utility_logger('RenderCacheController')
+        self.io_controller = SystemIOController()
+
+    def scene_key(self, tsx_content: str, first_frame: int, end_frame: int,
+                  render_settings: Dict[str, Any]) -> str:
+        payload = json.dumps({
+            "cache_version": self.CACHE_VERSION,
+            "tsx_sha256": hashlib.sha256(tsx_content.encode('utf-8')).hexdigest(),
+            "frames": [first_frame, end_frame],
+            "settings": render_settings,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get_segment_path(self, key: str) -> Path:
+        return Path(self.cache_dir) / f"{key}.mp4"
+
+    def get_segment(self, key: str) -> Optional[Path]:
+        segment_path = self.get_segment_path(key)
+        if segment_path.exists() and segment_path.stat().st_size > 0:
+            self.logger.info(f"Render cache hit: {key}")
+            return segment_path
+        return None
+
+    def store_segment(self, key: str, source_path: Path) -> Path:
+        segment_path = self.get_segment_path(key)
+        self.io_controller.ensure_directory(self.cache_dir)
+        tmp_path = segment_path.with_suffix('.mp4.tmp')
+        self.io_controller.copy_file(str(source_path), str(tmp_path))
+        os.replace(tmp_path, segment_path)
+        self.logger.info(f"Stored segment in render cache: {segment_path}")
+        return segment_path
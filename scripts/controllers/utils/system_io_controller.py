@@ -1,6 +1,10 @@
 import os
 import json
 import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from pathlib import Path
 import shutil
 from typing import Any, Dict, List, Optional, Union
@@ -9,9 +13,63 @@ from scripts.controllers.utils.singleton import SingletonMeta
 
 
 class SystemIOController(metaclass=SingletonMeta):
+    # Budget for the opt-in read cache, charged by file size on disk
+    READ_CACHE_BYTES = 64 * 1024 * 1024
+    # Windows refuses to replace a file another process has open; these waits ride out short reads
+    REPLACE_RETRY_DELAYS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0)
 
     def __init__(self):
         self.encoding = 'utf-8'
+        # (kind, absolute path) -> ((st_mtime_ns, st_size), value), least recently used first
+        self._read_cache = OrderedDict()
+        self._read_cache_bytes = 0
+        self._read_cache_lock = threading.Lock()
+
+    def _get_cache_key(self, kind: str, filepath: str) -> tuple:
+        return (kind, os.path.abspath(filepath))
+
+    def _read_cached(self, filepath: str, kind: str, load) -> Any:
+        """
+        Returns the parsed value cached for filepath while its (st_mtime_ns, st_size) is
+        unchanged, otherwise loads and caches it. Cached values are shared between callers,
+        so they must be treated as read-only.
+        """
+        key = self._get_cache_key(kind, filepath)
+        # Stat before loading: a write in between leaves a stale signature, which only forces a reload
+        stat = os.stat(filepath)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._read_cache_lock:
+            entry = self._read_cache.get(key)
+            if entry and entry[0] == signature:
+                self._read_cache.move_to_end(key)
+                return entry[1]
+
+        value = load(filepath)
+        if stat.st_size > self.READ_CACHE_BYTES:
+            return value
+
+        with self._read_cache_lock:
+            previous = self._read_cache.pop(key, None)
+            if previous:
+                self._read_cache_bytes -= previous[0][1]
+            self._read_cache[key] = (signature, value)
+            self._read_cache_bytes += stat.st_size
+            while self._read_cache_bytes > self.READ_CACHE_BYTES:
+                _, (evicted_signature, _) = self._read_cache.popitem(last=False)
+                self._read_cache_bytes -= evicted_signature[1]
+        return value
+
+    def invalidate_cache(self, filepath: Optional[str] = None) -> None:
+        """Drops the cached reads of filepath, or the whole read cache when no path is given."""
+        with self._read_cache_lock:
+            if filepath is None:
+                self._read_cache.clear()
+                self._read_cache_bytes = 0
+                return
+            for kind in ('json', 'text'):
+                entry = self._read_cache.pop(self._get_cache_key(kind, filepath), None)
+                if entry:
+                    self._read_cache_bytes -= entry[0][1]
 
     def _normalize_path(self, filepath: str) -> str:
         """
@@ -35,6 +93,7 @@ class SystemIOController(metaclass=SingletonMeta):
         destination_path = self._normalize_path(destination_path)
         if not self.exists(source_path):
             raise FileNotFoundError(f"File not found: {source_path}")
+        self.invalidate_cache(destination_path)
         shutil.copy(source_path, destination_path)
         return True
 
@@ -75,35 +134,100 @@ class SystemIOController(metaclass=SingletonMeta):
             self.write_text(filepath, content)
         return True
 
+    def _load_json(self, filepath: str) -> Any:
+        with open(filepath, 'r', encoding=self.encoding) as f:
+            return json.load(f)
+
     @try_catch_dict
-    def read_json(self, filepath: str,check_exists: bool = True) -> Dict:
+    def read_json(self, filepath: str,check_exists: bool = True, cache: bool = False) -> Dict:
         filepath = self._normalize_path(filepath)
         if not self.exists(filepath):
             if check_exists:
                 raise FileNotFoundError(f"File not found: {filepath}")
             else:
                 return None
-        with open(filepath, 'r', encoding=self.encoding) as f:
-            return json.load(f)
+        if cache:
+            return self._read_cached(filepath, 'json', self._load_json)
+        return self._load_json(filepath)
+
+    def _fsync_directory(self, directory: str) -> None:
+        # Directories can only be opened for fsync on POSIX
+        if os.name != 'posix':
+            return
+        fd = os.open(directory or '.', os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _replace_with_retry(self, source: str, destination: str) -> None:
+        for delay in self.REPLACE_RETRY_DELAYS:
+            try:
+                os.replace(source, destination)
+                return
+            except PermissionError:
+                time.sleep(delay)
+        try:
+            os.replace(source, destination)
+        except PermissionError as e:
+            raise PermissionError(
+                f"Could not replace {destination} after {len(self.REPLACE_RETRY_DELAYS) + 1} attempts, "
+                f"another process keeps it open: {e}"
+            ) from e
+
+    def _atomic_write(self, filepath: str, content: str, sync_dir: bool = False) -> None:
+        """
+        Writes to a sibling temp file, fsyncs it and renames it over the target, so readers
+        see either the old or the new file and never a partial one. sync_dir also fsyncs
+        the directory so the rename itself survives a crash.
+        """
+        directory = self.get_directory(filepath)
+        tmp_path = os.path.join(directory, f".{os.path.basename(filepath)}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp_path, 'x', encoding=self.encoding) as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            self._replace_with_retry(tmp_path, filepath)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if sync_dir:
+            self._fsync_directory(directory)
 
     @try_catch_bool
-    def write_json(self, filepath: str, data: Union[Dict, List], indent: int = 2) -> bool:
+    def write_json(self, filepath: str, data: Union[Dict, List], indent: int = 2,
+                   atomic: bool = True, sync_dir: bool = False) -> bool:
         filepath = self._normalize_path(filepath)
         self.ensure_directory(self.get_directory(filepath))
+        self.invalidate_cache(filepath)
+        if atomic:
+            self._atomic_write(filepath, json.dumps(data, indent=indent, ensure_ascii=False), sync_dir=sync_dir)
+            return True
         with open(filepath, 'w', encoding=self.encoding) as f:
             json.dump(data, f, indent=indent, ensure_ascii=False)
         return True
 
-    @try_catch(return_on_error="")
-    def read_text(self, filepath: str) -> str:
-        filepath = self._normalize_path(filepath)
+    def _load_text(self, filepath: str) -> str:
         with open(filepath, 'r', encoding=self.encoding) as f:
             return f.read()
 
+    @try_catch(return_on_error="")
+    def read_text(self, filepath: str, cache: bool = False) -> str:
+        filepath = self._normalize_path(filepath)
+        if cache:
+            return self._read_cached(filepath, 'text', self._load_text)
+        return self._load_text(filepath)
+
     @try_catch_bool
-    def write_text(self, filepath: str, content: str) -> bool:
+    def write_text(self, filepath: str, content: str, atomic: bool = True, sync_dir: bool = False) -> bool:
         filepath = self._normalize_path(filepath)
         self.ensure_directory(self.get_directory(filepath))
+        self.invalidate_cache(filepath)
+        if atomic:
+            self._atomic_write(filepath, content, sync_dir=sync_dir)
+            return True
         with open(filepath, 'w', encoding=self.encoding) as f:
             f.write(content)
         return True
@@ -118,6 +242,7 @@ class SystemIOController(metaclass=SingletonMeta):
     def write_binary(self, filepath: str, data: bytes) -> bool:
         filepath = self._normalize_path(filepath)
         self.ensure_directory(self.get_directory(filepath))
+        self.invalidate_cache(filepath)
         with open(filepath, 'wb') as f:
             f.write(data)
         return True
@@ -127,6 +252,7 @@ class SystemIOController(metaclass=SingletonMeta):
         filepath = self._normalize_path(filepath)
         if not self.exists(filepath):
             raise FileNotFoundError(f"File not found: {filepath}")
+        self.invalidate_cache(filepath)
         os.remove(filepath)
         return True
 
@@ -17,11 +17,11 @@ class VideoStepMetadataController(metaclass=SingletonMeta):
     def get_metadata_path(self, asset_type: AssetType) -> str:
         return ClaudeCliConfig.get_metadata_path(asset_type)
 
-    def read(self, asset_type: AssetType) -> Dict[str, Any]:
+    def read(self, asset_type: AssetType, cache: bool = False) -> Dict[str, Any]:
         metadata_path = self.get_metadata_path(asset_type)
         if not os.path.exists(metadata_path):
             return {}
-        return self.io_controller.read_json(metadata_path) or {}
+        return self.io_controller.read_json(metadata_path, cache=cache) or {}
 
     def write(self, asset_type: AssetType, metadata: Dict[str, Any]) -> bool:
         metadata_path = self.get_metadata_path(asset_type)
@@ -33,7 +33,7 @@ class VideoStepMetadataController(metaclass=SingletonMeta):
         return self.write(asset_type, metadata)
 
     def get_field(self, asset_type: AssetType, field: str, default: Any = None) -> Any:
-        metadata = self.read(asset_type)
+        metadata = self.read(asset_type, cache=True)
         return metadata.get(field, default)
 
     def get_total_scenes(self, asset_type: AssetType) -> int:
@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 from glob import glob
 
 from scripts.controllers.utils.decorators.try_catch import try_catch
@@ -78,8 +78,11 @@ class VideoStepSubStatusController(metaclass=SingletonMeta):
             return {'success': False, 'scene_index': -1, 'message': 'No available scenes to claim'}
 
         for subagent_id in available:
-            if self.manifest_controller.claim_subagent(asset_type, subagent_id):
-                return {'success': True, 'scene_index': subagent_id, 'message': f'Claimed scene {subagent_id}'}
+            lease_token = self.manifest_controller.claim_subagent(asset_type, subagent_id)
+            if lease_token:
+                # The subagent keeps the token for heartbeat and mark_subagent_completed
+                return {'success': True, 'scene_index': subagent_id, 'lease_token': lease_token,
+                        'message': f'Claimed scene {subagent_id}'}
 
         return {'success': False, 'scene_index': -1, 'message': 'All scenes claimed by other agents'}
 
@@ -113,5 +116,10 @@ class VideoStepSubStatusController(metaclass=SingletonMeta):
         }
 
     @try_catch
-    def mark_subagent_completed(self, asset_type: AssetType, subagent_id: int) -> bool:
-        return self.manifest_controller.mark_subagent_completed(asset_type, subagent_id)
+    def mark_subagent_completed(self, asset_type: AssetType, subagent_id: int,
+                                lease_token: Optional[str] = None) -> bool:
+        return self.manifest_controller.mark_subagent_completed(asset_type, subagent_id, lease_token)
+
+    @try_catch
+    def heartbeat(self, asset_type: AssetType, subagent_id: int, lease_token: str) -> bool:
+        return self.manifest_controller.heartbeat_subagent(asset_type, subagent_id, lease_token)
@@ -8,6 +8,9 @@ Usage:
     python scripts/export.py --mode p  (portrait mode)
     python scripts/export.py --mode l  (landscape mode, default)
     python scripts/export.py --headless false  (show browser window)
+    python scripts/export.py --renderer virtual  (deterministic frame-by-frame render)
+    python scripts/export.py --single-pass  (crop at capture, mux audio during the only encode)
+    python scripts/export.py --previews  (also write poster, sprite sheet and preview clip)
 """
 
 import argparse
@@ -18,6 +21,7 @@ import subprocess
 import shutil
 from datetime import datetime
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 from playwright.sync_api import sync_playwright, Page, TimeoutError as PlaywrightTimeoutError
 
 import os
@@ -28,6 +32,29 @@ if project_root not in sys.path:
 
 from scripts.controllers.manifest_controller import ManifestController
 from scripts.enums import AssetType
+from scripts.render_ladder import render_ladder
+from scripts.scene_chapters import build_chapter_args, load_scene_chapters, remove_chapter_metadata
+from scripts.preview_assets import (
+    build_preview_filter,
+    build_preview_outputs,
+    finalize_preview_assets,
+    get_preview_dir,
+    prepare_preview_dir,
+)
+from scripts.record_video_cdp import (
+    record_video_cdp,
+    check_video_bundle_served,
+    start_static_player_server,
+    get_browser_launch_args,
+    BROWSER_PROFILES,
+    DEFAULT_BROWSER_PROFILE,
+    DEVICE_SCALE_FACTOR,
+    wait_for_player_ready,
+    wait_for_fullscreen,
+    wait_for_playback_start,
+    wait_for_next_paint,
+    has_playback_ended,
+)
 
 
 # ============================================================================
@@ -39,7 +66,8 @@ def check_ffmpeg_available() -> bool:
     return shutil.which('ffmpeg') is not None
 
 
-def convert_webm_to_mp4(webm_path: Path, mp4_path: Path, quality: str = 'high') -> bool:
+def convert_webm_to_mp4(webm_path: Path, mp4_path: Path, quality: str = 'high',
+                        threads: Optional[int] = None) -> bool:
     """Convert WebM to MP4 using ffmpeg with high quality settings."""
     if not check_ffmpeg_available():
         print("ffmpeg is not installed or not in PATH")
@@ -60,8 +88,10 @@ def convert_webm_to_mp4(webm_path: Path, mp4_path: Path, quality: str = 'high')
         '-c:v', 'libx264', '-crf', settings['crf'], '-preset', settings['preset'],
         '-c:a', 'aac', '-b:a', settings['audio_bitrate'],
         '-movflags', '+faststart', '-pix_fmt', 'yuv420p', '-y',
-        str(mp4_path)
     ]
+    if threads:
+        cmd.extend(['-threads', str(threads)])
+    cmd.append(str(mp4_path))
 
     try:
         result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True)
@@ -94,9 +124,16 @@ def merge_video_audio(
     crop_left: int = 190,
     crop_top: int = 38,
     crop_right: int = 190,
-    crop_bottom: int = 45
+    crop_bottom: int = 45,
+    threads: Optional[int] = None,
+    previews: bool = False,
+    chapters: Optional[List[Dict[str, Any]]] = None
 ) -> Path:
-    """Merge an MP4 video file with an MP3 audio file."""
+    """
+    Merge an MP4 video file with an MP3 audio file. With previews the poster, sprite
+    sheet and animated preview are written from the same ffmpeg invocation; with
+    chapters each scene start gets a forced keyframe and an MP4 chapter.
+    """
     video = Path(video_path)
     audio = Path(audio_path)
 
@@ -123,13 +160,34 @@ def merge_video_audio(
         "-i", str(audio),
     ]
 
-    if has_crop:
-        crop_filter = build_crop_filter(crop_left, crop_top, crop_right, crop_bottom)
+    crop_filter = build_crop_filter(crop_left, crop_top, crop_right, crop_bottom) if has_crop else None
+    video_map = "0:v:0"
+    # Copied streams keep their GOPs, so only the chapters apply without a crop
+    chapter_args = build_chapter_args(chapters, output, 2, force_keyframes=has_crop)
+    cmd.extend(chapter_args['input'])
+    preview_dir = get_preview_dir(output) if previews else None
+
+    if preview_dir:
+        # Previews branch off this merge's decode instead of re-reading the finished file
+        prepare_preview_dir(preview_dir)
+        graph = build_preview_filter("0:v")
+        if crop_filter:
+            graph = f"[0:v]{crop_filter},split=2[vmain][vpreview];{build_preview_filter('vpreview')}"
+            video_map = "[vmain]"
+        cmd.extend(["-filter_complex", graph])
+    elif crop_filter:
         cmd.extend(["-vf", crop_filter])
-    else:
+
+    if not crop_filter:
         cmd.extend(["-c:v", "copy"])
 
-    cmd.extend(["-map", "0:v:0", "-map", "1:a:0", str(output)])
+    cmd.extend(["-map", video_map, "-map", "1:a:0"])
+    cmd.extend(chapter_args['output'])
+    if threads:
+        cmd.extend(["-threads", str(threads)])
+    cmd.append(str(output))
+    if preview_dir:
+        cmd.extend(build_preview_outputs(preview_dir))
 
     print(f"\nMerging video and audio...")
     print(f"  Video: {video}")
@@ -137,14 +195,21 @@ def merge_video_audio(
     print(f"  Skip: {audio_delay_ms}ms ({delay_seconds}s)")
     if has_crop:
         print(f"  Crop: left={crop_left}, top={crop_top}, right={crop_right}, bottom={crop_bottom}")
+    if chapters:
+        print(f"  Chapters: {len(chapters)} scenes")
     print(f"  Output: {output}")
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+    finally:
+        remove_chapter_metadata(chapter_args)
 
     if result.returncode != 0:
         raise RuntimeError(f"FFmpeg failed: {result.stderr}")
 
     print(f"Successfully created: {output}")
+    if preview_dir:
+        finalize_preview_assets(preview_dir)
     return output
 
 
@@ -177,14 +242,13 @@ def check_server_running(url: str, max_retries: int = 3, retry_delay: int = 2) -
     return False
 
 
-def wait_for_video_player_ready(page: Page, timeout: int = 30000, wait_delay: int = 4) -> bool:
-    """Wait for video player component to be ready."""
+def wait_for_video_player_ready(page: Page, timeout: int = 30000, ready_timeout: int = 15000) -> bool:
+    """Wait for the video player component, its audio, fonts and scene images to be ready."""
     try:
         print("Waiting for video player component (#video-player-recording)...")
         page.wait_for_selector('#video-player-recording', timeout=timeout, state='visible')
         print(f"Video player component is visible")
-        print(f"  Waiting {wait_delay} seconds for video to initialize...")
-        time.sleep(wait_delay)
+        wait_for_player_ready(page, timeout=ready_timeout)
         print("Video player is ready")
         return True
     except PlaywrightTimeoutError:
@@ -209,13 +273,13 @@ def click_fullscreen(page: Page) -> bool:
                 if button:
                     button.click()
                     print(f"Fullscreen button clicked (selector: {selector})")
-                    time.sleep(1)
+                    wait_for_fullscreen(page)
                     return True
             except:
                 continue
 
         page.keyboard.press('f')
-        time.sleep(1)
+        wait_for_fullscreen(page)
         return True
 
     except Exception as e:
@@ -244,7 +308,7 @@ def turn_off_captions(page: Page) -> bool:
                     if 'hide captions' in title.lower():
                         button.click()
                         print("Clicked caption button to turn off captions")
-                        time.sleep(0.5)
+                        wait_for_next_paint(page)
                         return True
 
                     if 'show captions' in title.lower():
@@ -254,7 +318,7 @@ def turn_off_captions(page: Page) -> bool:
                     if 'subtitle off' in aria_label.lower():
                         button.click()
                         print("Clicked caption button to turn off captions")
-                        time.sleep(0.5)
+                        wait_for_next_paint(page)
                         return True
 
                     if 'subtitle on' in aria_label.lower():
@@ -281,7 +345,7 @@ def click_play(page: Page) -> bool:
             if thumbnail_play_button:
                 thumbnail_play_button.click()
                 print("Thumbnail play button clicked")
-                time.sleep(0.5)
+                wait_for_playback_start(page)
                 return True
         except:
             pass
@@ -298,13 +362,13 @@ def click_play(page: Page) -> bool:
                 if button:
                     button.click()
                     print(f"Play button clicked (selector: {selector})")
-                    time.sleep(0.5)
+                    wait_for_playback_start(page)
                     return True
             except:
                 continue
 
         page.keyboard.press('Space')
-        time.sleep(0.5)
+        wait_for_playback_start(page)
         return True
 
     except Exception as e:
@@ -337,8 +401,15 @@ def get_video_duration(page: Page) -> float:
 
 
 def record_video(version: str, mode: str = 'l', base_url: str = "http://localhost:5173",
-                 headless: bool = True, output_dir: str = "./recordings") -> Path:
-    """Record video from the React video player and return the recorded file path."""
+                 headless: bool = True, output_dir: str = "./recordings",
+                 browser_profile: str = DEFAULT_BROWSER_PROFILE) -> Tuple[Path, int]:
+    """
+    Record video from the React video player.
+
+    Returns the recorded file path and the measured lead-in in ms: the time from
+    page creation (when Playwright starts recording) until playback was confirmed,
+    which is the pre-roll to skip when merging the audio.
+    """
     url = f"{base_url}/{version}/{mode}"
     mode_suffix = f"-{mode}" if mode else "l"
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
@@ -361,7 +432,7 @@ def record_video(version: str, mode: str = 'l', base_url: str = "http://localhos
 
     with sync_playwright() as p:
         print("Launching browser...")
-        browser = p.chromium.launch(headless=headless, args=['--mute-audio'])
+        browser = p.chromium.launch(headless=headless, args=get_browser_launch_args(browser_profile))
 
         viewport_width = 1708   # 1708
         viewport_height = 827   # 827          
@@ -378,13 +449,13 @@ def record_video(version: str, mode: str = 'l', base_url: str = "http://localhos
         )
 
         page = context.new_page()
+        recording_started = time.time()
 
         try:
             print(f"Navigating to {url}...")
             page.goto(url, wait_until='networkidle')
-            time.sleep(0.5)
 
-            if not wait_for_video_player_ready(page, timeout=30000, wait_delay=4):
+            if not wait_for_video_player_ready(page, timeout=30000):
                 raise RuntimeError("Video player component did not load properly")
 
             click_fullscreen(page)
@@ -392,24 +463,28 @@ def record_video(version: str, mode: str = 'l', base_url: str = "http://localhos
 
             if not click_play(page):
                 raise RuntimeError("Could not start video playback")
+            lead_in_ms = int((time.time() - recording_started) * 1000)
+            print(f"Measured lead-in: {lead_in_ms}ms")
 
             print("Hiding UI elements...")
             page.keyboard.down("Control")
             page.keyboard.press("h")
             page.keyboard.up("Control")
-            time.sleep(0.5)
+            wait_for_next_paint(page)
 
             duration = get_video_duration(page)
 
             if duration > 0:
                 wait_time = duration + 5
-                print(f"Recording video... (waiting {wait_time:.1f} seconds)")
+                print(f"Recording video... (until playback ends, at most {wait_time:.1f} seconds)")
                 start_time = time.time()
                 while time.time() - start_time < wait_time:
+                    if has_playback_ended(page):
+                        break
                     elapsed = time.time() - start_time
                     progress = (elapsed / wait_time) * 100
                     print(f"  Progress: {progress:.1f}% ({elapsed:.1f}s / {wait_time:.1f}s)", end='\r')
-                    time.sleep(1)
+                    time.sleep(0.5)
                 print()
             else:
                 print("Could not determine video duration, recording for 60 seconds...")
@@ -438,23 +513,39 @@ def record_video(version: str, mode: str = 'l', base_url: str = "http://localhos
         mp4_output = output_path.with_suffix('.mp4')
         if convert_webm_to_mp4(webm_output, mp4_output, quality='high'):
             print(f"MP4 saved to: {mp4_output}")
-            return mp4_output
+            return mp4_output, lead_in_ms
 
-    return webm_output
+    return webm_output, lead_in_ms
 
 
 # ============================================================================
 # Main Export Function
 # ============================================================================
 
+def record_preview_dir(manifest: ManifestController, final_output) -> None:
+    """Stores the preview folder in the manifest so the deploy uploads it with the video."""
+    preview_dir = get_preview_dir(Path(final_output))
+    if preview_dir.is_dir():
+        manifest.update_metadata('preview_dir', preview_dir.as_posix())
+
+
 def export_video(mode: str = 'l', headless: bool = False, base_url: str = "http://localhost:5173",
-                 skip_ms: int = 10500, crop_left: int = 190, crop_top: int = 38,
-                 crop_right: int = 190, crop_bottom: int = 45) -> Path:
+                 skip_ms: Optional[int] = None, crop_left: int = 190, crop_top: int = 38,
+                 crop_right: int = 190, crop_bottom: int = 45, renderer: str = 'webm',
+                 single_pass: bool = False, previews: bool = False, chapters: bool = True,
+                 browser_profile: str = DEFAULT_BROWSER_PROFILE) -> Path:
     """
     Main export function that:
     1. Reads video version and audio path from manifest
-    2. Records the video
+    2. Records the video (Playwright WebM capture, or the CDP virtual-time renderer)
     3. Merges video with audio
+
+    With single_pass the CDP recorder crops at capture time and muxes the audio in
+    its only encode, so steps 2 and 3 collapse into one ffmpeg invocation.
+
+    With previews the poster, sprite sheet and animated preview are branched off
+    whichever encode produces the final video, so it is never decoded again. With
+    chapters the Direction scene starts become forced keyframes and MP4 chapters.
     """
     # Get manifest data
     manifest = ManifestController()
@@ -471,25 +562,84 @@ def export_video(mode: str = 'l', headless: bool = False, base_url: str = "http:
     version = str(video_data['version'])
     audio_path = audio_data['path']
 
+    # CDP captures start once the player is ready, so there is no pre-roll to skip.
+    # WebM captures keep skip_ms unset so the measured lead-in is used instead.
+    if renderer == 'virtual':
+        skip_ms = 0
+    elif skip_ms is None and single_pass:
+        skip_ms = 0
+
     print(f"\n{'='*60}")
     print(f"Export Configuration (from manifest):")
     print(f"  Video Version: {version}")
     print(f"  Audio Path: {audio_path}")
     print(f"  Mode: {'Portrait' if mode == 'p' else 'Landscape'}")
     print(f"  Headless: {headless}")
+    print(f"  Renderer: {renderer}")
+    print(f"  Single pass: {single_pass}")
+    print(f"  Previews: {previews}")
+    print(f"  Chapters: {chapters}")
+    print(f"  Browser profile: {browser_profile}")
     print(f"  Base URL: {base_url}")
-    print(f"  Skip (ms): {skip_ms}")
+    print(f"  Skip (ms): {skip_ms if skip_ms is not None else 'measured lead-in'}")
     print(f"  Crop: left={crop_left}, top={crop_top}, right={crop_right}, bottom={crop_bottom}")
     print(f"{'='*60}\n")
 
+    if single_pass:
+        print("\n[Step 1/1] Recording, cropping and muxing audio in one encode...")
+        success, final_output = record_video_cdp(
+            version=int(version),
+            mode=mode,
+            base_url=base_url,
+            headless=headless,
+            stream=True,
+            renderer='virtual' if renderer == 'virtual' else 'realtime',
+            crop=(crop_left, crop_top, crop_right, crop_bottom),
+            audio_path=audio_path,
+            audio_skip_ms=skip_ms,
+            previews=previews,
+            chapters=chapters,
+            browser_profile=browser_profile
+        )
+        if not success:
+            raise RuntimeError("Single-pass export failed")
+        if previews:
+            record_preview_dir(manifest, final_output)
+
+        print(f"\n{'='*60}")
+        print(f"Export complete!")
+        print(f"  Final video: {final_output}")
+        print(f"{'='*60}\n")
+        return final_output
+
     # Step 1: Record the video
     print("\n[Step 1/2] Recording video...")
-    recorded_video = record_video(
-        version=version,
-        mode=mode,
-        base_url=base_url,
-        headless=headless
-    )
+    if renderer == 'virtual':
+        success, recorded_video = record_video_cdp(
+            version=int(version),
+            mode=mode,
+            base_url=base_url,
+            headless=headless,
+            renderer='virtual',
+            browser_profile=browser_profile
+        )
+        if not success:
+            raise RuntimeError("Virtual-time render failed")
+
+        # CDP frames are captured at device pixel ratio
+        crop_left, crop_top, crop_right, crop_bottom = (
+            value * DEVICE_SCALE_FACTOR for value in (crop_left, crop_top, crop_right, crop_bottom)
+        )
+    else:
+        recorded_video, lead_in_ms = record_video(
+            version=version,
+            mode=mode,
+            base_url=base_url,
+            headless=headless,
+            browser_profile=browser_profile
+        )
+        if skip_ms is None:
+            skip_ms = lead_in_ms
 
     # Step 2: Merge video with audio
     print("\n[Step 2/2] Merging video with audio...")
@@ -500,8 +650,12 @@ def export_video(mode: str = 'l', headless: bool = False, base_url: str = "http:
         crop_left=crop_left,
         crop_top=crop_top,
         crop_right=crop_right,
-        crop_bottom=crop_bottom
+        crop_bottom=crop_bottom,
+        previews=previews,
+        chapters=load_scene_chapters() if chapters else None
     )
+    if previews:
+        record_preview_dir(manifest, final_output)
 
     print(f"\n{'='*60}")
     print(f"Export complete!")
@@ -523,8 +677,25 @@ def parse_args():
     parser.add_argument('--headless', type=lambda x: str(x).lower() == 'true',
                         default=False, metavar='true|false',
                         help='Run browser in headless mode: true or false (default: true)')
-    parser.add_argument('--skip', '-s', type=int, default=10500,
-                        help='Skip from start in ms (default: 10500)')
+    parser.add_argument('--renderer', type=str, choices=['webm', 'virtual'], default='webm',
+                        help='webm: Playwright screen recording, virtual: deterministic CDP frame stepping (default: webm)')
+    parser.add_argument('--single-pass', action='store_true',
+                        help='Capture with CDP, crop at capture time and mux audio in a single encode')
+    parser.add_argument('--static', action='store_true',
+                        help='Record from a production build on a local static server instead of the dev server')
+    parser.add_argument('--previews', action='store_true',
+                        help='Write a poster, sprite sheet and animated preview from the final encode')
+    parser.add_argument('--browser-profile', type=str, choices=list(BROWSER_PROFILES),
+                        default=DEFAULT_BROWSER_PROFILE,
+                        help=f'Chromium launch flags; software is fastest on GPU-less nodes (default: {DEFAULT_BROWSER_PROFILE})')
+    parser.add_argument('--no-chapters', action='store_true',
+                        help='Do not force keyframes or write MP4 chapters at scene boundaries')
+    parser.add_argument('--ladder', action='store_true',
+                        help='Also encode 1080p/720p/480p renditions of the final video in one ffmpeg pass')
+    parser.add_argument('--hls', action='store_true',
+                        help='With --ladder, also write CMAF HLS segments and a master playlist')
+    parser.add_argument('--skip', '-s', type=int, default=None,
+                        help='Skip from start in ms (default: measured lead-in, or 0 for CDP captures)')
     parser.add_argument('--crop-left', type=int, default=190,
                         help='Pixels to crop from left (default: 190)')
     parser.add_argument('--crop-top', type=int, default=38,
@@ -540,20 +711,42 @@ def main():
     """Main entry point."""
     args = parse_args()
 
+    static_server = None
     try:
-        export_video(
+        base_url = args.base_url
+        if args.static:
+            static_server = start_static_player_server()
+            if not static_server:
+                raise RuntimeError("Could not build and serve the production player")
+            base_url = static_server.base_url
+
+        final_output = export_video(
             mode=args.mode,
             headless=args.headless,
-            base_url=args.base_url,
+            base_url=base_url,
             skip_ms=args.skip,
             crop_left=args.crop_left,
             crop_top=args.crop_top,
             crop_right=args.crop_right,
-            crop_bottom=args.crop_bottom
+            crop_bottom=args.crop_bottom,
+            renderer=args.renderer,
+            single_pass=args.single_pass,
+            previews=args.previews,
+            chapters=not args.no_chapters,
+            browser_profile=args.browser_profile
         )
+        if static_server and not check_video_bundle_served(static_server):
+            raise RuntimeError(f"Recorded without the video bundle: {final_output}")
+
+        if args.ladder:
+            print("\nEncoding rendition ladder...")
+            render_ladder(str(final_output), hls=args.hls)
     except (FileNotFoundError, ValueError, RuntimeError) as e:
         print(f"Error: {e}")
         sys.exit(1)
+    finally:
+        if static_server:
+            static_server.stop()
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@ import argparse
 import subprocess
 import sys
 from pathlib import Path
+from typing import Optional
 
 
 def validate_file_exists(file_path: str, file_type: str) -> Path:
@@ -36,7 +37,8 @@ def merge_video_audio(
     crop_left: int = 0,
     crop_top: int = 0,
     crop_right: int = 0,
-    crop_bottom: int = 0
+    crop_bottom: int = 0,
+    threads: Optional[int] = None
 ) -> Path:
     video = validate_file_exists(video_path, "Video")
     audio = validate_file_exists(audio_path, "Audio")
@@ -72,8 +74,10 @@ def merge_video_audio(
         "-map", "0:v:0",
         "-map", "1:a:0",
         "-shortest",
-        str(output)
     ])
+    if threads:
+        cmd.extend(["-threads", str(threads)])
+    cmd.append(str(output))
 
     print(f"Merging video and audio...")
     print(f"  Video: {video}")
@@ -0,0 +1,196 @@
+import argparse
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+POSTER_FILE = "poster.jpg"
+SPRITE_FILE = "sprite.jpg"
+SPRITE_VTT_FILE = "sprite.vtt"
+PREVIEW_FILE = "preview.mp4"
+THUMBS_DIR = "thumbs"
+
+# asset name -> (file name, mime type)
+PREVIEW_FILES = {
+    'poster': (POSTER_FILE, 'image/jpeg'),
+    'sprite': (SPRITE_FILE, 'image/jpeg'),
+    'sprite_vtt': (SPRITE_VTT_FILE, 'text/vtt'),
+    'preview': (PREVIEW_FILE, 'video/mp4'),
+}
+
+POSTER_SECONDS = 3.0
+POSTER_WIDTH = 1280
+SPRITE_INTERVAL = 2
+SPRITE_COLUMNS = 10
+SPRITE_THUMB_WIDTH = 160
+PREVIEW_START_SECONDS = 2.0
+PREVIEW_SECONDS = 6.0
+PREVIEW_FPS = 12
+PREVIEW_WIDTH = 480
+
+
+def get_preview_dir(video_path: Path) -> Path:
+    """Preview assets for a recording live in <stem>_preview/ next to it."""
+    return video_path.parent / f"{video_path.stem}_preview"
+
+
+def prepare_preview_dir(preview_dir: Path) -> None:
+    thumbs_dir = preview_dir / THUMBS_DIR
+    if thumbs_dir.exists():
+        shutil.rmtree(thumbs_dir)
+    thumbs_dir.mkdir(parents=True, exist_ok=True)
+
+
+def build_preview_filter(source_label: str) -> str:
+    """Branches the encode's video into the poster, sprite thumbnails and animated preview."""
+    return ';'.join([
+        f"[{source_label}]split=3[pv_poster_in][pv_thumbs_in][pv_preview_in]",
+        f"[pv_poster_in]trim=start={POSTER_SECONDS},setpts=PTS-STARTPTS,scale={POSTER_WIDTH}:-2[pv_poster]",
+        f"[pv_thumbs_in]fps=1/{SPRITE_INTERVAL},scale={SPRITE_THUMB_WIDTH}:-2[pv_thumbs]",
+        f"[pv_preview_in]trim=start={PREVIEW_START_SECONDS}:duration={PREVIEW_SECONDS},setpts=PTS-STARTPTS,"
+        f"fps={PREVIEW_FPS},scale={PREVIEW_WIDTH}:-2,format=yuv420p[pv_preview]",
+    ])
+
+
+def build_preview_outputs(preview_dir: Path) -> List[str]:
+    return [
+        '-map', '[pv_poster]', '-frames:v', '1', '-q:v', '2',
+        str(preview_dir / POSTER_FILE),
+        '-map', '[pv_thumbs]', '-q:v', '4',
+        str(preview_dir / THUMBS_DIR / 'thumb_%04d.jpg'),
+        '-map', '[pv_preview]', '-an', '-map_chapters', '-1',
+        '-c:v', 'libx264', '-crf', '28', '-preset', 'veryfast',
+        '-movflags', '+faststart',
+        str(preview_dir / PREVIEW_FILE),
+    ]
+
+
+def probe_image_size(image_path: Path) -> Optional[Dict[str, int]]:
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=width,height',
+        '-of', 'csv=p=0:s=x',
+        str(image_path)
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0 or 'x' not in result.stdout:
+        return None
+    width, height = result.stdout.strip().split('x')[:2]
+    return {'width': int(width), 'height': int(height)}
+
+
+def format_vtt_time(seconds: float) -> str:
+    hours, remainder = divmod(int(seconds), 3600)
+    minutes, secs = divmod(remainder, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}.000"
+
+
+def write_sprite_vtt(preview_dir: Path, count: int, thumb_width: int, thumb_height: int) -> Path:
+    lines = ['WEBVTT', '']
+    for index in range(count):
+        x = (index % SPRITE_COLUMNS) * thumb_width
+        y = (index // SPRITE_COLUMNS) * thumb_height
+        lines.append(f"{format_vtt_time(index * SPRITE_INTERVAL)} --> {format_vtt_time((index + 1) * SPRITE_INTERVAL)}")
+        lines.append(f"{SPRITE_FILE}#xywh={x},{y},{thumb_width},{thumb_height}")
+        lines.append('')
+
+    vtt_path = preview_dir / SPRITE_VTT_FILE
+    vtt_path.write_text('\n'.join(lines), encoding='utf-8')
+    return vtt_path
+
+
+def assemble_sprite(preview_dir: Path) -> Optional[Path]:
+    """Tiles the thumbnails written during the encode; only small JPEGs are decoded here."""
+    thumbs_dir = preview_dir / THUMBS_DIR
+    thumbs = sorted(thumbs_dir.glob('thumb_*.jpg'))
+    if not thumbs:
+        return None
+
+    thumb_size = probe_image_size(thumbs[0])
+    if not thumb_size:
+        return None
+
+    rows = -(-len(thumbs) // SPRITE_COLUMNS)
+    columns = min(len(thumbs), SPRITE_COLUMNS)
+    sprite_path = preview_dir / SPRITE_FILE
+    cmd = [
+        'ffmpeg', '-y', '-loglevel', 'error',
+        '-framerate', '1',
+        '-i', str(thumbs_dir / 'thumb_%04d.jpg'),
+        '-vf', f"tile={columns}x{rows}",
+        '-frames:v', '1', '-q:v', '4',
+        str(sprite_path)
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"FFmpeg failed: {result.stderr}")
+
+    write_sprite_vtt(preview_dir, len(thumbs), thumb_size['width'], thumb_size['height'])
+    return sprite_path
+
+
+def finalize_preview_assets(preview_dir: Path) -> Dict[str, Path]:
+    """Assembles the sprite sheet and returns the preview files that were produced."""
+    assemble_sprite(preview_dir)
+    shutil.rmtree(preview_dir / THUMBS_DIR, ignore_errors=True)
+
+    assets = {}
+    for name, (file_name, _) in PREVIEW_FILES.items():
+        path = preview_dir / file_name
+        if path.exists():
+            assets[name] = path
+            print(f"  Preview {name}: {path}")
+    return assets
+
+
+def generate_preview_assets(video_path: str, preview_dir: str = None) -> Dict[str, Path]:
+    """Standalone fallback for recordings exported before previews were produced in the encode."""
+    video = Path(video_path)
+    if not video.exists():
+        raise FileNotFoundError(f"Video file not found: {video_path}")
+
+    output = Path(preview_dir) if preview_dir else get_preview_dir(video)
+    prepare_preview_dir(output)
+
+    cmd = [
+        'ffmpeg', '-y', '-loglevel', 'error', '-nostats',
+        '-i', str(video),
+        '-filter_complex', build_preview_filter('0:v'),
+    ]
+    cmd.extend(build_preview_outputs(output))
+
+    print(f"Generating preview assets...")
+    print(f"  Input: {video}")
+    print(f"  Output: {output}")
+
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"FFmpeg failed: {result.stderr}")
+
+    return finalize_preview_assets(output)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Generate a poster, scrubbing sprite sheet and animated preview for a video"
+    )
+    parser.add_argument("--input", "-i", required=True, help="Path to the video")
+    parser.add_argument("--output-dir", "-o", help="Directory for the assets (default: <input stem>_preview)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    try:
+        generate_preview_assets(args.input, args.output_dir)
+    except (FileNotFoundError, RuntimeError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
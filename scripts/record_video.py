@@ -5,7 +5,7 @@ import subprocess
 import sys
 import time
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple
 
 import requests
 from playwright.sync_api import Page, sync_playwright
@@ -22,6 +22,16 @@ from scripts.controllers.manifest_controller import ManifestController
 from scripts.controllers.utils.system_io_controller import SystemIOController
 from scripts.enums import AssetType
 from scripts.merge_video_audio import merge_video_audio
+from scripts.record_video_cdp import (
+    BROWSER_PROFILES,
+    DEFAULT_BROWSER_PROFILE,
+    get_browser_launch_args,
+    wait_for_player_ready,
+    wait_for_fullscreen,
+    wait_for_playback_start,
+    wait_for_next_paint,
+    has_playback_ended,
+)
 
 
 DEFAULT_BASE_URL = "http://localhost:5173"
@@ -52,7 +62,8 @@ def print_ffmpeg_install_instructions():
     print("  - Linux: sudo apt install ffmpeg")
 
 
-def convert_webm_to_mp4(webm_path: Path, mp4_path: Path, quality: str = 'high') -> bool:
+def convert_webm_to_mp4(webm_path: Path, mp4_path: Path, quality: str = 'high',
+                        threads: Optional[int] = None) -> bool:
     if not is_ffmpeg_available():
         print_ffmpeg_install_instructions()
         return False
@@ -71,8 +82,10 @@ def convert_webm_to_mp4(webm_path: Path, mp4_path: Path, quality: str = 'high')
         '-movflags', '+faststart',
         '-pix_fmt', 'yuv420p',
         '-y',
-        str(mp4_path)
     ]
+    if threads:
+        cmd.extend(['-threads', str(threads)])
+    cmd.append(str(mp4_path))
 
     try:
         subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True)
@@ -114,13 +127,19 @@ def ensure_server_running(base_url: str):
 
     print("\nServer not running. Starting development server...")
     visualise_video_path = Path(project_root) / "visualise_video"
-    server_process = subprocess.Popen(
-        ["npm", "run", "dev"],
-        cwd=str(visualise_video_path),
-        shell=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE
-    )
+    # The server outlives the recording, so its output goes to a file instead of an undrained pipe
+    server_log_path = Path(OUTPUT_DIR) / "server_dev.log"
+    server_log_path.parent.mkdir(parents=True, exist_ok=True)
+    # A list with shell=True runs a bare "npm" on POSIX, so the shell is only used on Windows
+    is_windows = sys.platform == 'win32'
+    with open(server_log_path, 'wb') as server_log:
+        server_process = subprocess.Popen(
+            "npm run dev" if is_windows else ["npm", "run", "dev"],
+            cwd=str(visualise_video_path),
+            shell=is_windows,
+            stdout=server_log,
+            stderr=subprocess.STDOUT
+        )
 
     max_wait = 30
     for i in range(max_wait):
@@ -136,14 +155,13 @@ def ensure_server_running(base_url: str):
     return False
 
 
-def wait_for_video_player(page: Page, timeout: int = 30000, init_delay: int = 4) -> bool:
+def wait_for_video_player(page: Page, timeout: int = 30000, ready_timeout: int = 15000) -> bool:
     try:
         print("Waiting for video player component (#video-player-recording)...")
         page.wait_for_selector('#video-player-recording', timeout=timeout, state='visible')
         print("✓ Video player component is visible")
 
-        print(f"  Waiting {init_delay} seconds for video to initialize...")
-        time.sleep(init_delay)
+        wait_for_player_ready(page, timeout=ready_timeout)
         print("✓ Video player is ready")
         return True
     except PlaywrightTimeoutError:
@@ -168,7 +186,7 @@ def enter_fullscreen(page: Page) -> bool:
                 if button:
                     button.click()
                     print(f"✓ Fullscreen button clicked (selector: {selector})")
-                    time.sleep(1)
+                    wait_for_fullscreen(page)
                     return True
             except Exception as e:
                 print(f"  Selector '{selector}' failed: {e}")
@@ -176,7 +194,7 @@ def enter_fullscreen(page: Page) -> bool:
 
         print("  Trying 'F' key for fullscreen...")
         page.keyboard.press('f')
-        time.sleep(1)
+        wait_for_fullscreen(page)
         return True
     except Exception as e:
         print(f"  Warning: Could not enter fullscreen: {e}")
@@ -211,7 +229,7 @@ def disable_captions(page: Page) -> bool:
                 if 'hide captions' in title.lower():
                     button.click()
                     print("✓ Clicked caption button to turn off captions")
-                    time.sleep(0.5)
+                    wait_for_next_paint(page)
                     return True
 
                 if 'show captions' in title.lower():
@@ -221,7 +239,7 @@ def disable_captions(page: Page) -> bool:
                 if 'subtitle off' in aria_label.lower() or 'captions off' in aria_label.lower():
                     button.click()
                     print("✓ Clicked caption button to turn off captions")
-                    time.sleep(0.5)
+                    wait_for_next_paint(page)
                     return True
 
                 if 'subtitle on' in aria_label.lower() or 'captions on' in aria_label.lower():
@@ -234,7 +252,7 @@ def disable_captions(page: Page) -> bool:
                 if aria_pressed == 'true' or 'active' in class_name.lower():
                     button.click()
                     print("✓ Captions turned off")
-                    time.sleep(0.5)
+                    wait_for_next_paint(page)
                     return True
             except:
                 continue
@@ -255,7 +273,7 @@ def start_playback(page: Page) -> bool:
             if thumbnail_play:
                 thumbnail_play.click()
                 print("✓ Thumbnail play button clicked")
-                time.sleep(0.5)
+                wait_for_playback_start(page)
                 return True
         except Exception as e:
             print(f"  No thumbnail play button found: {e}")
@@ -272,7 +290,7 @@ def start_playback(page: Page) -> bool:
                 if button:
                     button.click()
                     print(f"✓ Play button clicked (selector: {selector})")
-                    time.sleep(0.5)
+                    wait_for_playback_start(page)
                     return True
             except Exception as e:
                 print(f"  Selector '{selector}' failed: {e}")
@@ -280,7 +298,7 @@ def start_playback(page: Page) -> bool:
 
         print("  Trying space bar to play...")
         page.keyboard.press('Space')
-        time.sleep(0.5)
+        wait_for_playback_start(page)
         return True
     except Exception as e:
         print(f"✗ Could not click play button: {e}")
@@ -292,7 +310,7 @@ def hide_ui_elements(page: Page):
     page.keyboard.down("Control")
     page.keyboard.press("h")
     page.keyboard.up("Control")
-    time.sleep(0.5)
+    wait_for_next_paint(page)
 
 
 def get_video_duration(page: Page) -> float:
@@ -318,17 +336,19 @@ def get_video_duration(page: Page) -> float:
         return 0
 
 
-def wait_for_recording_completion(duration: float):
+def wait_for_recording_completion(page: Page, duration: float):
     if duration > 0:
         wait_time = duration + 5
-        print(f"Recording video... (waiting {wait_time:.1f} seconds)")
+        print(f"Recording video... (until playback ends, at most {wait_time:.1f} seconds)")
 
         start_time = time.time()
         while time.time() - start_time < wait_time:
+            if has_playback_ended(page):
+                break
             elapsed = time.time() - start_time
             progress = (elapsed / wait_time) * 100
             print(f"  Progress: {progress:.1f}% ({elapsed:.1f}s / {wait_time:.1f}s)", end='\r')
-            time.sleep(1)
+            time.sleep(0.5)
         print()
     else:
         print("Could not determine video duration, recording for 60 seconds...")
@@ -362,8 +382,23 @@ def save_mp4_recording(mp4_output_path: Path, webm_output_path: Path) -> bool:
         print_ffmpeg_install_instructions()
         return False
 
+def get_recording_info_path(webm_path: Path) -> Path:
+    return webm_path.with_suffix('.json')
+
+
+def save_recording_info(webm_output_path: Path, video_version: int, lead_in_ms: int) -> bool:
+    """Stores the topic and measured lead-in next to the WebM so batch_encode can merge it later."""
+    info = {
+        'topic': MANIFEST_CONTROLLER.TOPIC,
+        'video_version': video_version,
+        'lead_in_ms': lead_in_ms,
+    }
+    return SystemIOController().write_json(str(get_recording_info_path(webm_output_path)), info)
+
+
 def record_video(version: int, mode: str = 'l', base_url: str = DEFAULT_BASE_URL,
-                 headless: bool = False) -> Tuple[bool, Path]:
+                 headless: bool = False,
+                 browser_profile: str = DEFAULT_BROWSER_PROFILE) -> Tuple[bool, Path, int]:
     url = f"{base_url}/{version}/{mode}"
     recording_version = OUTPUT_CONTROLLER.getLatestVersionByDirectory(OUTPUT_DIR) + 1
     mp4_output_filename = f"v{recording_version}/recording_v{recording_version}.mp4"
@@ -384,13 +419,13 @@ def record_video(version: int, mode: str = 'l', base_url: str = DEFAULT_BASE_URL
 
     server_process = ensure_server_running(base_url)
     if server_process is False:
-        return False, None
+        return False, None, 0
 
     recording_successful = False
 
     with sync_playwright() as p:
         print("Launching browser...")
-        browser = p.chromium.launch(headless=headless, args=['--mute-audio'])
+        browser = p.chromium.launch(headless=headless, args=get_browser_launch_args(browser_profile))
 
         context = browser.new_context(
             viewport={'width': VIEWPORT_WIDTH, 'height': VIEWPORT_HEIGHT},
@@ -401,34 +436,37 @@ def record_video(version: int, mode: str = 'l', base_url: str = DEFAULT_BASE_URL
         )
 
         page = context.new_page()
+        recording_started = time.time()
+        lead_in_ms = 0
 
         try:
             print(f"Navigating to {url}...")
             page.goto(url, wait_until='networkidle')
-            time.sleep(0.5)
 
-            if not wait_for_video_player(page, timeout=30000, init_delay=4):
+            if not wait_for_video_player(page, timeout=30000):
                 print("Error: Video player component did not load properly")
-                return False, None
+                return False, None, 0
 
             enter_fullscreen(page)
             disable_captions(page)
 
             if not start_playback(page):
                 print("Error: Could not start video playback")
-                return False, None
+                return False, None, 0
+            lead_in_ms = int((time.time() - recording_started) * 1000)
+            print(f"✓ Measured lead-in: {lead_in_ms}ms")
 
             hide_ui_elements(page)
 
             duration = get_video_duration(page)
-            wait_for_recording_completion(duration)
+            wait_for_recording_completion(page, duration)
 
             print("✓ Recording complete")
             recording_successful = True
 
         except Exception as e:
             print(f"✗ Error during recording: {e}")
-            return False, None
+            return False, None, 0
 
         finally:
             print("Finalizing video...")
@@ -442,6 +480,7 @@ def record_video(version: int, mode: str = 'l', base_url: str = DEFAULT_BASE_URL
 
     if recording_successful:
         if save_webm_recording(webm_output_path):
+            save_recording_info(webm_output_path, version, lead_in_ms)
             if save_mp4_recording(mp4_output_path, webm_output_path):
                 success = True
                 output_path = mp4_output_path
@@ -452,7 +491,7 @@ def record_video(version: int, mode: str = 'l', base_url: str = DEFAULT_BASE_URL
         print("Stopping development server...")
         server_process.terminate()
 
-    return success, output_path
+    return success, output_path, lead_in_ms
 
 
 def get_video_version() -> int:
@@ -473,17 +512,21 @@ def main():
     parser.add_argument('--headless', type=lambda x: str(x).lower() == 'true',
                         default=False, metavar='true|false',
                         help='Run browser in headless mode: true or false (default: false)')
+    parser.add_argument('--browser-profile', type=str, choices=list(BROWSER_PROFILES),
+                        default=DEFAULT_BROWSER_PROFILE,
+                        help=f'Chromium launch flags; software is fastest on GPU-less nodes (default: {DEFAULT_BROWSER_PROFILE})')
 
     args = parser.parse_args()
 
     version = get_video_version()
     print(f"✓ Using video version {version} from manifest")
 
-    success, mp4_path = record_video(
+    success, mp4_path, lead_in_ms = record_video(
         version=version,
         mode='l',
         base_url=args.base_url,
         headless=args.headless,
+        browser_profile=args.browser_profile,
     )
     time.sleep(2)
     if success:
@@ -499,7 +542,7 @@ def main():
                 video_path=str(mp4_path),
                 audio_path=audio_path,
                 output_path=str(merged_output_path),
-                audio_delay_ms=9500,
+                audio_delay_ms=lead_in_ms,
             )
         else:
             print("⚠ No audio found in manifest, skipping merge")
@@ -1,12 +1,18 @@
 import argparse
 import base64
+import hashlib
+import json
 import os
+import queue
 import shutil
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import requests
 from playwright.sync_api import sync_playwright, Page, TimeoutError as PlaywrightTimeoutError
@@ -17,24 +23,194 @@ if project_root not in sys.path:
 
 from scripts.controllers.output_controller import OutputController
 from scripts.controllers.manifest_controller import ManifestController
+from scripts.controllers.render_cache_controller import RenderCacheController
+from scripts.claude_cli.claude_cli_config import ClaudeCliConfig
 from scripts.controllers.utils.system_io_controller import SystemIOController
 from scripts.enums import AssetType
 from scripts.merge_video_audio import merge_video_audio
+from scripts.recording_telemetry import RecordingTelemetry
+from scripts.scene_chapters import build_chapter_args, load_scene_chapters, remove_chapter_metadata
+from scripts.utility.config import VIDEO_BUNDLE_MOUNT
+from scripts.preview_assets import (
+    build_preview_filter,
+    build_preview_outputs,
+    finalize_preview_assets,
+    generate_preview_assets,
+    get_preview_dir,
+    prepare_preview_dir,
+)
 
 
 DEFAULT_BASE_URL = "http://localhost:5173"
 OUTPUT_DIR = "Outputs/Recordings"
+RENDER_CACHE_DIR = "Outputs/Recordings/scene_cache"
 
 VIEWPORT_WIDTH = 1700
 VIEWPORT_HEIGHT = 827
+DEVICE_SCALE_FACTOR = 3
+
+STREAM_ENCODE_PRESET = "veryfast"
+AUDIO_BITRATE = "320k"
+
+# Bounded so a stalled disk applies backpressure to capture instead of growing memory
+FRAME_QUEUE_SIZE = 120
+# frames_temp writes are indexed and may run concurrently; the ffmpeg pipe needs order
+FRAME_WRITER_THREADS = 2
+
+# Adaptive capture: rate floor while the page is static and how often activity is sampled
+ADAPTIVE_MIN_FPS = 5
+ADAPTIVE_SAMPLE_INTERVAL = 0.25
+
+CHECKPOINT_FILE = "checkpoint.json"
+CHECKPOINT_INTERVAL = 2.0
+
+# Screenshots failing this many times in a row means the page is gone, not a slow frame
+MAX_CONSECUTIVE_CAPTURE_FAILURES = 30
+
+RENDERERS = ['realtime', 'virtual']
+CAPTURE_MODES = ['screenshot', 'screencast']
+
+# Recording never needs a focused or visible window, so nothing may be throttled
+_BACKGROUND_FLAGS = [
+    '--mute-audio',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    '--disable-smooth-scrolling',
+    '--disable-extensions',
+    '--disable-component-extensions-with-background-pages',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--no-first-run',
+    '--disable-features=Translate,MediaRouter,OptimizationHints,BackForwardCache,PaintHolding',
+]
+# Named Chromium launch profiles. 'software' composites and rasterizes on the CPU
+# without GL emulation, the fastest path on GPU-less render nodes; 'swiftshader'
+# keeps WebGL working through ANGLE's software GL at a higher cost per frame.
+BROWSER_PROFILES = {
+    'default': ['--mute-audio'],
+    'software': _BACKGROUND_FLAGS + [
+        '--disable-gpu',
+        '--disable-gpu-compositing',
+        '--disable-software-rasterizer',
+    ],
+    'swiftshader': _BACKGROUND_FLAGS + [
+        '--use-gl=angle',
+        '--use-angle=swiftshader',
+        '--enable-unsafe-swiftshader',
+    ],
+}
+DEFAULT_BROWSER_PROFILE = 'default'
+
+PLAYER_APP_DIR = Path(project_root) / "visualise_video"
 
 MANIFEST_CONTROLLER = ManifestController()
 OUTPUT_CONTROLLER = OutputController()
 
 
+class CaptureFailedError(RuntimeError):
+    """The page stopped producing frames, so the recording must not be finalized."""
+
+
+class FrameWriter:
+    """
+    Persists captured frames off the capture thread. The capture loop only enqueues
+    the base64 screenshot payloads; writer threads decode them and write frames_temp
+    files or pipe them to ffmpeg. A None payload repeats the previous frame without
+    decoding it again, which is only ordered with a single writer thread.
+    """
+
+    def __init__(self, write_frame: Callable[[int, memoryview], None], threads: int = 1,
+                 max_queue: int = FRAME_QUEUE_SIZE, first_index: int = 0,
+                 telemetry: Optional[RecordingTelemetry] = None):
+        self.write_frame = write_frame
+        self.telemetry = telemetry
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.threads = [threading.Thread(target=self._run, daemon=True) for _ in range(max(1, threads))]
+        self.lock = threading.Lock()
+        self.frames_written = 0
+        self.write_errors = []
+        self.max_queue_depth = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+        self.blocked_time = 0.0
+        self.last_frame = None
+        # Every index below committed is on disk; writers may finish out of order
+        self.committed = first_index
+        self.finished_indices = set()
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+
+    def put(self, frame_index: int, encoded_frame: Optional[str]):
+        enqueued_at = time.perf_counter()
+        self.queue.put((frame_index, encoded_frame, enqueued_at))
+        self.blocked_time += time.perf_counter() - enqueued_at
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+
+            frame_index, encoded_frame, enqueued_at = item
+            try:
+                decode_start = time.perf_counter()
+                if encoded_frame is not None:
+                    # Hand the decoded buffer on as a view so writes don't copy it again
+                    self.last_frame = memoryview(base64.b64decode(encoded_frame))
+                write_start = time.perf_counter()
+                self.write_frame(frame_index, self.last_frame)
+                write_end = time.perf_counter()
+                if self.telemetry:
+                    if encoded_frame is not None:
+                        self.telemetry.record('decode', write_start - decode_start)
+                    self.telemetry.record('write', write_end - write_start)
+                lag = write_end - enqueued_at
+                with self.lock:
+                    self.finished_indices.add(frame_index)
+                    while self.committed in self.finished_indices:
+                        self.finished_indices.remove(self.committed)
+                        self.committed += 1
+                    self.frames_written += 1
+                    self.total_lag += lag
+                    self.max_lag = max(self.max_lag, lag)
+            except Exception as e:
+                with self.lock:
+                    if len(self.write_errors) < 10:
+                        self.write_errors.append(f"Frame {frame_index}: {type(e).__name__}: {str(e)}")
+
+    def close(self):
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'frames_written': self.frames_written,
+            'write_errors': len(self.write_errors),
+            'max_queue_depth': self.max_queue_depth,
+            'avg_writer_lag_ms': (self.total_lag / self.frames_written * 1000) if self.frames_written else 0,
+            'max_writer_lag_ms': self.max_lag * 1000,
+            'capture_blocked_s': self.blocked_time,
+        }
+
+
 class CDPScreenRecorder:
     def __init__(self, page: Page, output_dir: Path, width: int = 1700, height: int = 827,
-                 quality: int = 100, fps: int = 30, format: str = "jpeg"):
+                 quality: int = 100, fps: int = 30, format: str = "jpeg", stream: bool = False,
+                 crop: Optional[Tuple[int, int, int, int]] = None, audio_path: Optional[str] = None,
+                 audio_skip_ms: int = 0, capture_mode: str = 'screenshot',
+                 optimize_for_speed: bool = False, dedup: bool = False, adaptive: bool = False,
+                 resume: bool = False, previews: bool = False,
+                 chapters: Optional[List[Dict[str, Any]]] = None):
         self.page = page
         self.output_dir = output_dir
         self.width = width
@@ -42,83 +218,576 @@ class CDPScreenRecorder:
         self.quality = quality
         self.fps = fps
         self.format = format
+        self.stream = stream
+        self.crop = crop or (0, 0, 0, 0)
+        self.audio_path = audio_path
+        self.audio_skip_ms = audio_skip_ms
         self.recording = False
         self.frame_count = 0
         self.dropped_frames = 0
+        self.consecutive_capture_failures = 0
+        self.capture_failed = False
+        # Set once the record loop covered the whole timeline; only then is the capture encoded
+        self.capture_complete = False
+        self.stopped = False
         self.capture_errors = []
         self.cdp_session = None
         self.frames_dir = None
+        self.ffmpeg_process = None
+        self.ffmpeg_log = None
+        self.ffmpeg_log_path = None
+        self.output_video = None
+        self.last_frame_data = None
+        self.frame_writer = None
+        self.capture_mode = capture_mode
+        self.optimize_for_speed = optimize_for_speed
+        self.dedup = dedup
+        self.adaptive = adaptive
+        self.capture_fps = fps
+        self.last_frame_changed = True
+        self.last_frame_digest = None
+        self.duplicate_frames = 0
+        # frames_temp dedup: display length in output frames of each written unique frame
+        self.frame_repeats = []
+        self.pending_screencast_frames = []
+        self.screencast_origin = None
+        self.filled_frames = 0
+        self.skipped_frames = 0
+        self.resume = resume
+        self.resume_player_time = None
+        self.player_time_origin = 0.0
+        self.timeline_base = 0
+        self.last_checkpoint = 0.0
+        self.previews = previews
+        self.preview_dir = None
+        self.telemetry = RecordingTelemetry()
+        self.chapters = chapters
+        self.chapter_args = {}
 
     def _get_file_extension(self) -> str:
         return "png" if self.format == "png" else "jpg"
 
-    def start(self):
-        self.frames_dir = self.output_dir / "frames_temp"
+    def _get_video_filter(self) -> str:
+        video_filter = 'pad=ceil(iw/2)*2:ceil(ih/2)*2'
+        if self.capture_mode != 'screencast' or not any(self.crop):
+            return video_filter
 
-        if self.frames_dir.exists():
-            print("  Cleaning up existing frames from previous recording...")
-            self._cleanup_frames()
+        # Screencast frames are full-viewport, so crop proportionally in the encoder
+        clip = self._get_clip()
+        crop_filter = (f"crop=iw*{clip['width']}/{self.width}:ih*{clip['height']}/{self.height}:"
+                       f"iw*{clip['x']}/{self.width}:ih*{clip['y']}/{self.height}")
+        return f"{crop_filter},{video_filter}"
 
-        self.frames_dir.mkdir(parents=True, exist_ok=True)
+    def _get_encoder_args(self, preset: str) -> list:
+        args = [
+            '-c:v', 'libx264',
+            '-crf', '15',
+            '-preset', preset,
+            '-pix_fmt', 'yuv420p',
+            '-movflags', '+faststart',
+        ]
+        if self.dedup and not self.stream:
+            # Keep the concat durations instead of re-expanding duplicates to constant rate
+            args.extend(['-vsync', 'vfr'])
+        return args
+
+    def _get_clip(self) -> Dict[str, Any]:
+        left, top, right, bottom = self.crop
+        return {
+            "x": left,
+            "y": top,
+            "width": self.width - left - right,
+            "height": self.height - top - bottom,
+            "scale": 1
+        }
+
+    def _build_encode_cmd(self, video_input_args: list, preset: str) -> list:
+        """
+        Single encode: the skip is applied to the frame input (like merge_video_audio's
+        -ss) and the audio track, when given, is muxed in the same invocation.
+        """
+        cmd = ['ffmpeg', '-y', '-loglevel', 'error', '-nostats']
+
+        if self.audio_skip_ms:
+            cmd.extend(['-ss', str(self.audio_skip_ms / 1000.0)])
+        cmd.extend(video_input_args)
+        if self.audio_path:
+            cmd.extend(['-i', str(self.audio_path)])
+        # Scene starts become IDR frames and chapters, so seeks and splices land on a keyframe
+        chapter_args = build_chapter_args(self.chapters, self.output_video, 2 if self.audio_path else 1)
+        # Removed once this encode's ffmpeg exits
+        self.chapter_args = chapter_args
+        cmd.extend(chapter_args['input'])
+
+        if self.preview_dir:
+            # Poster, sprite thumbnails and preview branch off the frames being encoded
+            cmd.extend([
+                '-filter_complex',
+                f"[0:v]{self._get_video_filter()},split=2[vmain][vpreview];{build_preview_filter('vpreview')}",
+                '-map', '[vmain]',
+            ])
+        else:
+            cmd.extend(['-vf', self._get_video_filter()])
+            if self.audio_path:
+                cmd.extend(['-map', '0:v:0'])
+
+        if self.audio_path:
+            cmd.extend([
+                '-map', '1:a:0',
+                '-c:a', 'aac',
+                '-b:a', AUDIO_BITRATE,
+            ])
+
+        cmd.extend(self._get_encoder_args(preset))
+        cmd.extend(chapter_args['output'])
+        cmd.append(str(self.output_video))
+        if self.preview_dir:
+            cmd.extend(build_preview_outputs(self.preview_dir))
+        return cmd
+
+    def _start_ffmpeg_stream(self):
+        input_codec = "png" if self.format == "png" else "mjpeg"
+        cmd = self._build_encode_cmd([
+            '-f', 'image2pipe',
+            '-framerate', str(self.fps),
+            '-c:v', input_codec,
+            '-i', '-',
+        ], STREAM_ENCODE_PRESET)
+
+        print(f"  Starting ffmpeg stream encoder -> {self.output_video}")
+        # stderr goes to a file: nothing reads a pipe until close, and a full one blocks stdin writes
+        self.ffmpeg_log_path = self.output_dir / f"{self.output_video.stem}_ffmpeg.log"
+        self.ffmpeg_log = open(self.ffmpeg_log_path, 'wb')
+        self.ffmpeg_process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=self.ffmpeg_log
+        )
+
+    def _write_frame(self, frame_index: int, frame_data: memoryview):
+        if self.stream:
+            self.ffmpeg_process.stdin.write(frame_data)
+            return
+
+        frame_path = self.frames_dir / f"frame_{frame_index:06d}.{self._get_file_extension()}"
+        with open(frame_path, "wb") as f:
+            f.write(frame_data)
+
+    def _queue_frame(self, encoded_frame: str):
+        if self.dedup or self.adaptive:
+            # Identical pixels encode to identical payloads, so hashing the payload is enough
+            digest = hashlib.blake2b(encoded_frame.encode('ascii'), digest_size=16).digest()
+            self.last_frame_changed = digest != self.last_frame_digest
+            self.last_frame_digest = digest
+
+        if self.dedup:
+            if not self.last_frame_changed and self.frame_count > 0:
+                self._repeat_frame()
+                return
+
+            if not self.stream:
+                self.frame_writer.put(len(self.frame_repeats), encoded_frame)
+                self.frame_repeats.append(1)
+                self.frame_count += 1
+                return
+
+        self.frame_writer.put(self.frame_count, encoded_frame)
+        self.frame_count += 1
+
+    def _repeat_frame(self):
+        self.duplicate_frames += 1
+        self.frame_count += 1
+        if self.stream:
+            # The pipe is constant rate, but the writer reuses the decoded buffer
+            self.frame_writer.put(self.frame_count - 1, None)
+        else:
+            self.frame_repeats[-1] += 1
+
+    def _write_concat_list(self) -> Path:
+        ext = self._get_file_extension()
+        list_path = self.frames_dir / "frames.ffconcat"
+        lines = ["ffconcat version 1.0"]
+        for index, repeats in enumerate(self.frame_repeats):
+            lines.append(f"file 'frame_{index:06d}.{ext}'")
+            lines.append(f"duration {repeats / self.fps:.6f}")
+        # The concat demuxer only applies the last duration when the file is listed again
+        lines.append(f"file 'frame_{len(self.frame_repeats) - 1:06d}.{ext}'")
+        list_path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+        return list_path
+
+    def _close_frame_writer(self):
+        if self.frame_writer:
+            self.frame_writer.close()
+
+    def start(self, output_filename: str = "output_hq.mp4"):
+        self.output_video = self.output_dir / output_filename
+        if self.previews:
+            self.preview_dir = get_preview_dir(self.output_video)
+            prepare_preview_dir(self.preview_dir)
+
+        if self.stream:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            self._start_ffmpeg_stream()
+        else:
+            self.frames_dir = self.output_dir / "frames_temp"
+
+            checkpoint = self._load_checkpoint() if self.resume else None
+            if checkpoint:
+                self._restore_checkpoint(checkpoint)
+            elif self.frames_dir.exists():
+                print("  Cleaning up existing frames from previous recording...")
+                self._cleanup_frames()
+
+            self.frames_dir.mkdir(parents=True, exist_ok=True)
+
+        if self.resume and self.stream:
+            print("  Warning: Resume needs frames_temp mode, recording from the start")
+
+        self.frame_writer = FrameWriter(
+            self._write_frame,
+            threads=1 if self.stream else FRAME_WRITER_THREADS,
+            first_index=len(self.frame_repeats) if self.dedup else self.frame_count,
+            telemetry=self.telemetry
+        )
+        self.frame_writer.start()
 
         try:
             print("  Creating CDP session...")
             self.cdp_session = self.page.context.new_cdp_session(self.page)
             self.recording = True
-            print(f"[OK] CDP session ready for screenshot capture")
-            print(f"  Format: {self.format.upper()}, Quality: {self.quality}")
+            if self.capture_mode == 'screencast':
+                self._start_screencast()
+            print(f"[OK] CDP session ready for {self.capture_mode} capture")
+            print(f"  Format: {self.format.upper()}, Quality: {self.quality}"
+                  f"{' (optimized for speed)' if self.optimize_for_speed else ''}")
             print(f"  Resolution: {self.width}x{self.height}")
+            if any(self.crop):
+                print(f"  Crop: left={self.crop[0]}, top={self.crop[1]}, right={self.crop[2]}, bottom={self.crop[3]}")
+            if self.audio_path:
+                print(f"  Audio: {self.audio_path} (skip {self.audio_skip_ms}ms)")
+            print(f"  Encode: {'streaming (ffmpeg stdin)' if self.stream else 'frames_temp + ffmpeg pass'}")
+            # Sampling starts last so a failed setup leaves no sampler thread behind
+            self.telemetry.start()
         except Exception as e:
             print(f"✗ Failed to create CDP session: {e}")
             import traceback
             traceback.print_exc()
+            self.telemetry.stop()
+            self._close_frame_writer()
+            self._close_ffmpeg_stream()
             raise
 
+    def _get_checkpoint_settings(self) -> Dict[str, Any]:
+        return {
+            'output': self.output_video.name,
+            'width': self.width,
+            'height': self.height,
+            'fps': self.fps,
+            'format': self.format,
+            'crop': list(self.crop),
+            'dedup': self.dedup,
+        }
+
+    def _load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        checkpoint_path = self.frames_dir / CHECKPOINT_FILE
+        if not checkpoint_path.exists():
+            return None
+
+        try:
+            checkpoint = json.loads(checkpoint_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            print(f"  Warning: Could not read checkpoint, recording from the start: {e}")
+            return None
+
+        if checkpoint.get('settings') != self._get_checkpoint_settings():
+            print("  Checkpoint was recorded with different settings, recording from the start")
+            return None
+        return checkpoint
+
+    def _restore_checkpoint(self, checkpoint: Dict[str, Any]):
+        self.frame_count = checkpoint['committed_frames']
+        self.frame_repeats = checkpoint.get('frame_repeats', [])
+        self.resume_player_time = checkpoint['player_time']
+
+        # Seed the previous frame so fills, fallbacks and dedup continue seamlessly
+        last_index = (len(self.frame_repeats) if self.dedup else self.frame_count) - 1
+        last_frame_path = self.frames_dir / f"frame_{last_index:06d}.{self._get_file_extension()}"
+        if last_index >= 0 and last_frame_path.exists():
+            self.last_frame_data = base64.b64encode(last_frame_path.read_bytes()).decode('ascii')
+            self.last_frame_digest = hashlib.blake2b(self.last_frame_data.encode('ascii'), digest_size=16).digest()
+
+        print(f"[OK] Resuming from frame {self.frame_count} (player time {self.resume_player_time:.2f}s)")
+
+    def _save_checkpoint(self, force: bool = False):
+        if self.stream or not self.frames_dir or not self.frame_writer:
+            return
+
+        now = time.time()
+        if not force and (now - self.last_checkpoint) < CHECKPOINT_INTERVAL:
+            return
+        self.last_checkpoint = now
+
+        committed = self.frame_writer.committed
+        checkpoint = {'settings': self._get_checkpoint_settings(), 'updated_at': now}
+        if self.dedup:
+            # The newest unique frame may still gain repeats, so it is not committed yet
+            safe_files = max(0, min(committed, len(self.frame_repeats) - 1))
+            checkpoint['frame_repeats'] = self.frame_repeats[:safe_files]
+            checkpoint['committed_frames'] = sum(checkpoint['frame_repeats'])
+        else:
+            checkpoint['committed_frames'] = committed
+        checkpoint['player_time'] = self.player_time_origin + checkpoint['committed_frames'] / self.fps
+
+        checkpoint_path = self.frames_dir / CHECKPOINT_FILE
+        tmp_path = checkpoint_path.with_suffix('.json.tmp')
+        try:
+            tmp_path.write_text(json.dumps(checkpoint), encoding='utf-8')
+            os.replace(tmp_path, checkpoint_path)
+        except OSError as e:
+            print(f"\n  Warning: Could not write checkpoint: {e}")
+
+    def _clear_checkpoint(self):
+        if self.frames_dir:
+            (self.frames_dir / CHECKPOINT_FILE).unlink(missing_ok=True)
+
+    PLAYER_TIME_SCRIPT = """
+        () => {
+            const media = document.querySelector('audio, video');
+            return media ? media.currentTime : 0;
+        }
+    """
+
+    RESUME_SEEK_SCRIPT = """
+        (seconds) => {
+            document.querySelectorAll('audio, video').forEach((media) => {
+                media.currentTime = seconds;
+            });
+        }
+    """
+
+    def _begin_timeline(self):
+        """Anchor frame 0 to the player clock, seeking to the checkpoint when resuming."""
+        self.timeline_base = self.frame_count
+        try:
+            if self.resume_player_time is not None:
+                self.page.evaluate(self.RESUME_SEEK_SCRIPT, self.resume_player_time)
+                self.player_time_origin = self.resume_player_time - self.frame_count / self.fps
+            else:
+                self.player_time_origin = self.page.evaluate(self.PLAYER_TIME_SCRIPT) or 0.0
+        except Exception as e:
+            print(f"  Warning: Could not read player time: {e}")
+
+    def _start_screencast(self):
+        self.cdp_session.on("Page.screencastFrame", self._on_screencast_frame)
+        self.cdp_session.send("Page.startScreencast", {
+            "format": self.format,
+            "quality": self.quality if self.format == "jpeg" else None,
+            "everyNthFrame": 1
+        })
+
+    def _on_screencast_frame(self, params: Dict[str, Any]):
+        # Acks are sent from the record loop; only collect frames inside the event handler
+        self.pending_screencast_frames.append(params)
+
+    def _fill_to_slot(self, slot: int):
+        while self.frame_count < slot and self.last_frame_data is not None:
+            self._queue_frame(self.last_frame_data)
+            self.filled_frames += 1
+
+    def _drain_screencast_frames(self):
+        frames, self.pending_screencast_frames = self.pending_screencast_frames, []
+        for params in frames:
+            try:
+                self.cdp_session.send("Page.screencastFrameAck", {"sessionId": params["sessionId"]})
+            except Exception as e:
+                if len(self.capture_errors) < 10:
+                    self.capture_errors.append(f"Ack {params.get('sessionId')}: {type(e).__name__}: {str(e)}")
+
+            timestamp = params.get("metadata", {}).get("timestamp", time.time())
+            if self.screencast_origin is None:
+                self.screencast_origin = timestamp
+
+            # Place the frame on the output timeline by its compositor timestamp
+            slot = self.timeline_base + int(round((timestamp - self.screencast_origin) * self.fps))
+            if slot < self.frame_count:
+                self.skipped_frames += 1
+                continue
+
+            self._fill_to_slot(slot)
+            self._queue_frame(params["data"])
+            self.last_frame_data = params["data"]
+
+    def _record_screencast(self, duration: float, show_progress: bool = True,
+                           stop_condition: Optional[Callable[[], bool]] = None):
+        self._begin_timeline()
+        start_time = time.time()
+        last_progress_update = start_time
+        last_stop_check = start_time
+        duration -= self.timeline_base / self.fps
+
+        while time.time() - start_time < duration:
+            self._save_checkpoint()
+            # Yields to Playwright's event loop so pushed frames are dispatched without busy-waiting
+            self.page.wait_for_timeout(1000 / self.fps)
+            self._drain_screencast_frames()
+
+            current_time = time.time()
+            elapsed = current_time - start_time
+
+            if stop_condition and (current_time - last_stop_check) >= 0.5:
+                last_stop_check = current_time
+                if stop_condition():
+                    break
+
+            if show_progress and (current_time - last_progress_update) >= 0.5:
+                progress = (elapsed / duration) * 100
+                print(f"  Progress: {progress:.1f}% | Frames: {self.frame_count} | Filled: {self.filled_frames} | Skipped: {self.skipped_frames} | Queue: {self.frame_writer.depth()} | Time: {elapsed:.1f}s / {duration:.1f}s", end='\r')
+                last_progress_update = current_time
+
+        self._drain_screencast_frames()
+        # Chromium only pushes frames on change, so hold the last frame to the end
+        if self.screencast_origin is not None:
+            self._fill_to_slot(self.timeline_base + int((time.time() - self.screencast_origin) * self.fps))
+        self.capture_complete = self.recording
+
+        if show_progress:
+            print()
+
+    ACTIVITY_SCRIPT = """
+        () => document.getAnimations().filter((animation) => animation.playState === 'running').length
+    """
+
+    def _update_capture_rate(self):
+        try:
+            running_animations = self.page.evaluate(self.ACTIVITY_SCRIPT)
+        except Exception:
+            running_animations = 0
+
+        # JS-driven motion doesn't show up in getAnimations, so changed pixels count as activity too
+        if running_animations or self.last_frame_changed:
+            self.capture_fps = self.fps
+        else:
+            self.capture_fps = max(ADAPTIVE_MIN_FPS, self.capture_fps / 2)
+
+    def _record_adaptive(self, duration: float, show_progress: bool = True,
+                         stop_condition: Optional[Callable[[], bool]] = None):
+        """
+        Capture at the full --fps while the page animates and back off towards
+        ADAPTIVE_MIN_FPS while it is static. Each capture lands on its timeline slot
+        and skipped slots hold the previous frame, so the output stays constant rate.
+        """
+        self._begin_timeline()
+        start_time = time.time()
+        last_progress_update = start_time
+        last_stop_check = start_time
+        last_activity_sample = start_time
+        next_capture_time = start_time
+        duration -= self.timeline_base / self.fps
+
+        while time.time() - start_time < duration and self.recording:
+            self._save_checkpoint()
+            current_time = time.time()
+            elapsed = current_time - start_time
+
+            if stop_condition and (current_time - last_stop_check) >= 0.5:
+                last_stop_check = current_time
+                if stop_condition():
+                    break
+
+            if (current_time - last_activity_sample) >= ADAPTIVE_SAMPLE_INTERVAL:
+                last_activity_sample = current_time
+                self._update_capture_rate()
+
+            slot = self.timeline_base + int(elapsed * self.fps)
+            if current_time >= next_capture_time and slot >= self.frame_count:
+                self._fill_to_slot(slot)
+                self.capture_frame()
+                next_capture_time = current_time + 1 / self.capture_fps
+
+            if show_progress and (current_time - last_progress_update) >= 0.5:
+                progress = (elapsed / duration) * 100
+                print(f"  Progress: {progress:.1f}% | Frames: {self.frame_count} | Held: {self.filled_frames} | Rate: {self.capture_fps:.0f}fps | Queue: {self.frame_writer.depth()} | Time: {elapsed:.1f}s / {duration:.1f}s", end='\r')
+                last_progress_update = current_time
+            else:
+                sleep_time = next_capture_time - time.time()
+                if sleep_time > 0:
+                    time.sleep(min(sleep_time, 0.01))
+
+        self._raise_if_capture_failed()
+        self._fill_to_slot(self.timeline_base + int((time.time() - start_time) * self.fps))
+        self.capture_complete = self.recording
+
+        if show_progress:
+            print()
+
     def capture_frame(self):
         if not self.recording or not self.cdp_session:
             return False
 
         try:
+            request_start = time.perf_counter()
             result = self.cdp_session.send("Page.captureScreenshot", {
                 "format": self.format,
                 "quality": self.quality if self.format == "jpeg" else None,
-                "clip": {
-                    "x": 0,
-                    "y": 0,
-                    "width": self.width,
-                    "height": self.height,
-                    "scale": 1
-                }
+                "clip": self._get_clip(),
+                "optimizeForSpeed": self.optimize_for_speed
             })
+            self.telemetry.record('cdp', time.perf_counter() - request_start)
 
-            frame_data = base64.b64decode(result["data"])
-            frame_path = self.frames_dir / f"frame_{self.frame_count:06d}.{self._get_file_extension()}"
-
-            with open(frame_path, "wb") as f:
-                f.write(frame_data)
-
-            self.frame_count += 1
+            self._queue_frame(result["data"])
+            self.last_frame_data = result["data"]
+            self.consecutive_capture_failures = 0
             return True
         except Exception as e:
             self.dropped_frames += 1
+            self.consecutive_capture_failures += 1
             error_msg = f"Frame {self.frame_count + self.dropped_frames}: {type(e).__name__}: {str(e)}"
 
             if len(self.capture_errors) < 10:
                 self.capture_errors.append(error_msg)
 
-            if self.dropped_frames % 30 == 0:
+            if self.consecutive_capture_failures >= MAX_CONSECUTIVE_CAPTURE_FAILURES:
+                self.capture_failed = True
+                self.recording = False
+                print(f"\n✗ {self.consecutive_capture_failures} consecutive captures failed, stopping: {error_msg}")
+            elif self.dropped_frames % 30 == 0:
                 print(f"\n  Warning: {self.dropped_frames} frames dropped so far")
 
             return False
 
-    def record_duration(self, duration: float, show_progress: bool = True):
+    def _raise_if_capture_failed(self):
+        if self.capture_failed:
+            raise CaptureFailedError(
+                f"Capture failed after {self.frame_count} frames: "
+                f"{self.capture_errors[-1] if self.capture_errors else 'no frames returned'}"
+            )
+
+    def record_duration(self, duration: float, show_progress: bool = True,
+                        stop_condition: Optional[Callable[[], bool]] = None):
+        if self.capture_mode == 'screencast':
+            self._record_screencast(duration, show_progress, stop_condition)
+            return
+        if self.adaptive:
+            self._record_adaptive(duration, show_progress, stop_condition)
+            return
+
+        self._begin_timeline()
         start_time = time.time()
         last_progress_update = start_time
+        last_stop_check = start_time
+        duration -= self.timeline_base / self.fps
 
-        while time.time() - start_time < duration:
+        while time.time() - start_time < duration and self.recording:
+            self._save_checkpoint()
             current_time = time.time()
             elapsed = current_time - start_time
-            expected_frame = int(elapsed * self.fps)
+            expected_frame = self.timeline_base + int(elapsed * self.fps)
+
+            if stop_condition and (current_time - last_stop_check) >= 0.5:
+                last_stop_check = current_time
+                if stop_condition():
+                    break
 
             if expected_frame > self.frame_count:
                 self.capture_frame()
@@ -126,10 +795,10 @@ class CDPScreenRecorder:
             if show_progress and (current_time - last_progress_update) >= 0.5:
                 progress = (elapsed / duration) * 100
                 capture_rate = (self.frame_count / (self.frame_count + self.dropped_frames) * 100) if (self.frame_count + self.dropped_frames) > 0 else 100
-                print(f"  Progress: {progress:.1f}% | Frames: {self.frame_count} | Dropped: {self.dropped_frames} | Success: {capture_rate:.1f}% | Time: {elapsed:.1f}s / {duration:.1f}s", end='\r')
+                print(f"  Progress: {progress:.1f}% | Frames: {self.frame_count} | Dropped: {self.dropped_frames} | Success: {capture_rate:.1f}% | Queue: {self.frame_writer.depth()} | Time: {elapsed:.1f}s / {duration:.1f}s", end='\r')
                 last_progress_update = current_time
             else:
-                next_frame_time = start_time + (self.frame_count / self.fps)
+                next_frame_time = start_time + ((self.frame_count - self.timeline_base) / self.fps)
                 sleep_time = next_frame_time - current_time
                 if sleep_time > 0.001:
                     time.sleep(min(sleep_time * 0.9, 0.01))
@@ -138,9 +807,21 @@ class CDPScreenRecorder:
 
         if show_progress:
             print()
+        self._raise_if_capture_failed()
+        self.capture_complete = self.recording
 
     def stop(self, output_filename: str = "output_hq.mp4") -> Optional[Path]:
         self.recording = False
+        # Never started, or already stopped by an earlier exit path
+        if self.stopped or not self.frame_writer:
+            return None
+        self.stopped = True
+
+        try:
+            if self.cdp_session and self.capture_mode == 'screencast':
+                self.cdp_session.send("Page.stopScreencast")
+        except Exception as e:
+            print(f"  Warning: Error stopping screencast: {e}")
 
         try:
             if self.cdp_session:
@@ -148,44 +829,82 @@ class CDPScreenRecorder:
         except Exception as e:
             print(f"  Warning: Error detaching CDP session: {e}")
 
+        print("  Waiting for frame writers to drain...")
+        self._close_frame_writer()
+        self.telemetry.stop()
+        self._save_checkpoint(force=True)
+        writer_stats = self.frame_writer.get_stats() if self.frame_writer else {}
+        frames_written = writer_stats.get('frames_written', 0)
+
+        if self.dedup and not self.stream:
+            # Duplicates are carried by concat durations instead of files
+            frames_written += self.duplicate_frames
+
         total_attempts = self.frame_count + self.dropped_frames
-        success_rate = (self.frame_count / total_attempts * 100) if total_attempts > 0 else 0
+        success_rate = (frames_written / total_attempts * 100) if total_attempts > 0 else 0
         print(f"\n{'='*60}")
         print(f"Recording Statistics:")
         print(f"  Captured frames: {self.frame_count}")
+        print(f"  Written frames: {frames_written}")
         print(f"  Dropped frames: {self.dropped_frames}")
+        if self.capture_mode == 'screencast':
+            print(f"  Screencast: {self.filled_frames} slots held from previous frame, "
+                  f"{self.skipped_frames} extra frames skipped")
+        if self.adaptive:
+            print(f"  Adaptive: {self.frame_count - self.filled_frames} captures, "
+                  f"{self.filled_frames} slots held from previous frame")
+        if self.dedup:
+            print(f"  Static frames deduplicated: {self.duplicate_frames}")
         print(f"  Success rate: {success_rate:.1f}%")
+        if writer_stats:
+            print(f"  Writer queue: max depth {writer_stats['max_queue_depth']}/{FRAME_QUEUE_SIZE}, "
+                  f"capture blocked {writer_stats['capture_blocked_s']:.2f}s")
+            print(f"  Writer lag: avg {writer_stats['avg_writer_lag_ms']:.1f}ms, "
+                  f"max {writer_stats['max_writer_lag_ms']:.1f}ms")
         if self.capture_errors:
             print(f"  Sample errors (first {len(self.capture_errors)}):")
             for error in self.capture_errors[:3]:
                 print(f"    - {error}")
+        if self.frame_writer and self.frame_writer.write_errors:
+            print(f"  Sample write errors (first {len(self.frame_writer.write_errors)}):")
+            for error in self.frame_writer.write_errors[:3]:
+                print(f"    - {error}")
+        for stage, timing in self.telemetry.get_timing_summary().items():
+            print(f"  {stage.upper()} ms: p50 {timing['p50']:.1f} | p95 {timing['p95']:.1f} | "
+                  f"p99 {timing['p99']:.1f} | max {timing['max']:.1f}")
         print(f"{'='*60}\n")
 
+        if self.frame_writer:
+            self._write_telemetry_report(output_filename, writer_stats)
+
+        if not self.capture_complete:
+            return self._abandon_capture()
+
+        if self.stream:
+            return self._finish_previews(self._finish_ffmpeg_stream())
+
         if self.frame_count == 0:
             print("✗ No frames captured!")
             return None
 
-        output_video = self.output_dir / output_filename
+        self.output_video = self.output_dir / output_filename
+        output_video = self.output_video
         ext = self._get_file_extension()
 
         print(f"Compiling video with ffmpeg...")
-        print(f"  Input: {self.frame_count} {ext.upper()} frames")
+        print(f"  Input: {self.frame_count - self.duplicate_frames} {ext.upper()} frames")
         print(f"  Output: {output_video}")
-        print(f"  FPS: {self.fps}")
+        print(f"  FPS: {self.fps}{' (variable, deduplicated)' if self.dedup else ''}")
 
-        cmd = [
-            'ffmpeg',
-            '-y',
-            '-framerate', str(self.fps),
-            '-i', str(self.frames_dir / f'frame_%06d.{ext}'),
-            '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',
-            '-c:v', 'libx264',
-            '-crf', '15',
-            '-preset', 'slow',
-            '-pix_fmt', 'yuv420p',
-            '-movflags', '+faststart',
-            str(output_video)
-        ]
+        if self.dedup:
+            video_input_args = ['-f', 'concat', '-safe', '0', '-i', str(self._write_concat_list())]
+        else:
+            video_input_args = [
+                '-framerate', str(self.fps),
+                '-i', str(self.frames_dir / f'frame_%06d.{ext}'),
+            ]
+
+        cmd = self._build_encode_cmd(video_input_args, 'slow')
 
         try:
             subprocess.run(cmd, check=True, capture_output=True, text=True)
@@ -193,13 +912,98 @@ class CDPScreenRecorder:
         except subprocess.CalledProcessError as e:
             print(f"✗ FFmpeg error: {e.stderr}")
             return None
+        finally:
+            remove_chapter_metadata(self.chapter_args)
+
+        self._clear_checkpoint()
 
         if output_video.exists():
             size_mb = output_video.stat().st_size / (1024 * 1024)
             print(f"[OK] Output file size: {size_mb:.2f} MB")
 
+        return self._finish_previews(output_video)
+
+    def _abandon_capture(self) -> None:
+        """An interrupted or failed capture is never encoded; frames_temp and its checkpoint stay for --resume."""
+        if self.stream:
+            self._close_ffmpeg_stream()
+            if self.output_video and self.output_video.exists():
+                self.output_video.unlink()
+            print(f"✗ Capture did not finish after {self.frame_count} frames, discarded the partial stream")
+            return None
+
+        print(f"✗ Capture did not finish after {self.frame_count} frames, kept {self.frames_dir}")
+        print(f"  Rerun with --resume to continue from the last checkpoint")
+        return None
+
+    def _write_telemetry_report(self, output_filename: str, writer_stats: Dict[str, Any]):
+        report_path = self.output_dir / f"{Path(output_filename).stem}_telemetry.json"
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            self.telemetry.write_report(report_path, {
+                'renderer': type(self).__name__,
+                'capture_mode': self.capture_mode,
+                'format': self.format,
+                'quality': self.quality,
+                'fps': self.fps,
+                'stream': self.stream,
+                'resolution': f"{self.width}x{self.height}",
+                'captured_frames': self.frame_count,
+                'dropped_frames': self.dropped_frames,
+                'duplicate_frames': self.duplicate_frames,
+                'writer': writer_stats,
+            })
+            print(f"[OK] Telemetry report: {report_path}")
+        except OSError as e:
+            print(f"  Warning: Could not write telemetry report: {e}")
+
+    def _finish_previews(self, output_video: Optional[Path]) -> Optional[Path]:
+        if output_video and self.preview_dir:
+            try:
+                finalize_preview_assets(self.preview_dir)
+            except RuntimeError as e:
+                print(f"  Warning: Could not assemble preview sprite: {e}")
         return output_video
 
+    def _close_ffmpeg_stream(self) -> Tuple[int, str]:
+        if not self.ffmpeg_process:
+            remove_chapter_metadata(self.chapter_args)
+            return 0, ""
+
+        try:
+            self.ffmpeg_process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+
+        returncode = self.ffmpeg_process.wait()
+        self.ffmpeg_process = None
+        remove_chapter_metadata(self.chapter_args)
+        self.ffmpeg_log.close()
+        stderr = self.ffmpeg_log_path.read_text(encoding='utf-8', errors='replace')
+        if returncode == 0 and not stderr:
+            self.ffmpeg_log_path.unlink(missing_ok=True)
+        return returncode, stderr
+
+    def _finish_ffmpeg_stream(self) -> Optional[Path]:
+        print(f"Finalizing streamed video...")
+        print(f"  Output: {self.output_video}")
+        returncode, stderr = self._close_ffmpeg_stream()
+
+        if self.frame_count == 0:
+            print("✗ No frames captured!")
+            return None
+
+        if returncode != 0:
+            print(f"✗ FFmpeg error: {stderr}")
+            return None
+
+        print(f"[OK] Video encoded while recording")
+        if self.output_video.exists():
+            size_mb = self.output_video.stat().st_size / (1024 * 1024)
+            print(f"[OK] Output file size: {size_mb:.2f} MB")
+
+        return self.output_video
+
     def _cleanup_frames(self):
         if not self.frames_dir or not self.frames_dir.exists():
             return
@@ -215,6 +1019,138 @@ class CDPScreenRecorder:
             print(f"  Please manually delete: {self.frames_dir}")
 
 
+class VirtualTimeRecorder(CDPScreenRecorder):
+    """
+    Deterministic renderer: the page clock is paused with CDP virtual time and the
+    player is stepped exactly 1/fps per frame, so every frame is captured once and
+    nothing is dropped regardless of how long a screenshot takes.
+    """
+
+    CAPTURE_RETRIES = 3
+    STEP_TIMEOUT = 10
+
+    SEEK_SCRIPT = """
+        (seconds) => {
+            const hooks = window.__recordingHooks;
+            if (hooks && typeof hooks.seek === 'function') {
+                hooks.seek(seconds);
+                return;
+            }
+            document.querySelectorAll('audio, video').forEach((media) => {
+                if (!media.paused) {
+                    media.pause();
+                }
+                media.currentTime = seconds;
+            });
+        }
+    """
+
+    IS_SEEKING_SCRIPT = """
+        () => Array.from(document.querySelectorAll('audio, video')).some((media) => media.seeking)
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Frames are pulled per virtual-time step, so the screencast push model and
+        # adaptive rate do not apply
+        self.capture_mode = 'screenshot'
+        self.adaptive = False
+        self.budget_expired = False
+
+    def start(self, output_filename: str = "output_hq.mp4"):
+        super().start(output_filename)
+        try:
+            self.cdp_session.on("Emulation.virtualTimeBudgetExpired", self._on_budget_expired)
+            self.cdp_session.send("Emulation.setVirtualTimePolicy", {"policy": "pause"})
+        except Exception as e:
+            print(f"✗ Failed to pause the page clock: {e}")
+            self.telemetry.stop()
+            self._close_frame_writer()
+            self._close_ffmpeg_stream()
+            raise
+        print(f"[OK] Page clock paused, stepping {1000 / self.fps:.2f}ms of virtual time per frame")
+
+    def _on_budget_expired(self, _event):
+        self.budget_expired = True
+
+    def _wait_until(self, condition) -> bool:
+        deadline = time.time() + self.STEP_TIMEOUT
+        while not condition():
+            if time.time() > deadline:
+                return False
+            self.page.wait_for_timeout(1)
+        return True
+
+    def seek(self, seconds: float) -> bool:
+        self.page.evaluate(self.SEEK_SCRIPT, seconds)
+        return self._wait_until(lambda: not self.page.evaluate(self.IS_SEEKING_SCRIPT))
+
+    def advance_virtual_time(self, budget_ms: float) -> bool:
+        self.budget_expired = False
+        self.cdp_session.send("Emulation.setVirtualTimePolicy", {"policy": "advance", "budget": budget_ms})
+        return self._wait_until(lambda: self.budget_expired)
+
+    def render_frame(self, timestamp: float) -> bool:
+        if not self.seek(timestamp):
+            print(f"\n  Warning: Player did not finish seeking to {timestamp:.3f}s")
+        if not self.advance_virtual_time(1000 / self.fps):
+            print(f"\n  Warning: Virtual time budget did not expire at {timestamp:.3f}s")
+
+        for _ in range(self.CAPTURE_RETRIES):
+            if self.capture_frame():
+                return True
+
+        # A transient failure repeats the previous frame to keep the timeline exact; without
+        # one the frame is retried, and a dead page ends the recording via the failure limit
+        if self.recording and self.last_frame_data is not None:
+            self._queue_frame(self.last_frame_data)
+        return False
+
+    def record_frames(self, first_frame: int, end_frame: int, show_progress: bool = True):
+        total_frames = end_frame - first_frame
+        start_time = time.time()
+        last_progress_update = start_time
+        # Frames are placed by seeking, so a resumed run continues at its committed frame
+        self.player_time_origin = first_frame / self.fps
+
+        while self.frame_count < total_frames and self.recording:
+            self._save_checkpoint()
+            self.render_frame((first_frame + self.frame_count) / self.fps)
+
+            current_time = time.time()
+            if show_progress and (current_time - last_progress_update) >= 0.5:
+                progress = (self.frame_count / total_frames) * 100
+                elapsed = current_time - start_time
+                speed = (self.frame_count / self.fps) / elapsed if elapsed > 0 else 0
+                print(f"  Progress: {progress:.1f}% | Frames: {self.frame_count}/{total_frames} | Retried: {self.dropped_frames} | Speed: {speed:.2f}x realtime", end='\r')
+                last_progress_update = current_time
+
+        if show_progress:
+            print()
+        self._raise_if_capture_failed()
+        self.capture_complete = self.frame_count >= total_frames
+
+    def record_duration(self, duration: float, show_progress: bool = True,
+                        stop_condition: Optional[Callable[[], bool]] = None):
+        # The frame count is exact on virtual time, so no stop signal is needed
+        self.record_frames(0, ceil(duration * self.fps), show_progress)
+
+    def stop(self, output_filename: str = "output_hq.mp4") -> Optional[Path]:
+        try:
+            if self.cdp_session and self.recording:
+                self.cdp_session.send("Emulation.setVirtualTimePolicy", {"policy": "advance"})
+        except Exception as e:
+            print(f"  Warning: Could not resume page clock: {e}")
+
+        return super().stop(output_filename)
+
+
+def create_recorder(renderer: str, **kwargs) -> CDPScreenRecorder:
+    if renderer == 'virtual':
+        return VirtualTimeRecorder(**kwargs)
+    return CDPScreenRecorder(**kwargs)
+
+
 def is_ffmpeg_available() -> bool:
     return shutil.which('ffmpeg') is not None
 
@@ -249,19 +1185,26 @@ def is_server_running(url: str, max_retries: int = 1, retry_delay: int = 2) -> b
     return False
 
 
-def ensure_server_running(base_url: str) -> Optional[subprocess.Popen]:
+def ensure_server_running(base_url: str, npm_script: str = "dev") -> Optional[subprocess.Popen]:
     if is_server_running(base_url):
         return None
 
-    print("\nServer not running. Starting development server...")
+    print(f"\nServer not running. Starting server (npm run {npm_script})...")
     visualise_video_path = Path(project_root) / "visualise_video"
-    server_process = subprocess.Popen(
-        ["npm", "run", "dev"],
-        cwd=str(visualise_video_path),
-        shell=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE
-    )
+    # The server outlives the recording, so its output goes to a file instead of an undrained pipe
+    server_log_path = Path(OUTPUT_DIR) / f"server_{npm_script}.log"
+    server_log_path.parent.mkdir(parents=True, exist_ok=True)
+    print(f"  Server log: {server_log_path}")
+    # A list with shell=True runs a bare "npm" on POSIX, so the shell is only used on Windows
+    is_windows = sys.platform == 'win32'
+    with open(server_log_path, 'wb') as server_log:
+        server_process = subprocess.Popen(
+            f"npm run {npm_script}" if is_windows else ["npm", "run", npm_script],
+            cwd=str(visualise_video_path),
+            shell=is_windows,
+            stdout=server_log,
+            stderr=subprocess.STDOUT
+        )
 
     max_wait = 30
     for i in range(max_wait):
@@ -277,14 +1220,78 @@ def ensure_server_running(base_url: str) -> Optional[subprocess.Popen]:
     return False
 
 
-def wait_for_video_player(page: Page, timeout: int = 30000, init_delay: int = 4) -> bool:
+PLAYER_READY_SCRIPT = """
+    (timeoutMs) => {
+        const audio = document.querySelector('audio');
+        const audioReady = (!audio || audio.readyState >= HTMLMediaElement.HAVE_ENOUGH_DATA)
+            ? Promise.resolve()
+            : new Promise((resolve) => audio.addEventListener('canplaythrough', resolve, { once: true }));
+        const imagesDecoded = Array.from(document.images).map((img) => img.decode().catch(() => null));
+        const ready = Promise.all([audioReady, document.fonts.ready, ...imagesDecoded]).then(() => true);
+        const timeout = new Promise((resolve) => setTimeout(() => resolve(false), timeoutMs));
+        return Promise.race([ready, timeout]);
+    }
+"""
+
+PLAYBACK_STARTED_SCRIPT = """
+    () => {
+        const audio = document.querySelector('audio');
+        return !!audio && !audio.paused && audio.currentTime > 0;
+    }
+"""
+
+PLAYBACK_ENDED_SCRIPT = """
+    () => {
+        const audio = document.querySelector('audio');
+        return !!audio && audio.ended;
+    }
+"""
+
+
+def wait_for_player_ready(page: Page, timeout: int = 15000) -> bool:
+    if page.evaluate(PLAYER_READY_SCRIPT, timeout):
+        print("[OK] Audio can play through, fonts loaded and scene images decoded")
+        return True
+
+    print(f"  Warning: Player readiness signals did not all arrive within {timeout / 1000:.0f}s, continuing")
+    return False
+
+
+def wait_for_fullscreen(page: Page, timeout: int = 1000) -> bool:
+    try:
+        page.wait_for_function("() => !!document.fullscreenElement", timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+def wait_for_playback_start(page: Page, timeout: int = 2000) -> bool:
+    try:
+        page.wait_for_function(PLAYBACK_STARTED_SCRIPT, timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        print("  Warning: Audio did not report playback within the timeout")
+        return False
+
+
+def wait_for_next_paint(page: Page):
+    page.evaluate("() => new Promise((resolve) => requestAnimationFrame(() => requestAnimationFrame(resolve)))")
+
+
+def has_playback_ended(page: Page) -> bool:
+    try:
+        return page.evaluate(PLAYBACK_ENDED_SCRIPT)
+    except Exception:
+        return False
+
+
+def wait_for_video_player(page: Page, timeout: int = 30000, ready_timeout: int = 15000) -> bool:
     try:
         print("Waiting for video player component (#video-player-recording)...")
         page.wait_for_selector('#video-player-recording', timeout=timeout, state='visible')
         print("[OK] Video player component is visible")
 
-        print(f"  Waiting {init_delay} seconds for video to initialize...")
-        time.sleep(init_delay)
+        wait_for_player_ready(page, timeout=ready_timeout)
         print("[OK] Video player is ready")
         return True
     except PlaywrightTimeoutError:
@@ -309,7 +1316,7 @@ def enter_fullscreen(page: Page) -> bool:
                 if button:
                     button.click()
                     print(f"[OK] Fullscreen button clicked (selector: {selector})")
-                    time.sleep(1)
+                    wait_for_fullscreen(page)
                     return True
             except Exception as e:
                 print(f"  Selector '{selector}' failed: {e}")
@@ -317,7 +1324,7 @@ def enter_fullscreen(page: Page) -> bool:
 
         print("  Trying 'F' key for fullscreen...")
         page.keyboard.press('f')
-        time.sleep(1)
+        wait_for_fullscreen(page)
         return True
     except Exception as e:
         print(f"  Warning: Could not enter fullscreen: {e}")
@@ -352,7 +1359,7 @@ def disable_captions(page: Page) -> bool:
                 if 'hide captions' in title.lower():
                     button.click()
                     print("[OK] Clicked caption button to turn off captions")
-                    time.sleep(0.5)
+                    wait_for_next_paint(page)
                     return True
 
                 if 'show captions' in title.lower():
@@ -362,7 +1369,7 @@ def disable_captions(page: Page) -> bool:
                 if 'subtitle off' in aria_label.lower() or 'captions off' in aria_label.lower():
                     button.click()
                     print("[OK] Clicked caption button to turn off captions")
-                    time.sleep(0.5)
+                    wait_for_next_paint(page)
                     return True
 
                 if 'subtitle on' in aria_label.lower() or 'captions on' in aria_label.lower():
@@ -375,7 +1382,7 @@ def disable_captions(page: Page) -> bool:
                 if aria_pressed == 'true' or 'active' in class_name.lower():
                     button.click()
                     print("[OK] Captions turned off")
-                    time.sleep(0.5)
+                    wait_for_next_paint(page)
                     return True
             except:
                 continue
@@ -396,7 +1403,7 @@ def start_playback(page: Page) -> bool:
             if thumbnail_play:
                 thumbnail_play.click()
                 print("[OK] Thumbnail play button clicked")
-                time.sleep(0.5)
+                wait_for_playback_start(page)
                 return True
         except Exception as e:
             print(f"  No thumbnail play button found: {e}")
@@ -413,7 +1420,7 @@ def start_playback(page: Page) -> bool:
                 if button:
                     button.click()
                     print(f"[OK] Play button clicked (selector: {selector})")
-                    time.sleep(0.5)
+                    wait_for_playback_start(page)
                     return True
             except Exception as e:
                 print(f"  Selector '{selector}' failed: {e}")
@@ -421,7 +1428,7 @@ def start_playback(page: Page) -> bool:
 
         print("  Trying space bar to play...")
         page.keyboard.press('Space')
-        time.sleep(0.5)
+        wait_for_playback_start(page)
         return True
     except Exception as e:
         print(f"✗ Could not click play button: {e}")
@@ -448,8 +1455,8 @@ def wait_for_recording_completion(duration: float, recorder):
         buffer = calculate_buffer_time(duration)
         wait_time = duration + buffer
         print(f"\nRecording video...")
-        print(f"  Duration: {duration:.1f}s + {buffer}s buffer = {wait_time:.1f}s total")
-        recorder.record_duration(wait_time)
+        print(f"  Duration: {duration:.1f}s, stopping on the audio 'ended' event (max {wait_time:.1f}s)")
+        recorder.record_duration(wait_time, stop_condition=lambda: has_playback_ended(recorder.page))
     else:
         print("Could not determine video duration, recording for 60 seconds...")
         recorder.record_duration(60)
@@ -478,9 +1485,118 @@ def get_video_duration(page: Page) -> float:
         return 0
 
 
+def get_browser_launch_args(profile: str = DEFAULT_BROWSER_PROFILE) -> List[str]:
+    if profile not in BROWSER_PROFILES:
+        raise ValueError(f"Unknown browser profile: {profile} (choose from {', '.join(BROWSER_PROFILES)})")
+    return list(BROWSER_PROFILES[profile])
+
+
+def launch_browser(playwright, headless: bool, profile: str = DEFAULT_BROWSER_PROFILE):
+    return playwright.chromium.launch(headless=headless, args=get_browser_launch_args(profile))
+
+
+def new_recording_context(browser, width: int = VIEWPORT_WIDTH, height: int = VIEWPORT_HEIGHT,
+                          device_scale_factor: float = DEVICE_SCALE_FACTOR):
+    return browser.new_context(
+        viewport={'width': width, 'height': height},
+        device_scale_factor=device_scale_factor,
+        screen={'width': width, 'height': height},
+    )
+
+
+def prepare_player_page(page: Page, url: str) -> bool:
+    print(f"Navigating to {url}...")
+    page.goto(url, wait_until='networkidle')
+
+    if not wait_for_video_player(page, timeout=30000):
+        print("Error: Video player component did not load properly")
+        return False
+
+    enter_fullscreen(page)
+    disable_captions(page)
+    return True
+
+
+def record_in_context(context, url: str, mp4_output_path: Path, quality: int = 100, fps: int = 30,
+                      format: str = "jpeg", debug: bool = False, stream: bool = False,
+                      renderer: str = 'realtime', crop: Optional[Tuple[int, int, int, int]] = None,
+                      audio_path: Optional[str] = None, audio_skip_ms: int = 0,
+                      capture_mode: str = 'screenshot', optimize_for_speed: bool = False,
+                      dedup: bool = False, adaptive: bool = False, resume: bool = False,
+                      previews: bool = False,
+                      chapters: Optional[List[Dict[str, Any]]] = None) -> Optional[Path]:
+    """Record one player URL on a new page of an existing browser context; the context is left open."""
+    page = context.new_page()
+
+    recorder = create_recorder(
+        renderer,
+        page=page,
+        output_dir=mp4_output_path.parent,
+        width=VIEWPORT_WIDTH,
+        height=VIEWPORT_HEIGHT,
+        quality=quality,
+        fps=fps,
+        format=format,
+        stream=stream,
+        crop=crop,
+        audio_path=audio_path,
+        audio_skip_ms=audio_skip_ms,
+        capture_mode=capture_mode,
+        optimize_for_speed=optimize_for_speed,
+        dedup=dedup,
+        adaptive=adaptive,
+        resume=resume,
+        previews=previews,
+        chapters=chapters
+    )
+
+    recording_successful = False
+    output_path = None
+    try:
+        if not prepare_player_page(page, url):
+            return None
+
+        recorder.start(mp4_output_path.name)
+        hide_ui_elements(page)
+
+        if debug:
+            debug_path = mp4_output_path.parent / f"debug_cdp_{mp4_output_path.stem}.png"
+            page.screenshot(path=str(debug_path))
+            print(f"  Debug screenshot: {debug_path}")
+
+        duration = get_video_duration(page)
+        if renderer == 'virtual' and duration > 0:
+            print(f"\nRendering {duration:.1f}s on virtual time...")
+            recorder.record_duration(duration)
+        else:
+            wait_for_recording_completion(duration, recorder)
+
+        print("[OK] Recording complete")
+        recording_successful = True
+
+    except Exception as e:
+        print(f"✗ Error during recording: {e}")
+        return None
+
+    finally:
+        print("\nFinalizing video...")
+        output_path = recorder.stop(mp4_output_path.name)
+        page.close()
+
+    if recording_successful and output_path and output_path.exists():
+        return output_path
+    return None
+
+
 def record_video_cdp(version: int, mode: str = 'l', base_url: str = DEFAULT_BASE_URL,
                      headless: bool = False, quality: int = 100, fps: int = 30,
-                     format: str = "jpeg", debug: bool = False) -> Tuple[bool, Path]:
+                     format: str = "jpeg", debug: bool = False, stream: bool = False,
+                     renderer: str = 'realtime', crop: Optional[Tuple[int, int, int, int]] = None,
+                     audio_path: Optional[str] = None, audio_skip_ms: int = 0,
+                     capture_mode: str = 'screenshot', optimize_for_speed: bool = False,
+                     dedup: bool = False, adaptive: bool = False, resume: bool = False,
+                     previews: bool = False, chapters: bool = True,
+                     browser_profile: str = DEFAULT_BROWSER_PROFILE) -> Tuple[bool, Path]:
 
     if not is_ffmpeg_available():
         print("✗ ffmpeg is required for CDP recording")
@@ -488,7 +1604,10 @@ def record_video_cdp(version: int, mode: str = 'l', base_url: str = DEFAULT_BASE
         return False, None
 
     url = f"{base_url}/{version}/{mode}"
-    recording_version = OUTPUT_CONTROLLER.getLatestVersionByDirectory(OUTPUT_DIR) + 1
+    recording_version = OUTPUT_CONTROLLER.getLatestVersionByDirectory(OUTPUT_DIR)
+    checkpoint_path = Path(OUTPUT_DIR) / f"v{recording_version}" / "frames_temp" / CHECKPOINT_FILE
+    if not (resume and checkpoint_path.exists()):
+        recording_version += 1
     mp4_output_filename = f"v{recording_version}/recording_v{recording_version}_cdp.mp4"
     mp4_output_path = Path(OUTPUT_DIR) / mp4_output_filename
     mp4_output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -498,9 +1617,15 @@ def record_video_cdp(version: int, mode: str = 'l', base_url: str = DEFAULT_BASE
     print(f"  URL: {url}")
     print(f"  Mode: {'Portrait' if mode == 'p' else 'Landscape'} ({mode})")
     print(f"  Quality: {quality}%")
-    print(f"  FPS: {fps}")
+    print(f"  FPS: {fps}{f' (adaptive, min {ADAPTIVE_MIN_FPS})' if adaptive else ''}")
     print(f"  Format: {format.upper()}")
+    print(f"  Streaming encode: {stream}")
+    print(f"  Renderer: {renderer}")
+    print(f"  Capture mode: {capture_mode}")
+    print(f"  Browser profile: {browser_profile}")
     print(f"  Resolution: {VIEWPORT_WIDTH}x{VIEWPORT_HEIGHT}")
+    if audio_path:
+        print(f"  Audio (muxed during encode): {audio_path}")
     print(f"  Output: {mp4_output_path}")
     print(f"  Headless: {headless}")
     print(f"{'='*60}\n")
@@ -509,80 +1634,511 @@ def record_video_cdp(version: int, mode: str = 'l', base_url: str = DEFAULT_BASE
     if server_process is False:
         return False, None
 
-    recording_successful = False
+    scene_chapters = load_scene_chapters() if chapters else None
 
     with sync_playwright() as p:
         print("Launching browser...")
-        browser = p.chromium.launch(headless=headless, args=['--mute-audio'])
+        browser = launch_browser(p, headless, browser_profile)
+        context = new_recording_context(browser)
 
-        context = browser.new_context(
-            viewport={'width': VIEWPORT_WIDTH, 'height': VIEWPORT_HEIGHT},
-            device_scale_factor=3,
-            screen={'width': VIEWPORT_WIDTH, 'height': VIEWPORT_HEIGHT},
-        )
+        try:
+            output_path = record_in_context(
+                context, url, mp4_output_path,
+                quality=quality, fps=fps, format=format, debug=debug, stream=stream,
+                renderer=renderer, crop=crop, audio_path=audio_path, audio_skip_ms=audio_skip_ms,
+                capture_mode=capture_mode, optimize_for_speed=optimize_for_speed, dedup=dedup,
+                adaptive=adaptive, resume=resume, previews=previews,
+                chapters=scene_chapters
+            )
+        finally:
+            context.close()
+            browser.close()
+
+    if server_process:
+        print("Stopping development server...")
+        server_process.terminate()
+
+    if output_path:
+        print(f"\n[OK] Recording complete!")
+        print(f"  Output: {output_path}")
+        return True, output_path
+
+    return False, None
+
+
+def get_audio_duration(audio_path: str) -> float:
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-show_entries', 'format=duration',
+        '-of', 'default=noprint_wrappers=1:nokey=1',
+        audio_path
+    ]
+    try:
+        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        return float(result.stdout.strip())
+    except (subprocess.CalledProcessError, ValueError) as e:
+        print(f"  Warning: Could not probe audio duration: {e}")
+        return 0
+
+
+def get_scene_start_times() -> List[float]:
+    direction = OUTPUT_CONTROLLER.read_output(AssetType.DIRECTION) or {}
+    start_times = set()
+    for scene in direction.get('scenes', []):
+        start_ms = scene.get('sceneStartTime') or scene.get('startTime')
+        if start_ms:
+            start_times.add(start_ms / 1000)
+    return sorted(start_times)
+
+
+def plan_segments(duration: float, segment_count: int, scene_start_times: List[float]) -> List[Tuple[float, float]]:
+    """
+    Split [0, duration) into segment_count contiguous pieces. Each cut snaps to the
+    nearest scene start so a segment begins where its scene mounts; when no scene
+    start is close enough the even split point is used instead.
+    """
+    candidates = [t for t in scene_start_times if 0 < t < duration]
+    max_snap = duration / segment_count / 2
+    cuts = set()
+
+    for i in range(1, segment_count):
+        target = duration * i / segment_count
+        nearest = min(candidates, key=lambda t: abs(t - target)) if candidates else None
+        if nearest is not None and abs(nearest - target) <= max_snap:
+            candidates.remove(nearest)
+            cuts.add(nearest)
+        else:
+            cuts.add(target)
+
+    bounds = [0.0] + sorted(cuts) + [duration]
+    return list(zip(bounds[:-1], bounds[1:]))
 
+
+def render_segment(job: Dict[str, Any]) -> Optional[str]:
+    """Process pool worker: renders frames [first_frame, end_frame) in its own browser."""
+    output_path = Path(job['output_path'])
+    expected_frames = job['end_frame'] - job['first_frame']
+    output = None
+
+    with sync_playwright() as p:
+        browser = launch_browser(p, job['headless'], job.get('browser_profile', DEFAULT_BROWSER_PROFILE))
+        context = new_recording_context(browser)
         page = context.new_page()
 
-        recorder = CDPScreenRecorder(
+        recorder = VirtualTimeRecorder(
             page=page,
-            output_dir=mp4_output_path.parent,
+            output_dir=output_path.parent,
             width=VIEWPORT_WIDTH,
             height=VIEWPORT_HEIGHT,
-            quality=quality,
-            fps=fps,
-            format=format
+            quality=job['quality'],
+            fps=job['fps'],
+            format=job['format'],
+            stream=True,
+            optimize_for_speed=job.get('optimize_for_speed', False)
         )
 
         try:
-            print(f"Navigating to {url}...")
-            page.goto(url, wait_until='networkidle')
-            time.sleep(0.5)
+            if prepare_player_page(page, job['url']):
+                recorder.start(output_path.name)
+                hide_ui_elements(page)
+                recorder.record_frames(job['first_frame'], job['end_frame'], show_progress=False)
+        except Exception as e:
+            print(f"✗ Error rendering {output_path.name}: {e}")
+        finally:
+            output = recorder.stop(output_path.name)
+            page.close()
+            context.close()
+            browser.close()
 
-            if not wait_for_video_player(page, timeout=30000, init_delay=4):
-                print("Error: Video player component did not load properly")
-                return False, None
+    if output and recorder.frame_count == expected_frames:
+        return str(output)
+
+    print(f"✗ {output_path.name}: rendered {recorder.frame_count}/{expected_frames} frames")
+    return None
+
+
+def concat_segments(segment_paths: List[Path], output_path: Path,
+                    chapters: Optional[List[Dict[str, Any]]] = None) -> bool:
+    """Joins segments with a stream copy; chapters are muxed in but keyframes stay where the segments put them."""
+    list_path = output_path.parent / f"{output_path.stem}_segments.txt"
+    with open(list_path, 'w', encoding='utf-8') as f:
+        for segment_path in segment_paths:
+            escaped = segment_path.resolve().as_posix().replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+    cmd = [
+        'ffmpeg',
+        '-y',
+        '-f', 'concat',
+        '-safe', '0',
+        '-i', str(list_path),
+    ]
+    chapter_args = build_chapter_args(chapters, output_path, 1, force_keyframes=False)
+    cmd.extend(chapter_args['input'])
+    cmd.extend(['-c', 'copy', *chapter_args['output'], '-movflags', '+faststart', str(output_path)])
 
-            enter_fullscreen(page)
-            disable_captions(page)
+    try:
+        subprocess.run(cmd, check=True, capture_output=True, text=True)
+    except subprocess.CalledProcessError as e:
+        print(f"✗ FFmpeg concat error: {e.stderr}")
+        return False
+    finally:
+        list_path.unlink(missing_ok=True)
+        remove_chapter_metadata(chapter_args)
 
+    return True
 
-            recorder.start()
-            hide_ui_elements(page)
 
-            if debug:
-                debug_path = mp4_output_path.parent / f"debug_cdp_v{version}.png"
-                page.screenshot(path=str(debug_path))
-                print(f"  Debug screenshot: {debug_path}")
+def get_timeline_duration() -> float:
+    audio_info = MANIFEST_CONTROLLER.get_field(AssetType.AUDIO)
+    if not audio_info or not audio_info.get('path'):
+        print("✗ Error: No audio found in manifest, cannot determine timeline length")
+        return 0
 
+    return get_audio_duration(SystemIOController().normalize_path(audio_info['path']))
 
-            duration = get_video_duration(page)
-            wait_for_recording_completion(duration, recorder)
 
-            print("[OK] Recording complete")
-            recording_successful = True
+def get_next_recording_path() -> Path:
+    recording_version = OUTPUT_CONTROLLER.getLatestVersionByDirectory(OUTPUT_DIR) + 1
+    return Path(OUTPUT_DIR) / f"v{recording_version}/recording_v{recording_version}_cdp.mp4"
+
+
+def build_segment_job(url: str, output_path: Path, first_frame: int, end_frame: int,
+                      headless: bool, quality: int, fps: int, format: str,
+                      browser_profile: str = DEFAULT_BROWSER_PROFILE,
+                      optimize_for_speed: bool = False) -> Dict[str, Any]:
+    return {
+        'url': url,
+        'output_path': str(output_path),
+        'first_frame': first_frame,
+        'end_frame': end_frame,
+        'headless': headless,
+        'quality': quality,
+        'fps': fps,
+        'format': format,
+        'browser_profile': browser_profile,
+        'optimize_for_speed': optimize_for_speed,
+    }
+
+
+def run_segment_jobs(jobs: List[Dict[str, Any]], base_url: str, workers: int) -> List[Optional[str]]:
+    if not jobs:
+        return []
 
-        except Exception as e:
-            print(f"✗ Error during recording: {e}")
-            return False, None
+    server_process = ensure_server_running(base_url)
+    if server_process is False:
+        return [None] * len(jobs)
 
-        finally:
-            print("\nFinalizing video...")
-            output_path = recorder.stop(mp4_output_filename.split('/')[-1])
+    start_time = time.time()
+    try:
+        with ProcessPoolExecutor(max_workers=max(1, min(workers, len(jobs)))) as executor:
+            results = list(executor.map(render_segment, jobs))
+    finally:
+        if server_process:
+            print("Stopping development server...")
+            server_process.terminate()
 
-            page.close()
-            context.close()
-            browser.close()
+    print(f"[OK] Rendered {sum(1 for result in results if result)}/{len(jobs)} segments in {time.time() - start_time:.1f}s")
+    return results
 
-    if server_process:
-        print("Stopping development server...")
-        server_process.terminate()
 
-    if recording_successful and output_path and output_path.exists():
-        print(f"\n[OK] Recording complete!")
-        print(f"  Output: {output_path}")
-        return True, output_path
+def generate_segmented_previews(mp4_output_path: Path) -> None:
+    # Segments are encoded in separate processes, so previews come from the stitched file
+    try:
+        generate_preview_assets(str(mp4_output_path))
+    except (FileNotFoundError, RuntimeError) as e:
+        print(f"  Warning: Could not generate preview assets: {e}")
+
+
+def record_video_cdp_parallel(version: int, mode: str = 'l', base_url: str = DEFAULT_BASE_URL,
+                              headless: bool = True, quality: int = 100, fps: int = 30,
+                              format: str = "jpeg", workers: int = 2,
+                              browser_profile: str = DEFAULT_BROWSER_PROFILE,
+                              optimize_for_speed: bool = False, previews: bool = False,
+                              chapters: bool = True) -> Tuple[bool, Path]:
+    """
+    Render the timeline as independent virtual-time segments in a process pool and
+    join them with the concat demuxer (stream copy, no re-encode).
+    """
+    if not is_ffmpeg_available():
+        print("✗ ffmpeg is required for CDP recording")
+        print_ffmpeg_install_instructions()
+        return False, None
 
-    return False, None
+    duration = get_timeline_duration()
+    if duration <= 0:
+        return False, None
+
+    url = f"{base_url}/{version}/{mode}"
+    mp4_output_path = get_next_recording_path()
+    segments_dir = mp4_output_path.parent / "segments"
+    segments_dir.mkdir(parents=True, exist_ok=True)
+
+    segments = plan_segments(duration, workers, get_scene_start_times())
+    total_frames = ceil(duration * fps)
+    jobs = []
+    for index, (segment_start, segment_end) in enumerate(segments):
+        first_frame = round(segment_start * fps)
+        end_frame = total_frames if index == len(segments) - 1 else round(segment_end * fps)
+        if end_frame <= first_frame:
+            continue
+        jobs.append(build_segment_job(url, segments_dir / f"segment_{index:03d}.mp4",
+                                      first_frame, end_frame, headless, quality, fps, format,
+                                      browser_profile, optimize_for_speed))
+
+    print(f"\n{'='*60}")
+    print("Parallel Recording Configuration:")
+    print(f"  URL: {url}")
+    print(f"  Duration: {duration:.1f}s ({total_frames} frames @ {fps}fps)")
+    print(f"  Workers: {workers}")
+    for job in jobs:
+        print(f"  {Path(job['output_path']).name}: frames {job['first_frame']}-{job['end_frame']} "
+              f"({job['first_frame'] / fps:.2f}s - {job['end_frame'] / fps:.2f}s)")
+    print(f"  Output: {mp4_output_path}")
+    print(f"{'='*60}\n")
+
+    results = run_segment_jobs(jobs, base_url, workers)
+    if not all(results):
+        print("✗ One or more segments failed, leaving partial segments in place for inspection")
+        return False, None
+
+    print("Stitching segments...")
+    scene_chapters = load_scene_chapters() if chapters else None
+    if not concat_segments([Path(result) for result in results], mp4_output_path, scene_chapters):
+        return False, None
+
+    shutil.rmtree(segments_dir, ignore_errors=True)
+    if previews:
+        generate_segmented_previews(mp4_output_path)
+    print(f"\n[OK] Recording complete!")
+    print(f"  Output: {mp4_output_path}")
+    return True, mp4_output_path
+
+
+def get_video_tsx_path() -> Optional[Path]:
+    video_info = MANIFEST_CONTROLLER.get_field(AssetType.VIDEO)
+    if not video_info or not video_info.get('path'):
+        return None
+
+    video_path = Path(SystemIOController().normalize_path(video_info['path']))
+    for candidate in (video_path, Path(ClaudeCliConfig.BASE_OUTPUT_PATH) / video_path):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def get_scene_tsx_dir() -> Optional[Path]:
+    video_tsx_path = get_video_tsx_path()
+    return video_tsx_path.parent if video_tsx_path else None
+
+
+def is_build_stale(artifact: Path, source_dirs: List[Path]) -> bool:
+    if not artifact.exists():
+        return True
+
+    built_at = artifact.stat().st_mtime
+    for source_dir in source_dirs:
+        if not source_dir.exists():
+            continue
+        for path in source_dir.rglob('*'):
+            if path.is_file() and path.stat().st_mtime > built_at:
+                return True
+    return False
+
+
+def build_player_app() -> Optional[Path]:
+    dist_dir = PLAYER_APP_DIR / "dist"
+    if not is_build_stale(dist_dir / "index.html", [PLAYER_APP_DIR / "src", PLAYER_APP_DIR / "public"]):
+        print(f"[OK] Reusing player build: {dist_dir}")
+        return dist_dir
+
+    print("Building player app (npm run build)...")
+    is_windows = sys.platform == 'win32'
+    try:
+        result = subprocess.run(
+            "npm run build" if is_windows else ["npm", "run", "build"],
+            cwd=str(PLAYER_APP_DIR),
+            capture_output=True,
+            text=True,
+            shell=is_windows,
+            timeout=300
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"✗ Player build failed: {e}")
+        return None
+
+    if result.returncode != 0 or not (dist_dir / "index.html").exists():
+        print(f"✗ Player build failed: {result.stderr[-500:]}")
+        return None
+
+    print(f"[OK] Player built: {dist_dir}")
+    return dist_dir
+
+
+def get_video_bundle_dist() -> Path:
+    from scripts.video_build_service.react_build_manager import ReactBuildManager
+
+    return ReactBuildManager(Path(project_root)).env_controller.get_dist_path()
+
+
+def build_video_bundle(force: bool = False) -> Optional[Path]:
+    """Builds the manifest's video TSX; force rebuilds when the dist holds another topic's bundle."""
+    from scripts.video_build_service.react_build_manager import ReactBuildManager
+
+    video_tsx_path = get_video_tsx_path()
+    if not video_tsx_path:
+        print("✗ Error: No video TSX found in manifest")
+        return None
+
+    build_manager = ReactBuildManager(Path(project_root))
+    dist_dir = build_manager.env_controller.get_dist_path()
+    if not force and not is_build_stale(dist_dir / "video" / "video.js", [video_tsx_path.parent]):
+        print(f"[OK] Reusing video bundle: {dist_dir}")
+        return dist_dir
+
+    print(f"Building video bundle from {video_tsx_path}...")
+    result = build_manager.build_component(str(video_tsx_path))
+    if not result['success']:
+        print(f"✗ Video bundle build failed: {', '.join(result['errors'])}")
+        return None
+
+    print(f"[OK] Video bundle built: {result['built_path']}")
+    return dist_dir
+
+
+def start_static_player_server(build_bundle: bool = True):
+    """
+    Serve production builds of the player app and the current video bundle from a
+    local static server, so recordings skip the dev server's on-the-fly transforms
+    and HMR client. Returns the running server, or None if either build failed.
+    Without build_bundle the bundle dist is only mounted; the caller builds into it.
+    """
+    from scripts.video_build_service.static_site_server import StaticSiteServer
+
+    player_dist = build_player_app()
+    video_dist = build_video_bundle() if build_bundle else get_video_bundle_dist()
+    if not player_dist or not video_dist:
+        return None
+
+    server = StaticSiteServer(str(player_dist), mounts={VIDEO_BUNDLE_MOUNT: str(video_dist)})
+    server.start()
+    print(f"[OK] Serving production build at {server.base_url}")
+    return server
+
+
+def check_video_bundle_served(static_server) -> bool:
+    """False when the player never requested the bundle, i.e. it recorded an empty player."""
+    if static_server.get_mount_requests(VIDEO_BUNDLE_MOUNT):
+        return True
+    print(f"✗ The player never requested the video bundle from {VIDEO_BUNDLE_MOUNT}; "
+          f"set VIDEO_BUNDLE_MOUNT to the path the app's bundle loader uses")
+    return False
+
+
+def record_video_cdp_scene_cached(version: int, mode: str = 'l', base_url: str = DEFAULT_BASE_URL,
+                                  headless: bool = True, quality: int = 100, fps: int = 30,
+                                  format: str = "jpeg", workers: int = 1,
+                                  browser_profile: str = DEFAULT_BROWSER_PROFILE,
+                                  optimize_for_speed: bool = False, previews: bool = False,
+                                  chapters: bool = True) -> Tuple[bool, Path]:
+    """
+    Render one virtual-time segment per scene, reusing segments from the render cache
+    whose scene TSX, frame window and viewport/style settings are unchanged, then
+    stitch cached and fresh segments with the concat demuxer.
+    """
+    if not is_ffmpeg_available():
+        print("✗ ffmpeg is required for CDP recording")
+        print_ffmpeg_install_instructions()
+        return False, None
+
+    duration = get_timeline_duration()
+    if duration <= 0:
+        return False, None
+
+    scenes = (OUTPUT_CONTROLLER.read_output(AssetType.DIRECTION) or {}).get('scenes', [])
+    scene_tsx_dir = get_scene_tsx_dir()
+    if not scenes or not scene_tsx_dir:
+        print("✗ Error: Scene cache needs the Direction scenes and the Video scene files from the manifest")
+        return False, None
+
+    url = f"{base_url}/{version}/{mode}"
+    mp4_output_path = get_next_recording_path()
+    segments_dir = mp4_output_path.parent / "segments"
+    segments_dir.mkdir(parents=True, exist_ok=True)
+
+    render_cache = RenderCacheController(RENDER_CACHE_DIR)
+    render_settings = {
+        'viewport': [VIEWPORT_WIDTH, VIEWPORT_HEIGHT],
+        'device_scale_factor': DEVICE_SCALE_FACTOR,
+        'mode': mode,
+        'fps': fps,
+        'format': format,
+        'quality': quality,
+        'encoder': STREAM_ENCODE_PRESET,
+        # Rasterization paths can differ by a few pixel values, so cached scenes are per profile
+        'browser_profile': browser_profile,
+        'optimize_for_speed': optimize_for_speed,
+        'metadata': MANIFEST_CONTROLLER.get_metadata(),
+    }
+
+    total_frames = ceil(duration * fps)
+    segment_paths = []
+    jobs = []
+    job_keys = {}
+
+    for scene_index, scene in enumerate(scenes):
+        scene_start = 0 if scene_index == 0 else (scene.get('sceneStartTime') or scene.get('startTime', 0)) / 1000
+        if scene_index == len(scenes) - 1:
+            end_frame = total_frames
+        else:
+            next_scene = scenes[scene_index + 1]
+            end_frame = round((next_scene.get('sceneStartTime') or next_scene.get('startTime', 0)) / 1000 * fps)
+        first_frame = round(scene_start * fps)
+        if end_frame <= first_frame:
+            continue
+
+        scene_file = scene_tsx_dir / f"scene_{scene_index}.tsx"
+        tsx_content = scene_file.read_text(encoding='utf-8') if scene_file.exists() else ""
+        key = render_cache.scene_key(tsx_content, first_frame, end_frame, render_settings)
+
+        cached_segment = render_cache.get_segment(key) if tsx_content else None
+        if cached_segment:
+            print(f"  Scene {scene_index}: cached (frames {first_frame}-{end_frame})")
+            segment_paths.append(cached_segment)
+            continue
+
+        print(f"  Scene {scene_index}: render (frames {first_frame}-{end_frame})")
+        output_path = segments_dir / f"scene_{scene_index:03d}.mp4"
+        segment_paths.append(output_path)
+        jobs.append(build_segment_job(url, output_path, first_frame, end_frame, headless, quality, fps, format,
+                                      browser_profile, optimize_for_speed))
+        if tsx_content:
+            job_keys[str(output_path)] = key
+
+    print(f"\n{len(segment_paths) - len(jobs)}/{len(segment_paths)} scenes served from render cache")
+
+    results = run_segment_jobs(jobs, base_url, workers)
+    if not all(results):
+        print("✗ One or more scene segments failed, leaving partial segments in place for inspection")
+        return False, None
+
+    for result in results:
+        if result in job_keys:
+            render_cache.store_segment(job_keys[result], Path(result))
+
+    print("Stitching segments...")
+    # Every segment starts at a scene, so the chapters land on segment keyframes
+    scene_chapters = load_scene_chapters() if chapters else None
+    if not concat_segments(segment_paths, mp4_output_path, scene_chapters):
+        return False, None
+
+    shutil.rmtree(segments_dir, ignore_errors=True)
+    if previews:
+        generate_segmented_previews(mp4_output_path)
+    print(f"\n[OK] Recording complete!")
+    print(f"  Output: {mp4_output_path}")
+    return True, mp4_output_path
 
 
 def get_video_version() -> int:
@@ -595,6 +2151,19 @@ def get_video_version() -> int:
     return video_info['version']
 
 
+def check_segmented_options(parser: argparse.ArgumentParser, args: argparse.Namespace, mode_flag: str) -> None:
+    """Segments are rendered on virtual time with screenshots, so options for other pipelines are rejected."""
+    unsupported = [flag for flag, requested in [
+        ('--renderer realtime', args.renderer == 'realtime'),
+        ('--capture-mode screencast', args.capture_mode == 'screencast'),
+        ('--dedup', args.dedup),
+        ('--adaptive', args.adaptive),
+        ('--resume', args.resume),
+    ] if requested]
+    if unsupported:
+        parser.error(f"{mode_flag} cannot be combined with {', '.join(unsupported)}")
+
+
 def main():
     parser = argparse.ArgumentParser(description='Record video lessons using CDP for high quality')
 
@@ -608,26 +2177,117 @@ def main():
                         help='Frame quality 0-100 (default: 100)')
     parser.add_argument('--fps', type=int, default=30,
                         help='Output video FPS (default: 30)')
+    parser.add_argument('--adaptive', action='store_true',
+                        help=f'Capture at --fps during animation and down to {ADAPTIVE_MIN_FPS} fps while static; output stays at --fps')
     parser.add_argument('--format', type=str, choices=['jpeg', 'png'], default='jpeg',
                         help='Frame format: jpeg or png (default: jpeg)')
+    parser.add_argument('--dedup', action='store_true',
+                        help='Collapse frames identical to the previous one (variable frame rate without --stream)')
+    parser.add_argument('--optimize-for-speed', action='store_true',
+                        help='Ask Chromium for fast (lower compression) encoding; with --format png frames stay lossless')
+    parser.add_argument('--renderer', type=str, choices=RENDERERS, default=None,
+                        help='realtime: wall-clock capture, virtual: deterministic frame stepping '
+                             '(default: realtime; --workers and --scene-cache always render virtual)')
+    parser.add_argument('--capture-mode', type=str, choices=CAPTURE_MODES, default='screenshot',
+                        help='screenshot: poll Page.captureScreenshot, screencast: Chromium pushes frames via Page.startScreencast (default: screenshot)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Render N segments in parallel processes with the virtual renderer (default: 1)')
+    parser.add_argument('--scene-cache', action='store_true',
+                        help='Render one segment per scene and reuse unchanged scenes from the render cache')
+    parser.add_argument('--stream', action='store_true',
+                        help='Pipe frames straight into ffmpeg while recording instead of writing frames_temp '
+                             '(--workers and --scene-cache always stream)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue the latest interrupted frames_temp recording from its checkpoint')
+    parser.add_argument('--static', action='store_true',
+                        help='Record from a production build on a local static server instead of the dev server')
+    parser.add_argument('--previews', action='store_true',
+                        help='Also write a poster, sprite sheet and animated preview from the encoded frames')
+    parser.add_argument('--no-chapters', action='store_true',
+                        help='Do not force keyframes or write MP4 chapters at scene boundaries')
+    parser.add_argument('--browser-profile', type=str, choices=list(BROWSER_PROFILES),
+                        default=DEFAULT_BROWSER_PROFILE,
+                        help=f'Chromium launch flags; software is fastest on GPU-less nodes (default: {DEFAULT_BROWSER_PROFILE})')
     parser.add_argument('--debug', action='store_true',
                         help='Enable debug mode')
 
     args = parser.parse_args()
 
+    if args.scene_cache:
+        check_segmented_options(parser, args, '--scene-cache')
+    elif args.workers > 1:
+        check_segmented_options(parser, args, '--workers')
+    args.renderer = args.renderer or 'realtime'
+
     version = get_video_version()
     print(f"[OK] Using video version {version} from manifest")
 
-    success, mp4_path = record_video_cdp(
-        version=version,
-        mode='l',
-        base_url=args.base_url,
-        headless=args.headless,
-        quality=args.quality,
-        fps=args.fps,
-        format=args.format,
-        debug=args.debug
-    )
+    base_url = args.base_url
+    static_server = None
+    if args.static:
+        static_server = start_static_player_server()
+        if not static_server:
+            sys.exit(1)
+        base_url = static_server.base_url
+
+    try:
+        if args.scene_cache:
+            success, mp4_path = record_video_cdp_scene_cached(
+                version=version,
+                mode='l',
+                base_url=base_url,
+                headless=args.headless,
+                quality=args.quality,
+                fps=args.fps,
+                format=args.format,
+                workers=args.workers,
+                browser_profile=args.browser_profile,
+                optimize_for_speed=args.optimize_for_speed,
+                previews=args.previews,
+                chapters=not args.no_chapters
+            )
+        elif args.workers > 1:
+            success, mp4_path = record_video_cdp_parallel(
+                version=version,
+                mode='l',
+                base_url=base_url,
+                headless=args.headless,
+                quality=args.quality,
+                fps=args.fps,
+                format=args.format,
+                workers=args.workers,
+                browser_profile=args.browser_profile,
+                optimize_for_speed=args.optimize_for_speed,
+                previews=args.previews,
+                chapters=not args.no_chapters
+            )
+        else:
+            success, mp4_path = record_video_cdp(
+                version=version,
+                mode='l',
+                base_url=base_url,
+                headless=args.headless,
+                quality=args.quality,
+                fps=args.fps,
+                format=args.format,
+                debug=args.debug,
+                stream=args.stream,
+                renderer=args.renderer,
+                capture_mode=args.capture_mode,
+                optimize_for_speed=args.optimize_for_speed,
+                dedup=args.dedup,
+                adaptive=args.adaptive,
+                resume=args.resume,
+                previews=args.previews,
+                chapters=not args.no_chapters,
+                browser_profile=args.browser_profile
+            )
+        if success and static_server and not check_video_bundle_served(static_server):
+            success = False
+    finally:
+        if static_server:
+            static_server.stop()
+
     time.sleep(2)
     print(f"mp4_path: {mp4_path}")
     if success:
@@ -0,0 +1,154 @@
+import json
+import os
+import threading
+import time
+from math import ceil
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+
+# Stages timed per frame: CDP screenshot round trip, base64 decode, disk/pipe write
+FRAME_STAGES = ['cdp', 'decode', 'write']
+RESOURCE_SAMPLE_INTERVAL = 0.5
+PERCENTILES = [50, 95, 99]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(1, ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    summary = {'count': len(ordered)}
+    for pct in PERCENTILES:
+        summary[f'p{pct}'] = percentile(ordered, pct)
+    summary['mean'] = sum(ordered) / len(ordered) if ordered else 0.0
+    summary['max'] = ordered[-1] if ordered else 0.0
+    return summary
+
+
+def get_process_group(process: psutil.Process) -> Optional[str]:
+    name = process.name().lower()
+    if 'ffmpeg' in name:
+        return 'ffmpeg'
+    if 'chrom' in name or 'headless_shell' in name:
+        return 'chromium'
+    return None
+
+
+class ResourceSampler:
+    """
+    Samples CPU and RSS of this process and its Chromium and ffmpeg descendants on a
+    background thread. Playwright launches Chromium under its driver, so the whole
+    child tree is walked on every sample.
+    """
+
+    def __init__(self, interval: float = RESOURCE_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.root = psutil.Process()
+        self.processes = {}
+        self.samples = []
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.start_time = None
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self._sample()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            self._sample()
+
+    def _get_tracked(self) -> Dict[int, psutil.Process]:
+        tracked = {self.root.pid: self.root}
+        try:
+            for child in self.root.children(recursive=True):
+                # Reuse Process objects so cpu_percent measures since the previous sample
+                tracked[child.pid] = self.processes.get(child.pid, child)
+        except psutil.Error:
+            pass
+        self.processes = tracked
+        return tracked
+
+    def _sample(self):
+        groups = {name: {'cpu_percent': 0.0, 'rss_mb': 0.0, 'processes': 0}
+                  for name in ['python', 'chromium', 'ffmpeg']}
+
+        for pid, process in self._get_tracked().items():
+            try:
+                group = 'python' if pid == self.root.pid else get_process_group(process)
+                if not group:
+                    continue
+                groups[group]['cpu_percent'] += process.cpu_percent(None)
+                groups[group]['rss_mb'] += process.memory_info().rss / (1024 * 1024)
+                groups[group]['processes'] += 1
+            except psutil.Error:
+                continue
+
+        self.samples.append({'t': time.perf_counter() - self.start_time, **groups})
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def get_summary(self) -> Dict[str, Any]:
+        # The first sample only primes cpu_percent
+        samples = self.samples[1:] or self.samples
+        summary = {}
+        for group in ['python', 'chromium', 'ffmpeg']:
+            summary[group] = {
+                'cpu_percent': summarize([sample[group]['cpu_percent'] for sample in samples]),
+                'rss_mb': summarize([sample[group]['rss_mb'] for sample in samples]),
+            }
+        return summary
+
+
+class RecordingTelemetry:
+    """Per-frame stage timings plus resource samples for one recording."""
+
+    def __init__(self, sample_interval: float = RESOURCE_SAMPLE_INTERVAL):
+        self.timings = {stage: [] for stage in FRAME_STAGES}
+        self.sampler = ResourceSampler(sample_interval)
+        self.started_at = None
+        self.elapsed = 0.0
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self.sampler.start()
+
+    def stop(self):
+        if self.started_at is None:
+            return
+        self.elapsed = time.perf_counter() - self.started_at
+        self.started_at = None
+        self.sampler.stop()
+
+    def record(self, stage: str, seconds: float):
+        # list.append is atomic, so writer threads can record without a lock
+        self.timings[stage].append(seconds * 1000)
+
+    def get_timing_summary(self) -> Dict[str, Dict[str, float]]:
+        return {stage: summarize(values) for stage, values in self.timings.items() if values}
+
+    def write_report(self, report_path: Path, extra: Optional[Dict[str, Any]] = None) -> Path:
+        report = {
+            'elapsed_s': self.elapsed,
+            'cpu_count': os.cpu_count(),
+            **(extra or {}),
+            'frame_timings_ms': self.get_timing_summary(),
+            'resources': self.sampler.get_summary(),
+            'resource_samples': self.sampler.samples,
+        }
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        return report_path
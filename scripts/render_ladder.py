@@ -0,0 +1,224 @@
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+RENDITION_LADDER = [
+    {'name': '1080p', 'size': 1080, 'video_bitrate': '5000k', 'maxrate': '5350k', 'bufsize': '7500k', 'audio_bitrate': '192k'},
+    {'name': '720p', 'size': 720, 'video_bitrate': '2800k', 'maxrate': '2996k', 'bufsize': '4200k', 'audio_bitrate': '128k'},
+    {'name': '480p', 'size': 480, 'video_bitrate': '1400k', 'maxrate': '1498k', 'bufsize': '2100k', 'audio_bitrate': '96k'},
+]
+
+HLS_SEGMENT_SECONDS = 4
+HLS_MASTER_PLAYLIST = "master.m3u8"
+# H.264 High@4.0 and AAC-LC, matching the encoder settings below
+HLS_CODECS = "avc1.640028,mp4a.40.2"
+
+
+def validate_file_exists(file_path: str, file_type: str) -> Path:
+    path = Path(file_path)
+    if not path.exists():
+        raise FileNotFoundError(f"{file_type} file not found: {file_path}")
+    return path
+
+
+def parse_bitrate(bitrate: str) -> int:
+    if bitrate.lower().endswith('k'):
+        return int(float(bitrate[:-1]) * 1000)
+    return int(bitrate)
+
+
+def probe_video(input_path: Path) -> Dict[str, Any]:
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=width,height,r_frame_rate',
+        '-of', 'json',
+        str(input_path)
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"FFprobe failed: {result.stderr}")
+
+    stream = json.loads(result.stdout)['streams'][0]
+    numerator, denominator = stream['r_frame_rate'].split('/')
+    return {
+        'width': int(stream['width']),
+        'height': int(stream['height']),
+        'fps': float(numerator) / float(denominator or 1),
+    }
+
+
+def select_renditions(source: Dict[str, Any], ladder: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Rungs are sized by the short side so portrait captures get the same ladder
+    short_side = min(source['width'], source['height'])
+    renditions = [rung for rung in ladder if rung['size'] <= short_side]
+    return renditions or [ladder[-1]]
+
+
+def build_scale_filter(size: int) -> str:
+    return f"scale='if(gt(iw,ih),-2,{size})':'if(gt(iw,ih),{size},-2)'"
+
+
+def build_ladder_filter(renditions: List[Dict[str, Any]]) -> str:
+    """One decode feeds a split; each branch is scaled for its rung."""
+    labels = ''.join(f"[v{index}]" for index in range(len(renditions)))
+    branches = [f"[0:v]split={len(renditions)}{labels}"]
+    for index, rung in enumerate(renditions):
+        branches.append(f"[v{index}]{build_scale_filter(rung['size'])}[v{index}out]")
+    return ';'.join(branches)
+
+
+def build_rendition_output(index: int, rung: Dict[str, Any], mp4_name: str,
+                           hls: bool, fps: float, has_audio: bool) -> List[str]:
+    """Output arguments for one rung; paths are relative to the ladder output directory."""
+    gop = max(1, round(fps * HLS_SEGMENT_SECONDS))
+    args = ['-map', f'[v{index}out]']
+    if has_audio:
+        args.extend(['-map', '0:a:0', '-c:a', 'aac', '-b:a', rung['audio_bitrate']])
+
+    args.extend([
+        '-c:v', 'libx264',
+        '-profile:v', 'high',
+        '-level', '4.0',
+        '-preset', 'medium',
+        '-b:v', rung['video_bitrate'],
+        '-maxrate', rung['maxrate'],
+        '-bufsize', rung['bufsize'],
+        '-pix_fmt', 'yuv420p',
+        # Fixed, aligned GOPs so every rung can switch at the same segment boundaries
+        '-g', str(gop),
+        '-keyint_min', str(gop),
+        '-sc_threshold', '0',
+    ])
+
+    if not hls:
+        args.extend(['-movflags', '+faststart', mp4_name])
+        return args
+
+    # tee writes the MP4 and the CMAF segments from the same encoded stream; relative
+    # paths keep drive-letter colons out of tee's option syntax
+    rung_dir = f"hls/{rung['name']}"
+    hls_output = (
+        f"[f=hls:hls_time={HLS_SEGMENT_SECONDS}:hls_playlist_type=vod:hls_segment_type=fmp4:"
+        f"hls_fmp4_init_filename=init.mp4:hls_segment_filename={rung_dir}/segment_%04d.m4s]"
+        f"{rung_dir}/index.m3u8"
+    )
+    # The MP4 slave needs out-of-band codec headers, which tee does not request on its own
+    args.extend(['-flags', '+global_header'])
+    args.extend(['-f', 'tee', f"[f=mp4:movflags=+faststart]{mp4_name}|{hls_output}"])
+    return args
+
+
+def has_audio_stream(input_path: Path) -> bool:
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'a',
+        '-show_entries', 'stream=index',
+        '-of', 'csv=p=0',
+        str(input_path)
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    return result.returncode == 0 and bool(result.stdout.strip())
+
+
+def write_master_playlist(hls_dir: Path, renditions: List[Dict[str, Any]], source: Dict[str, Any]) -> Path:
+    lines = ['#EXTM3U', '#EXT-X-VERSION:7', '#EXT-X-INDEPENDENT-SEGMENTS']
+    for rung in renditions:
+        bandwidth = parse_bitrate(rung['maxrate']) + parse_bitrate(rung['audio_bitrate'])
+        scale = rung['size'] / min(source['width'], source['height'])
+        width = int(round(source['width'] * scale / 2) * 2)
+        height = int(round(source['height'] * scale / 2) * 2)
+        lines.append(f'#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},RESOLUTION={width}x{height},'
+                     f'FRAME-RATE={source["fps"]:.3f},CODECS="{HLS_CODECS}"')
+        lines.append(f"{rung['name']}/index.m3u8")
+
+    master_path = hls_dir / HLS_MASTER_PLAYLIST
+    master_path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return master_path
+
+
+def render_ladder(
+    input_path: str,
+    output_dir: str = None,
+    ladder: List[Dict[str, Any]] = None,
+    hls: bool = False
+) -> Dict[str, Any]:
+    """
+    Encode a rendition ladder from one input in a single ffmpeg process: the source
+    is decoded once and split into one encoder per rung. With hls each rung is also
+    segmented into CMAF (fMP4) HLS and a master playlist is written.
+    """
+    source_path = validate_file_exists(input_path, "Video")
+    output = Path(output_dir) if output_dir else source_path.parent / "renditions"
+    output.mkdir(parents=True, exist_ok=True)
+    hls_dir = output / "hls" if hls else None
+
+    source = probe_video(source_path)
+    renditions = select_renditions(source, ladder or RENDITION_LADDER)
+    has_audio = has_audio_stream(source_path)
+
+    cmd = [
+        'ffmpeg', '-y', '-loglevel', 'error', '-nostats',
+        '-i', str(source_path.resolve()),
+        '-filter_complex', build_ladder_filter(renditions),
+    ]
+
+    mp4_paths = {}
+    for index, rung in enumerate(renditions):
+        mp4_name = f"{source_path.stem}_{rung['name']}.mp4"
+        mp4_paths[rung['name']] = output / mp4_name
+        if hls_dir:
+            (hls_dir / rung['name']).mkdir(parents=True, exist_ok=True)
+        cmd.extend(build_rendition_output(index, rung, mp4_name, hls, source['fps'], has_audio))
+
+    print(f"Rendering rendition ladder...")
+    print(f"  Input: {source_path} ({source['width']}x{source['height']} @ {source['fps']:.2f}fps)")
+    print(f"  Renditions: {', '.join(rung['name'] for rung in renditions)}")
+    print(f"  HLS: {'yes' if hls else 'no'}")
+    print(f"  Output: {output}")
+
+    result = subprocess.run(cmd, capture_output=True, text=True, cwd=str(output))
+    if result.returncode != 0:
+        raise RuntimeError(f"FFmpeg failed: {result.stderr}")
+
+    master_path = write_master_playlist(hls_dir, renditions, source) if hls else None
+
+    for name, path in mp4_paths.items():
+        size_mb = path.stat().st_size / (1024 * 1024) if path.exists() else 0
+        print(f"  {name}: {path} ({size_mb:.2f} MB)")
+    if master_path:
+        print(f"  HLS master playlist: {master_path}")
+
+    print(f"Successfully created {len(mp4_paths)} renditions")
+    return {'renditions': mp4_paths, 'master_playlist': master_path}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Encode a 1080p/720p/480p rendition ladder from one video in a single FFmpeg pass"
+    )
+    parser.add_argument("--input", "-i", required=True, help="Path to the source video (e.g. output_hq.mp4)")
+    parser.add_argument("--output-dir", "-o", help="Directory for the renditions (default: <input dir>/renditions)")
+    parser.add_argument("--renditions", nargs='+', choices=[rung['name'] for rung in RENDITION_LADDER],
+                        help="Rungs to render (default: all that fit the source)")
+    parser.add_argument("--hls", action="store_true", help="Also write CMAF HLS segments and a master playlist")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    ladder = [rung for rung in RENDITION_LADDER if not args.renditions or rung['name'] in args.renditions]
+
+    try:
+        render_ladder(args.input, args.output_dir, ladder, args.hls)
+    except (FileNotFoundError, ValueError, RuntimeError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
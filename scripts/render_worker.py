@@ -0,0 +1,405 @@
+import argparse
+import os
+import secrets
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from playwright.sync_api import sync_playwright
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from scripts.batch_encode import parse_job
+from scripts.claude_cli.claude_cli_config import ClaudeCliConfig
+from scripts.controllers.manifest_controller import ManifestController
+from scripts.enums import AssetType
+from scripts.record_video_cdp import (
+    DEFAULT_BASE_URL,
+    BROWSER_PROFILES,
+    DEFAULT_BROWSER_PROFILE,
+    OUTPUT_DIR,
+    RENDERERS,
+    build_video_bundle,
+    check_video_bundle_served,
+    ensure_server_running,
+    is_ffmpeg_available,
+    launch_browser,
+    new_recording_context,
+    print_ffmpeg_install_instructions,
+    record_in_context,
+    start_static_player_server,
+)
+from scripts.utility.config import MANIFEST_FILE
+
+
+DEFAULT_WORKER_HOST = "localhost"
+DEFAULT_WORKER_PORT = 6070
+DEFAULT_POOL_SIZE = 2
+AUTHKEY_ENV = "RENDER_WORKER_AUTHKEY"
+
+# Contexts are recycled after this many jobs so page leaks don't accumulate
+CONTEXT_MAX_JOBS = 20
+
+
+def get_authkey_path(port: int) -> Path:
+    return Path(OUTPUT_DIR) / f".render_worker_{port}.key"
+
+
+def create_authkey(port: int) -> bytes:
+    """
+    Uses RENDER_WORKER_AUTHKEY when set; otherwise generates a random key and writes it
+    owner-only next to the recordings, where submit and shutdown on this machine pick it up.
+    """
+    if os.environ.get(AUTHKEY_ENV):
+        return os.environ[AUTHKEY_ENV].encode('utf-8')
+
+    key_path = get_authkey_path(port)
+    key_path.parent.mkdir(parents=True, exist_ok=True)
+    key = secrets.token_hex(32)
+    fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(key)
+    # O_CREAT's mode is ignored when the file already existed
+    os.chmod(key_path, 0o600)
+    print(f"[OK] Generated worker authkey: {key_path} (mode 0600)")
+    return key.encode('utf-8')
+
+
+def get_authkey(port: int) -> Optional[bytes]:
+    if os.environ.get(AUTHKEY_ENV):
+        return os.environ[AUTHKEY_ENV].encode('utf-8')
+
+    key_path = get_authkey_path(port)
+    if not key_path.exists():
+        return None
+    return key_path.read_text(encoding='utf-8').strip().encode('utf-8')
+
+
+def get_topic_recording_path(topic: str, version: int, mode: str) -> Path:
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    return Path(OUTPUT_DIR) / topic / f"v{version}" / f"recording_v{version}-{mode}_{timestamp}_cdp.mp4"
+
+
+def resolve_output_path(output_path: Optional[str], topic: str, version: int, mode: str) -> Path:
+    """Jobs can only write inside OUTPUT_DIR, whoever submits them."""
+    if not output_path:
+        output_path = get_topic_recording_path(topic, version, mode)
+
+    output_root = Path(OUTPUT_DIR).resolve()
+    resolved = Path(output_path).resolve()
+    if resolved != output_root and output_root not in resolved.parents:
+        raise ValueError(f"Output path must be inside {output_root}: {output_path}")
+    return resolved
+
+
+class RenderWorker:
+    """
+    Long-lived render process for batch exports. Keeps the player server, one
+    Chromium and a pool of warmed browser contexts open, so each job only pays for
+    opening a page instead of a browser launch and server start.
+
+    The sync Playwright API is single-threaded, so jobs run one at a time; start
+    several workers on different ports to render in parallel.
+
+    Each job names its topic. With a static_server, the worker serves one video bundle at a
+    time and rebuilds it whenever a job asks for a different topic or version.
+    """
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, headless: bool = True,
+                 pool_size: int = DEFAULT_POOL_SIZE, npm_script: str = "dev",
+                 browser_profile: str = DEFAULT_BROWSER_PROFILE, static_server=None):
+        self.base_url = base_url
+        self.headless = headless
+        self.pool_size = max(1, pool_size)
+        self.npm_script = npm_script
+        self.browser_profile = browser_profile
+        self.static_server = static_server
+        self.bundle_key = None
+
+        self.server_process = None
+        self.playwright = None
+        self.browser = None
+        self.contexts = deque()
+        self.jobs_completed = 0
+
+    def start(self) -> bool:
+        self.server_process = ensure_server_running(self.base_url, npm_script=self.npm_script)
+        if self.server_process is False:
+            return False
+
+        print("Launching browser...")
+        self.playwright = sync_playwright().start()
+        self.browser = launch_browser(self.playwright, self.headless, self.browser_profile)
+
+        for _ in range(self.pool_size):
+            self.contexts.append(self._new_warm_context())
+        print(f"[OK] Render worker ready ({self.pool_size} warm contexts)")
+        return True
+
+    def _new_warm_context(self) -> Dict[str, Any]:
+        context = new_recording_context(self.browser)
+        # Load the app once so its bundle, fonts and images sit in the context cache
+        page = context.new_page()
+        try:
+            page.goto(self.base_url, wait_until='networkidle')
+        except Exception as e:
+            print(f"  Warning: Could not warm context: {e}")
+        finally:
+            page.close()
+        return {'context': context, 'jobs': 0}
+
+    def _checkout_context(self) -> Dict[str, Any]:
+        entry = self.contexts.popleft()
+        if entry['jobs'] >= CONTEXT_MAX_JOBS:
+            entry['context'].close()
+            entry = self._new_warm_context()
+        return entry
+
+    def _recycle_contexts(self):
+        # The static server marks bundles immutable, so warm caches hold the previous video
+        while self.contexts:
+            self.contexts.popleft()['context'].close()
+        for _ in range(self.pool_size):
+            self.contexts.append(self._new_warm_context())
+
+    def _switch_topic(self, topic: str, version: int):
+        if not topic or Path(topic).name != topic:
+            raise ValueError(f"Job needs a topic folder name, got: {topic!r}")
+        if not Path(MANIFEST_FILE.format(topic=topic)).exists():
+            raise ValueError(f"No manifest for topic: {topic}")
+
+        # Audio, chapters and the video TSX are all read through the current topic
+        ClaudeCliConfig.set_topic(topic)
+        ManifestController().set_topic(topic)
+        if not self.static_server or self.bundle_key == (topic, version):
+            return
+
+        # Only the manifest's current video TSX can be built, so other versions are refused
+        video_info = ManifestController().get_field(AssetType.VIDEO) or {}
+        if video_info.get('version') != version:
+            raise ValueError(f"{topic} has video v{video_info.get('version')}, "
+                             f"the static bundle cannot be built for v{version}")
+        self.bundle_key = None
+        if not build_video_bundle(force=True):
+            raise RuntimeError(f"Video bundle build failed for {topic} v{version}")
+        self.bundle_key = (topic, version)
+        self._recycle_contexts()
+
+    def render(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        topic = job.get('topic')
+        version = job['version']
+        mode = job.get('mode', 'l')
+        self._switch_topic(topic, version)
+        url = f"{self.base_url}/{version}/{mode}"
+        output_path = resolve_output_path(job.get('output_path'), topic, version, mode)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        print(f"\nRendering {url} -> {output_path}")
+        start_time = time.time()
+        entry = self._checkout_context()
+        try:
+            result_path = record_in_context(
+                entry['context'], url, output_path,
+                quality=job.get('quality', 100),
+                fps=job.get('fps', 30),
+                format=job.get('format', 'jpeg'),
+                stream=job.get('stream', True),
+                renderer=job.get('renderer', 'virtual'),
+                crop=tuple(job['crop']) if job.get('crop') else None,
+                audio_path=job.get('audio_path'),
+                audio_skip_ms=job.get('audio_skip_ms', 0),
+                capture_mode=job.get('capture_mode', 'screenshot'),
+                dedup=job.get('dedup', False),
+                adaptive=job.get('adaptive', False)
+            )
+        finally:
+            entry['jobs'] += 1
+            self.contexts.append(entry)
+
+        if result_path and self.static_server and not check_video_bundle_served(self.static_server):
+            result_path = None
+
+        elapsed = time.time() - start_time
+        self.jobs_completed += 1
+        status = "[OK]" if result_path else "✗"
+        print(f"{status} Job {self.jobs_completed} finished in {elapsed:.1f}s")
+        return {
+            'success': result_path is not None,
+            'output_path': str(result_path) if result_path else None,
+            'elapsed': elapsed,
+        }
+
+    def serve(self, address: Tuple[str, int], authkey: bytes):
+        with Listener(address, authkey=authkey) as listener:
+            print(f"[OK] Listening for export jobs on {address[0]}:{address[1]}")
+            while True:
+                try:
+                    conn = listener.accept()
+                except (AuthenticationError, OSError, EOFError) as e:
+                    print(f"✗ Rejected connection: {e}")
+                    continue
+
+                with conn:
+                    while True:
+                        try:
+                            job = conn.recv()
+                        except (OSError, EOFError):
+                            break
+
+                        if job.get('command') == 'shutdown':
+                            self._reply(conn, {'success': True})
+                            return
+
+                        try:
+                            result = self.render(job)
+                        except Exception as e:
+                            print(f"✗ Job failed: {e}")
+                            result = {'success': False, 'output_path': None, 'error': str(e)}
+
+                        # A client that went away mid-job must not take the worker down with it
+                        if not self._reply(conn, result):
+                            break
+
+    def _reply(self, conn, result: Dict[str, Any]) -> bool:
+        try:
+            conn.send(result)
+            return True
+        except (OSError, EOFError) as e:
+            print(f"✗ Client disconnected before the result was sent: {e}")
+            return False
+
+    def stop(self):
+        while self.contexts:
+            self.contexts.popleft()['context'].close()
+        if self.browser:
+            self.browser.close()
+        if self.playwright:
+            self.playwright.stop()
+        if self.server_process:
+            print("Stopping server...")
+            self.server_process.terminate()
+
+
+def submit_jobs(jobs: List[Dict[str, Any]], address: Tuple[str, int], authkey: bytes) -> List[Dict[str, Any]]:
+    results = []
+    with Client(address, authkey=authkey) as conn:
+        for job in jobs:
+            conn.send(job)
+            results.append(conn.recv())
+    return results
+
+
+def shutdown_worker(address: Tuple[str, int], authkey: bytes):
+    with Client(address, authkey=authkey) as conn:
+        conn.send({'command': 'shutdown'})
+        conn.recv()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Warm render worker for batch CDP exports')
+    parser.add_argument('--host', type=str, default=DEFAULT_WORKER_HOST,
+                        help=f'Worker host (default: {DEFAULT_WORKER_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_WORKER_PORT,
+                        help=f'Worker port (default: {DEFAULT_WORKER_PORT})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='Start a worker and wait for jobs')
+    serve_parser.add_argument('--base-url', type=str, default=DEFAULT_BASE_URL,
+                              help=f'Base URL of the server (default: {DEFAULT_BASE_URL})')
+    serve_parser.add_argument('--headless', type=lambda x: str(x).lower() == 'true',
+                              default=True, metavar='true|false',
+                              help='Run browser in headless mode: true or false (default: true)')
+    serve_parser.add_argument('--pool-size', type=int, default=DEFAULT_POOL_SIZE,
+                              help=f'Number of warm browser contexts (default: {DEFAULT_POOL_SIZE})')
+    serve_parser.add_argument('--npm-script', type=str, default='dev',
+                              help='npm script that serves the player at --base-url if it is not running '
+                                   '(default: dev; use --static for the production build)')
+    serve_parser.add_argument('--browser-profile', type=str, choices=list(BROWSER_PROFILES),
+                              default=DEFAULT_BROWSER_PROFILE,
+                              help=f'Chromium launch flags (default: {DEFAULT_BROWSER_PROFILE})')
+    serve_parser.add_argument('--static', action='store_true',
+                              help='Serve the production build from a local static server instead of npm')
+
+    submit_parser = subparsers.add_parser('submit', help='Send export jobs to a running worker')
+    submit_parser.add_argument('--jobs', type=parse_job, nargs='+', required=True, metavar='TOPIC:VERSION',
+                               help='Topic and video version pairs to render')
+    submit_parser.add_argument('--mode', type=str, choices=['l', 'p'], default='l',
+                               help='l: landscape, p: portrait (default: l)')
+    submit_parser.add_argument('--renderer', type=str, choices=RENDERERS, default='virtual',
+                               help='Recorder to use (default: virtual)')
+    submit_parser.add_argument('--fps', type=int, default=30,
+                               help='Output video FPS (default: 30)')
+
+    subparsers.add_parser('shutdown', help='Stop a running worker')
+
+    args = parser.parse_args()
+    address = (args.host, args.port)
+
+    if args.command == 'serve':
+        if not is_ffmpeg_available():
+            print("✗ ffmpeg is required for CDP recording")
+            print_ffmpeg_install_instructions()
+            sys.exit(1)
+
+        static_server = None
+        base_url = args.base_url
+        if args.static:
+            # Bundles are built per job, once the job's topic is known
+            static_server = start_static_player_server(build_bundle=False)
+            if not static_server:
+                sys.exit(1)
+            base_url = static_server.base_url
+
+        worker = RenderWorker(
+            base_url=base_url,
+            headless=args.headless,
+            pool_size=args.pool_size,
+            npm_script=args.npm_script,
+            browser_profile=args.browser_profile,
+            static_server=static_server
+        )
+        authkey = create_authkey(args.port)
+        try:
+            if not worker.start():
+                sys.exit(1)
+            worker.serve(address, authkey)
+        finally:
+            worker.stop()
+            if static_server:
+                static_server.stop()
+            if not os.environ.get(AUTHKEY_ENV):
+                get_authkey_path(args.port).unlink(missing_ok=True)
+        return
+
+    authkey = get_authkey(args.port)
+    if authkey is None:
+        print(f"✗ No authkey for port {args.port}: set {AUTHKEY_ENV} or start the worker on this machine "
+              f"so it writes {get_authkey_path(args.port)}")
+        sys.exit(1)
+
+    if args.command == 'submit':
+        jobs = [
+            {**job, 'mode': args.mode, 'renderer': args.renderer, 'fps': args.fps}
+            for job in args.jobs
+        ]
+        results = submit_jobs(jobs, address, authkey)
+        for job, result in zip(jobs, results):
+            status = "[OK]" if result['success'] else "✗"
+            detail = result.get('output_path') or result.get('error')
+            print(f"{status} {job['topic']} v{job['version']}: {detail} ({result.get('elapsed', 0):.1f}s)")
+        sys.exit(0 if all(result['success'] for result in results) else 1)
+
+    elif args.command == 'shutdown':
+        shutdown_worker(address, authkey)
+        print("[OK] Worker stopped")
+
+
+if __name__ == '__main__':
+    main()
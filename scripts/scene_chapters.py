@@ -0,0 +1,99 @@
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from scripts.controllers.output_controller import OutputController
+from scripts.enums import AssetType
+
+
+def get_scene_chapters(direction: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Chapters from the Direction post-process's sceneStartTime/sceneEndTime (ms)."""
+    chapters = []
+    for index, scene in enumerate(direction.get('scenes', [])):
+        start_ms = scene.get('sceneStartTime') or scene.get('startTime') or 0
+        end_ms = scene.get('sceneEndTime') or scene.get('endTime')
+        chapters.append({
+            'title': f"Scene {scene.get('sceneIndex', index) + 1}",
+            # The first scene owns the lead-in so chapters cover the whole video
+            'start': 0.0 if index == 0 else start_ms / 1000,
+            'end': end_ms / 1000 if end_ms else None,
+        })
+
+    chapters.sort(key=lambda chapter: chapter['start'])
+    # Chapters are contiguous: each one runs until the next scene starts
+    for chapter, next_chapter in zip(chapters, chapters[1:]):
+        chapter['end'] = next_chapter['start']
+    return [chapter for chapter in chapters if chapter['end'] is None or chapter['end'] > chapter['start']]
+
+
+def load_scene_chapters() -> List[Dict[str, Any]]:
+    try:
+        direction = OutputController().read_output(AssetType.DIRECTION) or {}
+    except Exception:
+        return []
+    return get_scene_chapters(direction)
+
+
+def build_force_key_frames(chapters: List[Dict[str, Any]]) -> Optional[str]:
+    """-force_key_frames value placing an IDR frame at every scene start."""
+    times = [chapter['start'] for chapter in chapters if chapter['start'] > 0]
+    if not times:
+        return None
+    return ','.join(f"{start:.3f}" for start in times)
+
+
+def escape_metadata(value: str) -> str:
+    for char in ('\\', '=', ';', '#', '\n'):
+        value = value.replace(char, f"\\{char}")
+    return value
+
+
+def write_chapters_metadata(chapters: List[Dict[str, Any]], metadata_path: Path,
+                            duration: Optional[float] = None) -> Path:
+    """Writes an ffmetadata file that ffmpeg maps into MP4 chapters with -map_chapters."""
+    lines = [';FFMETADATA1']
+    for chapter in chapters:
+        end = chapter['end'] if chapter['end'] is not None else duration
+        if end is None:
+            # An open last chapter is closed far past the end; muxers clamp it to the duration
+            end = chapter['start'] + 24 * 3600
+        lines.extend([
+            '',
+            '[CHAPTER]',
+            'TIMEBASE=1/1000',
+            f"START={int(round(chapter['start'] * 1000))}",
+            f"END={int(round(end * 1000))}",
+            f"title={escape_metadata(chapter['title'])}",
+        ])
+
+    metadata_path.parent.mkdir(parents=True, exist_ok=True)
+    metadata_path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return metadata_path
+
+
+def build_chapter_args(chapters: List[Dict[str, Any]], video_path: Path, input_index: int,
+                       force_keyframes: bool = True) -> Dict[str, List[str]]:
+    """
+    Input and output arguments that add scene keyframes and chapters to an encode.
+    input_index is the position the metadata input will take in the ffmpeg command;
+    force_keyframes is off when the video stream is copied rather than encoded.
+    The metadata goes to a temp file; pass the result to remove_chapter_metadata once ffmpeg exits.
+    """
+    if not chapters:
+        return {'input': [], 'output': [], 'metadata_path': None}
+
+    fd, temp_path = tempfile.mkstemp(prefix=f"{video_path.stem}_chapters_", suffix='.txt')
+    os.close(fd)
+    metadata_path = write_chapters_metadata(chapters, Path(temp_path))
+    output_args = ['-map_chapters', str(input_index)]
+    force_key_frames = build_force_key_frames(chapters) if force_keyframes else None
+    if force_key_frames:
+        output_args.extend(['-force_key_frames', force_key_frames])
+    return {'input': ['-f', 'ffmetadata', '-i', str(metadata_path)], 'output': output_args,
+            'metadata_path': metadata_path}
+
+
+def remove_chapter_metadata(chapter_args: Dict[str, Any]) -> None:
+    if chapter_args.get('metadata_path'):
+        chapter_args['metadata_path'].unlink(missing_ok=True)
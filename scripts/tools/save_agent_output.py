@@ -3,6 +3,8 @@ Save Agent Output Tool
 
 Writes content to the appropriate latest file path based on asset type.
 Uses ClaudeCliConfig to determine the correct output path.
+With --lease_token, the scene lease is renewed first and nothing is written if
+another subagent has taken the scene over.
 """
 
 import os
@@ -48,6 +50,15 @@ def write_asset(asset_type: AssetType, content: str, scene_index: int | None = N
     return str(output_path)
 
 
+def renew_scene_lease(topic: str, asset_type: AssetType, scene_index: int, lease_token: str) -> bool:
+    # Imported here so plain saves do not need the manifest controllers
+    from scripts.controllers.video_step_sub_status_controller import VideoStepSubStatusController
+
+    controller = VideoStepSubStatusController()
+    controller.set_topic(topic)
+    return bool(controller.heartbeat(asset_type, scene_index, lease_token))
+
+
 def get_asset_type_from_string(type_string: str) -> AssetType:
     """Convert a string to an AssetType enum value."""
     type_map = {
@@ -89,10 +100,30 @@ def main():
         default=None,
         help="Scene index (required for design and video asset types)"
     )
+    parser.add_argument(
+        "--topic",
+        type=str,
+        default=None,
+        help="Topic folder name under Outputs (required with --lease_token)"
+    )
+    parser.add_argument(
+        "--lease_token",
+        type=str,
+        default=None,
+        help="Token printed by subagent_lease.py claim for this scene"
+    )
     args = parser.parse_args()
 
+    if args.lease_token and (not args.topic or args.scene_index is None):
+        parser.error("--lease_token requires --topic and --scene_index")
+
     try:
         asset_type = get_asset_type_from_string(args.save_type)
+        if args.topic:
+            ClaudeCliConfig.set_topic(args.topic)
+        if args.lease_token and not renew_scene_lease(args.topic, asset_type, args.scene_index, args.lease_token):
+            print(f"Error: lease on scene {args.scene_index} was lost to another subagent, nothing written")
+            return 1
         output_path = write_asset(asset_type, args.content, args.scene_index)
         print(f"Content written to: {output_path}")
 
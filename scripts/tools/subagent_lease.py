@@ -0,0 +1,87 @@
+"""
+Subagent Lease Tool
+
+Claims a scene for a subagent, renews the claim while the subagent works and marks
+it completed. claim prints a lease_token; the subagent passes it to every later
+heartbeat, to save_agent_output.py and to complete.
+"""
+
+import json
+import argparse
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from scripts.controllers.manifest_controller import ManifestController
+from scripts.controllers.video_step_sub_status_controller import VideoStepSubStatusController
+from scripts.tools.save_agent_output import get_asset_type_from_string
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Claim, renew or complete a scene subagent's lease"
+    )
+    parser.add_argument(
+        "command",
+        choices=["claim", "heartbeat", "complete"],
+        help="claim the next free scene, renew a held lease, or mark the scene completed"
+    )
+    parser.add_argument(
+        "--topic",
+        type=str,
+        required=True,
+        help="Topic folder name under Outputs"
+    )
+    parser.add_argument(
+        "--save_type",
+        type=str,
+        required=True,
+        help="type (design, video)"
+    )
+    parser.add_argument(
+        "--scene_index",
+        type=int,
+        default=None,
+        help="Scene index (required for heartbeat and complete)"
+    )
+    parser.add_argument(
+        "--lease_token",
+        type=str,
+        default=None,
+        help="Token printed by claim (required for heartbeat and complete)"
+    )
+    args = parser.parse_args()
+
+    if args.command != "claim" and (args.scene_index is None or not args.lease_token):
+        parser.error(f"{args.command} requires --scene_index and --lease_token")
+
+    try:
+        asset_type = get_asset_type_from_string(args.save_type)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    controller = VideoStepSubStatusController()
+    controller.set_topic(args.topic)
+
+    if args.command == "claim":
+        result = controller.claim_next_subagent(asset_type)
+        if result:
+            result['lease_seconds'] = ManifestController.LEASE_SECONDS
+        print(json.dumps(result))
+        return 0 if result and result['success'] else 1
+
+    if args.command == "heartbeat":
+        renewed = controller.heartbeat(asset_type, args.scene_index, args.lease_token)
+        print(json.dumps({'success': bool(renewed), 'scene_index': args.scene_index}))
+        # A lost lease means another subagent owns the scene now; this one must stop
+        return 0 if renewed else 1
+
+    completed = controller.mark_subagent_completed(asset_type, args.scene_index, args.lease_token)
+    print(json.dumps({'success': bool(completed), 'scene_index': args.scene_index}))
+    return 0 if completed else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -17,6 +17,11 @@ def _get_config(key: str, default=None):
 # Static config values
 PROMPT_TAG = "production"
 MANIFEST_FILE = "Outputs/{topic}/manifest.json"
+MANIFEST_DB_FILE = "Outputs/{topic}/manifest.db"
+# Backend for subagent claims/completions: "json" (manifest.json under a file lock) or "sqlite"
+MANIFEST_STORE = os.getenv("MANIFEST_STORE", "json").lower()
+# URL prefix the player app's bundle loader requests video.js from; --static recordings serve the bundle there
+VIDEO_BUNDLE_MOUNT = os.getenv("VIDEO_BUNDLE_MOUNT", "/remote-components")
 WEBSITE_URL = "https://outscal.com"
 
 ELEVENLABS_API_KEY = _get_config("ELEVENLABS_API_KEY")
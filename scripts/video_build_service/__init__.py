@@ -6,11 +6,13 @@ Handles building TSX video components and uploading to S3.
 from .s3_manager import S3Manager, S3Config, UploadFileParams
 from .react_build_manager import ReactBuildManager
 from .tsx_build_env_controller import TsxBuildEnvController
+from .static_site_server import StaticSiteServer
 
 __all__ = [
     'S3Manager',
     'S3Config',
     'UploadFileParams',
     'ReactBuildManager',
-    'TsxBuildEnvController'
+    'TsxBuildEnvController',
+    'StaticSiteServer'
 ]
@@ -14,6 +14,7 @@ from scripts.video_build_service.react_build_manager import ReactBuildManager
 from scripts.controllers.manifest_controller import ManifestController
 from scripts.claude_cli.claude_cli_config import ClaudeCliConfig
 from scripts.enums import AssetType
+from scripts.preview_assets import PREVIEW_FILES
 from scripts.utility.config import AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_REGION, PAYLOAD_API_BASE_URL, PAYLOAD_AUTH_TOKEN, WEBSITE_URL
 
 # Setup logging
@@ -169,7 +170,8 @@ class BuildAndUploadService:
         audio_file_path: Optional[str],
         transcript_file_path: Optional[str],
         title: str,
-        video_version: int
+        video_version: int,
+        preview_dir: Optional[str] = None
     ) -> Dict[str, Any]:
         errors = []
         urls = {}
@@ -241,12 +243,39 @@ class BuildAndUploadService:
         elif transcript_file_path:
             errors.append(f"Transcript file not found: {transcript_file_path}")
 
+        # Upload poster, sprite sheet and preview written during export
+        if preview_dir and os.path.isdir(preview_dir):
+            for asset_name, (file_name, mime_type) in PREVIEW_FILES.items():
+                preview_file_path = os.path.join(preview_dir, file_name)
+                if not os.path.exists(preview_file_path):
+                    continue
+                try:
+                    with open(preview_file_path, 'rb') as f:
+                        preview_content = f.read()
+
+                    s3_key = f"ReactVideo/{slug}/{version_folder}/preview/{file_name}"
+                    preview_url = s3_manager.upload_file_sync(UploadFileParams(
+                        bucket_name=self.bucket_name,
+                        file_path=s3_key,
+                        file_data=preview_content,
+                        mime_type=mime_type
+                    ))
+                    urls[f"{asset_name}_url"] = preview_url
+                    self.logger.info(f"Uploaded preview {file_name}: {preview_url}")
+                except Exception as e:
+                    errors.append(f"Failed to upload preview {file_name}: {str(e)}")
+        elif preview_dir:
+            # Previews are optional, so a missing folder must not fail the deploy
+            self.logger.warning(f"Preview directory not found, skipping previews: {preview_dir}")
+
         success = 'video_url' in urls and not errors
         return {'success': success, 'urls': urls, 'errors': errors}
 
-    def run(self) -> Dict[str, Any]:
+    def run(self, preview_dir: Optional[str] = None) -> Dict[str, Any]:
         title = self.topic
         manifest_paths = self.get_paths_from_manifest()
+        # export.py --previews records its preview folder, so the normal deploy picks it up
+        preview_dir = preview_dir or (ManifestController().get_metadata() or {}).get('preview_dir')
         video_path = manifest_paths['video_path']
         audio_path = manifest_paths['audio_path']
         transcript_path = manifest_paths['transcript_path']
@@ -314,7 +343,8 @@ class BuildAndUploadService:
             audio_file_path=audio_path,
             transcript_file_path=transcript_path,
             title=title,
-            video_version=video_version
+            video_version=video_version,
+            preview_dir=preview_dir
         )
         url = self.create_video_entry(slug=self.create_slug(title,video_version),
          audio_url=upload_result['urls']['audio_url'],
@@ -339,16 +369,21 @@ Examples:
 
     # With custom topic
     python build_and_upload.py --topic "my-video"
+
+    # Also upload the export's poster, sprite sheet and preview
+    python build_and_upload.py --topic "my-video" --preview-dir <final video stem>_preview
+    (without --preview-dir, the folder recorded by export.py --previews is used)
         '''
     )
 
     parser.add_argument('--topic', help='Topic for the video (default: folder name)')
+    parser.add_argument('--preview-dir', help='Poster/sprite/preview folder written by export.py --previews')
 
     args = parser.parse_args()
 
     service = BuildAndUploadService(topic=args.topic)
 
-    result = service.run()
+    result = service.run(preview_dir=args.preview_dir)
 
     if result['success']:
         sys.exit(0)
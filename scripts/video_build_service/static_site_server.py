@@ -0,0 +1,106 @@
+"""
+StaticSiteServer serves a production build from disk for recording.
+Standalone version for video build service.
+"""
+
+import logging
+import os
+import threading
+from collections import Counter
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import unquote, urlsplit
+
+logger = logging.getLogger('static_site_server')
+
+
+class _StaticSiteHandler(SimpleHTTPRequestHandler):
+    """Serves files from the site root and any mounted directories, with SPA fallback."""
+
+    extensions_map = {
+        **SimpleHTTPRequestHandler.extensions_map,
+        '.js': 'application/javascript',
+        '.mjs': 'application/javascript',
+        '.css': 'text/css',
+        '.svg': 'image/svg+xml',
+        '.woff2': 'font/woff2',
+        '.wasm': 'application/wasm',
+    }
+
+    def __init__(self, *args, mounts: Dict[str, str] = None, mount_hits: Counter = None, **kwargs):
+        self.mounts = mounts or {}
+        self.mount_hits = mount_hits if mount_hits is not None else Counter()
+        super().__init__(*args, **kwargs)
+
+    def translate_path(self, path: str) -> str:
+        url_path = unquote(urlsplit(path).path)
+
+        for prefix, mount_dir in self.mounts.items():
+            if url_path.startswith(prefix + '/'):
+                self.mount_hits[prefix] += 1
+                relative = url_path[len(prefix) + 1:]
+                return self._resolve(mount_dir, relative)
+
+        resolved = self._resolve(self.directory, url_path.lstrip('/'))
+        # Client-side routes such as /{version}/{mode} fall back to index.html
+        if not os.path.exists(resolved) and not Path(url_path).suffix:
+            return os.path.join(self.directory, 'index.html')
+        return resolved
+
+    @staticmethod
+    def _resolve(root: str, relative: str) -> str:
+        root_path = Path(root).resolve()
+        target = (root_path / relative).resolve()
+        if root_path != target and root_path not in target.parents:
+            return str(root_path / '__forbidden__')
+        return str(target)
+
+    def end_headers(self):
+        # Build output is immutable for the lifetime of the server
+        self.send_header('Cache-Control', 'public, max-age=31536000, immutable')
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+class StaticSiteServer:
+    """Minimal threaded HTTP server for a built single-page app."""
+
+    def __init__(self, root_dir: str, port: int = 0, host: str = "localhost",
+                 mounts: Optional[Dict[str, str]] = None):
+        self.root_dir = str(root_dir)
+        self.host = host
+        self.port = port
+        self.mounts = {prefix.rstrip('/'): str(path) for prefix, path in (mounts or {}).items()}
+        self.httpd = None
+        self.thread = None
+        # Requests per mount, so callers can tell whether the app ever loaded a mounted bundle
+        self.mount_hits = Counter()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> str:
+        """Start serving in a background thread and return the base URL."""
+        handler = partial(_StaticSiteHandler, directory=self.root_dir, mounts=self.mounts,
+                          mount_hits=self.mount_hits)
+        self.httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self.port = self.httpd.server_address[1]
+
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info(f"Serving {self.root_dir} at {self.base_url}")
+        return self.base_url
+
+    def get_mount_requests(self, prefix: str) -> int:
+        return self.mount_hits[prefix.rstrip('/')]
+
+    def stop(self) -> None:
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None